@@ -0,0 +1,62 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from src.api.fastapi_server import registry, feature_cols, PricingRequest, predict_demand
+
+# Original /predict-price/ model input path (kept here only for comparison)
+def predict_demand_pandas(request: PricingRequest) -> float:
+    input_data = pd.DataFrame([request.dict()])
+    input_data["price_margin"] = input_data["price"] - input_data["cost"]
+    input_data["price_vs_competitor"] = input_data["price"] / input_data["competitor_price"]
+    return registry.get().predict(input_data[feature_cols])[0]
+
+# Time each call individually and report p50/p99 in microseconds
+def time_calls(fn, requests, warmup=200):
+    for r in requests[:warmup]:
+        fn(r)
+    timings = np.empty(len(requests))
+    for i, r in enumerate(requests):
+        start = time.perf_counter()
+        fn(r)
+        timings[i] = time.perf_counter() - start
+    return np.percentile(timings, 50) * 1e6, np.percentile(timings, 99) * 1e6
+
+def make_requests(n, seed=22):
+    rng = np.random.default_rng(seed)
+    return [
+        PricingRequest(
+            sku_id=f"WO{i % 300:03d}",
+            price=float(rng.uniform(20, 300)),
+            cost=float(rng.uniform(10, 100)),
+            promo_discount=float(rng.choice([0.0, 0.25, 0.3])),
+            competitor_price=float(rng.uniform(20, 300)),
+            temperature=float(rng.normal(25, 5)),
+            lag_1=float(rng.integers(0, 15)),
+            rolling_mean_7=float(rng.uniform(0, 10)),
+            elasticity=float(rng.uniform(-10, 10)),
+            day_of_week=int(rng.integers(0, 7)),
+            is_weekend=int(rng.integers(0, 2)),
+            month=int(rng.integers(1, 13))
+        )
+        for i in range(n)
+    ]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single-request demand prediction latency")
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    requests = make_requests(args.requests)
+
+    mismatches = sum(predict_demand(r) != predict_demand_pandas(r) for r in requests)
+    print(f"Bit-identical predictions: {mismatches == 0} ({mismatches} mismatches)")
+
+    for name, fn in [("pandas DataFrame", predict_demand_pandas), ("float64 buffer", predict_demand)]:
+        p50, p99 = time_calls(fn, requests)
+        print(f"{name:>18}: p50 {p50:8.1f} µs   p99 {p99:8.1f} µs")
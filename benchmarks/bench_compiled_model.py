@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import importlib.util
+import time
+import lightgbm as lgb
+import numpy as np
+
+from src.models.compiled_model import CompiledModel
+
+# Booster.predict vs the compiled array evaluators at API-sized and batch-sized inputs
+
+def per_call_seconds(predict, X, min_seconds=0.5):
+    predict(X)  # warm-up (and JIT for numba)
+    calls, start = 0, time.perf_counter()
+    while True:
+        predict(X)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compiled model vs Booster.predict latency")
+    parser.add_argument("--model", default="models/lightgbm_model.txt")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 100_000])
+    args = parser.parse_args()
+
+    booster = lgb.Booster(model_file=args.model)
+    backends = {"lightgbm": booster}
+    backends["numpy"] = CompiledModel.from_file(args.model, backend="numpy")
+    if importlib.util.find_spec("numba") is not None:
+        backends["numba"] = CompiledModel.from_file(args.model, backend="numba")
+
+    # Realistic-ish inputs: feature ranges from the model's own split thresholds, some NaNs
+    rng = np.random.default_rng(22)
+    compiled = backends["numpy"]
+    lo = np.array([compiled.threshold[compiled.feature == f].min(initial=0.0) for f in range(booster.num_feature())])
+    hi = np.array([compiled.threshold[compiled.feature == f].max(initial=1.0) for f in range(booster.num_feature())])
+    print(f"Trees: {booster.num_trees()}   max depth: {compiled.max_depth}   backends: {', '.join(backends)}")
+
+    for batch in args.batch_sizes:
+        X = rng.uniform(lo, hi, size=(batch, booster.num_feature()))
+        X[rng.random(X.shape) < 0.01] = np.nan
+        expected = booster.predict(X)
+
+        line = f"batch {batch:>7,}"
+        for name, model in backends.items():
+            seconds = per_call_seconds(model.predict, X)
+            diff = np.abs(model.predict(X) - expected).max()
+            line += f"   {name} {seconds * 1e6:10.1f} µs (|Δ| {diff:.0e})"
+        print(line)
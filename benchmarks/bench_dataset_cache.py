@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import contextlib
+import io
+import shutil
+import tempfile
+import time
+
+from src.data.storage import read_frame
+from src.data.load_data import raw_data_paths
+from src.data.preprocess import preprocess_pandas
+from src.features.build_features import build_features
+from src.forecasting.forecaster import FEATURE_COLS, TARGET_COL, train_forecast_model
+from src.models.dataset_cache import DatasetCache
+
+# Binned Dataset cache: Dataset construction from pandas vs reload of the saved binary,
+# and end-to-end train_forecast_model time without the cache, on a miss (build + save)
+# and on hits (repeated retrains / trials on unchanged data)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def quiet_train(df, cache):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return train_forecast_model(df, dataset_cache=cache)[0]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Binned LightGBM Dataset cache benchmark")
+    parser.add_argument("--input", default=raw_data_paths()[1])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    df = build_features(preprocess_pandas(read_frame(args.input)))
+    rows = df.dropna(subset=FEATURE_COLS + [TARGET_COL])
+    X, y = rows[FEATURE_COLS], rows[TARGET_COL]
+    params = {"objective": "regression", "verbosity": -1, "random_state": 22}
+    print(f"{len(rows):,} training rows × {len(FEATURE_COLS)} features")
+
+    cache_dir = tempfile.mkdtemp(prefix="dataset-cache-")
+    try:
+        cache = DatasetCache(cache_dir=cache_dir)
+        DatasetCache(enabled=False).dataset(X.head(100), y.head(100), params)  # imports LightGBM outside the timings
+        _, build_s = timed(lambda: DatasetCache(enabled=False).dataset(X, y, params).construct())
+        _, key_s = timed(lambda: cache.key(X, y, params))
+        cache.dataset(X, y, params)
+        _, load_s = timed(lambda: cache.dataset(X, y, params).construct())
+        print(f"Dataset construct from pandas {build_s * 1e3:9.1f} ms")
+        print(f"cache key (content hash)      {key_s * 1e3:9.1f} ms")
+        print(f"cache hit (hash + load .bin)  {load_s * 1e3:9.1f} ms")
+        cache.clear()
+
+        uncached = [timed(lambda: quiet_train(df, DatasetCache(enabled=False)))[1] for _ in range(args.repeats)]
+        _, miss_s = timed(lambda: quiet_train(df, cache))
+        hits = [timed(lambda: quiet_train(df, cache))[1] for _ in range(args.repeats)]
+        print(f"train_forecast_model, no cache  {min(uncached):8.2f} s (best of {args.repeats})")
+        print(f"train_forecast_model, miss      {miss_s:8.2f} s")
+        print(f"train_forecast_model, hit       {min(hits):8.2f} s (best of {args.repeats})   "
+              f"{min(uncached) / min(hits):.2f}x")
+    finally:
+        shutil.rmtree(cache_dir)
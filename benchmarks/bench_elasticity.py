@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+import numpy as np
+
+from src.data.storage import read_frame
+from src.data.load_data import raw_data_paths
+from src.data.preprocess import preprocess_pandas
+from src.pricing.price_elasticity_model import (
+    ELASTICITY_FEATURES, train_elasticity_model, predict_demand_with_elasticity, predict_demand_batch
+)
+
+# Segment Ridge training (serial vs joblib) and scoring one day of SKUs
+# (one sklearn call per row vs the stacked gather + dot predictor)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Elasticity model training / scoring benchmark")
+    parser.add_argument("--input", default=raw_data_paths()[1])
+    parser.add_argument("--segment-col", default="sku_id")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args()
+
+    df = preprocess_pandas(read_frame(args.input))
+    print(f"Rows: {len(df):,}   segments: {df[args.segment_col].nunique():,}   cores: {os.cpu_count()}")
+
+    _, serial = timed(lambda: train_elasticity_model(df, args.segment_col, n_jobs=1))
+    models, parallel = timed(lambda: train_elasticity_model(df, args.segment_col, n_jobs=args.n_jobs))
+    print(f"Train  serial {serial:8.3f} s   n_jobs={args.n_jobs} {parallel:8.3f} s")
+
+    day = df[df["date"] == df["date"].max()]
+    day = day[day[args.segment_col].isin(models)]
+    rowwise, rowwise_s = timed(lambda: np.array([
+        predict_demand_with_elasticity(row, models[row[args.segment_col]], ELASTICITY_FEATURES)
+        for _, row in day.iterrows()
+    ]))
+    batch, batch_s = timed(lambda: predict_demand_batch(day, models, args.segment_col))
+    print(f"Score  {len(day):,} rows   per-row {rowwise_s * 1e3:8.1f} ms   batch {batch_s * 1e3:8.3f} ms"
+          f"   max |diff| {np.abs(rowwise - batch).max():.2e}")
@@ -0,0 +1,56 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from src.features.build_features import build_features
+from src.features.external_features import add_external_signals
+
+EXACT_COLS = ["lag_1", "lag_7", "rolling_mean_7", "price_change", "demand_change", "elasticity"]
+FLOAT_COLS = ["competitor_trend", "temp_volatility"]
+
+# Synthetic cleaned sales frame: rows // days SKUs, SKU-major like the generator output
+def make_sales_frame(rows: int, days: int = 365, seed: int = 22) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_skus = max(1, rows // days)
+    rows = n_skus * days
+    base_price = np.repeat(rng.uniform(20, 300, n_skus).round(2), days)
+    promo = rng.choice([0.0, 0.0, 0.0, 0.25, 0.3], rows)
+    return pd.DataFrame({
+        "date": np.tile(pd.date_range("2024-01-01", periods=days, freq="D").values, n_skus),
+        "sku_id": np.repeat(np.array([f"SK{i:06d}" for i in range(n_skus)], dtype=object), days),
+        "price": (base_price * (1 - promo)).round(2),
+        "units_sold": np.maximum(0, rng.normal(5, 3, rows).astype(int)),
+        "competitor_price": (base_price * rng.uniform(0.85, 1.15, rows)).round(2),
+        "temperature": rng.normal(25, 5, rows)
+    })
+
+def run(engine: str, df: pd.DataFrame):
+    start = time.perf_counter()
+    out = add_external_signals(build_features(df.copy(), engine=engine), engine=engine)
+    return out, time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="pandas groupby vs single-pass NumPy feature engine")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000, 50_000_000])
+    parser.add_argument("--skip-pandas-above", type=int, default=None,
+                        help="Only time the NumPy engine for sizes above this many rows")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        df = make_sales_frame(rows)
+        fast, fast_s = run("numpy", df)
+        line = f"{len(df):>12,} rows  numpy {fast_s:8.2f} s"
+
+        if args.skip_pandas_above is None or rows <= args.skip_pandas_above:
+            slow, slow_s = run("pandas", df)
+            identical = all(np.array_equal(fast[c], slow[c], equal_nan=True) for c in EXACT_COLS)
+            close = all(np.allclose(fast[c], slow[c], rtol=1e-12, atol=0, equal_nan=True) for c in FLOAT_COLS)
+            line += f"  pandas {slow_s:8.2f} s  speedup {slow_s / fast_s:5.1f}x  identical {identical}  float-close {close}"
+
+        print(line)
+        del df, fast
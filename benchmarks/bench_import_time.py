@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import statistics
+import subprocess
+
+# Cold import time of the API and pipeline entry points, from `python -X importtime`
+# in a fresh interpreter per run (median of --repeat runs). The API import also
+# loads the model, so it is measured per inference backend. Exits non-zero when the
+# API module under --budget-backend exceeds --budget-ms, so CI can catch a heavy
+# dependency creeping back into the serving path.
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEAVY = ("pandas", "lightgbm", "sklearn", "scipy", "pyspark", "mlflow", "nannyml", "numba")
+
+# {module: cumulative µs} for one cold import of `module`
+def import_profile(module, env=None):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env={**os.environ, **(env or {})}, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Keep the first (outermost) occurrence of each top-level package
+        profile.setdefault(name.strip(), int(cumulative))
+    return profile
+
+def median_profile(module, repeat, env=None):
+    runs = [import_profile(module, env) for _ in range(repeat)]
+    total = statistics.median(run[module] for run in runs) / 1e3
+    heavy = {name: statistics.median(run.get(name, 0) for run in runs) / 1e3 for name in HEAVY}
+    return total, {name: ms for name, ms in heavy.items() if ms > 0}
+
+def report(label, total, heavy):
+    loaded = ", ".join(f"{name} {ms:.0f}" for name, ms in sorted(heavy.items(), key=lambda kv: -kv[1]))
+    print(f"{label:<52} {total:8.0f} ms   {loaded or '-'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold import time of the entry points")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="API import budget")
+    parser.add_argument("--budget-backend", default="numpy", help="INFERENCE_BACKEND the budget applies to")
+    args = parser.parse_args()
+
+    print(f"{'module':<52} {'import':>11}   heavy dependencies loaded (ms)")
+    api_total = None
+    for backend in ("lightgbm", "numpy"):
+        total, heavy = median_profile("src.api.fastapi_server", args.repeat, {"INFERENCE_BACKEND": backend})
+        report(f"src.api.fastapi_server (INFERENCE_BACKEND={backend})", total, heavy)
+        if backend == args.budget_backend:
+            api_total = total
+
+    for module in ("src.pipelines.forecasting_pipeline", "src.pipelines.pricing_pipeline",
+                   "src.pipelines.streaming_pipeline", "src.models.train_model",
+                   "src.monitoring.drift_detection"):
+        report(module, *median_profile(module, args.repeat))
+
+    if api_total is not None and api_total > args.budget_ms:
+        print(f"❌ API import {api_total:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"✅ API import within the {args.budget_ms:.0f} ms budget")
@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from src.monitoring.incremental_monitor import IncrementalPerformanceMonitor
+
+# Incremental performance monitor throughput (prediction/actual pairs per second) for
+# tumbling and sliding windows, with categorical keys (as read back from Parquet) and
+# with plain string keys, against recomputing every window with a pandas groupby over
+# the rows it covers
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def synthetic_pairs(n_rows, n_skus, n_categories, days, seed=0):
+    rng = np.random.default_rng(seed)
+    sku = rng.integers(0, n_skus, n_rows)
+    actual = rng.poisson(6, n_rows).astype(np.float64)
+    return pd.DataFrame({
+        "date": np.datetime64("2024-01-01") + np.sort(rng.integers(0, days, n_rows)).astype("timedelta64[D]"),
+        "sku_id": pd.Categorical(np.char.add("SKU", sku.astype(str))),
+        "category": pd.Categorical(np.char.add("CAT", (sku % n_categories).astype(str))),
+        "actual_units_sold": actual,
+        "predicted_units_sold": actual + rng.normal(0.2, 1.5, n_rows),
+    })
+
+def stream(monitor, df, batch_rows):
+    windows = []
+    for start in range(0, len(df), batch_rows):
+        windows.extend(monitor.update_frame(df.iloc[start:start + batch_rows]))
+    windows.append(monitor.flush())
+    return windows
+
+# Baseline: every window recomputed from the rows it covers
+def groupby_windows(df, window_days, slide_days):
+    days = df["date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    error = df["predicted_units_sold"] - df["actual_units_sold"]
+    frame = df[["category", "sku_id"]].assign(error=error, sq=error ** 2)
+    windows = []
+    for end_bucket in range(days[0] // slide_days, days[-1] // slide_days + 1):
+        last_day = (end_bucket + 1) * slide_days - 1
+        lo, hi = np.searchsorted(days, [last_day - window_days + 1, last_day + 1])
+        stats = frame.iloc[lo:hi].groupby(["category", "sku_id"], observed=True).agg(
+            count=("error", "size"), sse=("sq", "sum"), bias=("error", "mean")
+        )
+        windows.append(stats.assign(rmse=np.sqrt(stats["sse"] / stats["count"])))
+    return windows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental performance monitor benchmark")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--skus", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--batch-rows", type=int, default=100_000)
+    parser.add_argument("--window-days", type=int, default=28)
+    parser.add_argument("--slide-days", type=int, default=7)
+    args = parser.parse_args()
+
+    df = synthetic_pairs(args.rows, args.skus, args.categories, args.days)
+    string_df = df.astype({"sku_id": object, "category": object})
+    print(f"{args.rows:,} pairs, {args.skus} SKUs, {args.days} days, {args.batch_rows:,}-row batches")
+
+    for label, slide in (("tumbling", args.window_days), ("sliding", args.slide_days)):
+        for keys, frame in (("categorical keys", df), ("string keys", string_df)):
+            monitor = IncrementalPerformanceMonitor(args.window_days, slide)
+            windows, seconds = timed(lambda: stream(monitor, frame, args.batch_rows))
+            print(f"{label:<9} {args.window_days}d/{slide}d  {keys:<17} {args.rows / seconds:12,.0f} pairs/s   "
+                  f"{len(windows)} windows, state {monitor._ring.nbytes / 1024:.0f} KiB")
+
+        baseline, seconds = timed(lambda: groupby_windows(df, args.window_days, slide))
+        print(f"{label:<9} {args.window_days}d/{slide}d  groupby per window {args.rows / seconds:12,.0f} pairs/s   "
+              f"{len(baseline)} windows")
@@ -0,0 +1,85 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import contextlib
+import io
+import time
+import numpy as np
+
+from src.data.storage import read_frame
+from src.data.load_data import raw_data_paths
+from src.data.preprocess import preprocess_pandas
+from src.features.build_features import build_features
+from src.forecasting.forecaster import FEATURE_COLS, TARGET_COL, train_forecast_model, update_forecast_model
+
+# Incremental vs full retraining over a simulated rolling year: after an initial full
+# fit on the first --initial-months, each month arrives in turn and the model is
+#   full      retrained from scratch on all history (forecaster.train_forecast_model)
+#   continue  updated with extra boosting rounds on the new month only
+#   refit     updated by re-estimating leaf values on the new month only
+# Incremental models chain from their own previous version. Each is scored on the
+# following month (RMSE, units sold); wall time covers the (re)training call.
+
+STRATEGIES = ("full", "continue", "refit")
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def rmse(model, df):
+    df = df.dropna(subset=FEATURE_COLS + [TARGET_COL])
+    preds = model.predict(df[FEATURE_COLS].to_numpy(dtype=np.float64))
+    return float(np.sqrt(np.mean((preds - df[TARGET_COL].to_numpy()) ** 2)))
+
+# train_forecast_model prints its own holdout RMSE on every call
+def full_retrain(history_df):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return train_forecast_model(history_df)[0]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental vs full retraining over a rolling year")
+    parser.add_argument("--input", default=raw_data_paths()[1])
+    parser.add_argument("--initial-months", type=int, default=3)
+    parser.add_argument("--num-boost-round", type=int, default=20, help="rounds added per month (continue)")
+    parser.add_argument("--decay-rate", type=float, default=0.9, help="old leaf weight (refit)")
+    args = parser.parse_args()
+
+    df = build_features(preprocess_pandas(read_frame(args.input))).sort_values("date", kind="stable")
+    month = df["date"].dt.to_period("M")
+    months = sorted(month.unique())
+    print(f"{len(df):,} rows, {df['sku_id'].nunique()} SKUs, {len(months)} months "
+          f"({args.initial_months} initial, {len(months) - args.initial_months - 1} rolling updates)")
+
+    initial = full_retrain(df[month < months[args.initial_months]])
+    models = {name: initial for name in STRATEGIES}
+    seconds = {name: [] for name in STRATEGIES}
+    scores = {name: [] for name in STRATEGIES}
+
+    print(f"{'window':<9} {'eval':<9}" + "".join(f"{name + ' s':>11}{name + ' RMSE':>15}" for name in STRATEGIES))
+    for i in range(args.initial_months, len(months) - 1):
+        window_df = df[month == months[i]]
+        eval_df = df[month == months[i + 1]]
+        updates = {
+            "full": lambda: full_retrain(df[month <= months[i]]),
+            "continue": lambda: update_forecast_model(models["continue"], window_df, mode="continue",
+                                                      num_boost_round=args.num_boost_round),
+            "refit": lambda: update_forecast_model(models["refit"], window_df, mode="refit",
+                                                   decay_rate=args.decay_rate),
+        }
+        line = f"{str(months[i]):<9} {str(months[i + 1]):<9}"
+        for name in STRATEGIES:
+            models[name], s = timed(updates[name])
+            seconds[name].append(s)
+            scores[name].append(rmse(models[name], eval_df))
+            line += f"{s:11.2f}{scores[name][-1]:15.3f}"
+        print(line)
+
+    print()
+    for name in STRATEGIES:
+        print(f"{name:<9} total {sum(seconds[name]):8.2f} s   mean next-month RMSE {np.mean(scores[name]):.3f}   "
+              f"final trees {models[name].num_trees()}")
+    speedup = sum(seconds["full"]) / max(sum(seconds["continue"]), 1e-9)
+    print(f"continue vs full: {speedup:.1f}x less training time")
@@ -0,0 +1,81 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import signal
+import subprocess
+import time
+import httpx
+import numpy as np
+
+# Requests/sec of the production server (src/api/serve.py) for several worker counts.
+# Each run starts a fresh server, waits until it answers, then keeps `concurrency`
+# requests in flight against /predict-price/ until `requests` have completed.
+
+PAYLOAD = {
+    "sku_id": "WM001", "price": 100.0, "cost": 60.0, "promo_discount": 0.1,
+    "competitor_price": 105.0, "temperature": 28.0, "lag_1": 7, "rolling_mean_7": 6.5,
+    "elasticity": -1.2, "day_of_week": 2, "is_weekend": 0, "month": 5
+}
+
+def start_server(workers, port, threads_per_worker):
+    cmd = [sys.executable, "-m", "src.api.serve", "--workers", str(workers),
+           "--bind", f"127.0.0.1:{port}", "--threads-per-worker", str(threads_per_worker)]
+    return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def wait_until_ready(url, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/admin/model", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start within {timeout}s")
+
+async def run_load(url, total, concurrency):
+    latencies = []
+    remaining = total
+
+    async def client_loop(client):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.post(f"{url}/predict-price/", json=PAYLOAD)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return total / elapsed, np.array(latencies)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the multi-worker pricing API")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8200)
+    args = parser.parse_args()
+
+    print(f"cores: {os.cpu_count()}   requests: {args.requests}   concurrency: {args.concurrency}")
+    for workers in args.workers:
+        server = start_server(workers, args.port, args.threads_per_worker)
+        url = f"http://127.0.0.1:{args.port}"
+        try:
+            wait_until_ready(url)
+            asyncio.run(run_load(url, min(500, args.requests), args.concurrency))  # warm-up
+            rps, latencies = asyncio.run(run_load(url, args.requests, args.concurrency))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+        print(f"{workers:3d} workers   {rps:8.0f} req/s   p50 {p50:6.2f} ms   p99 {p99:6.2f} ms")
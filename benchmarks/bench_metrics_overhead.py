@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import time
+
+from src.api.metrics import Counter, Gauge, Histogram, MetricsMiddleware, LATENCY_BUCKETS
+
+# Per-request cost of the instrumentation: the ASGI metrics middleware around a no-op
+# app, and the per-stage timers / histogram observations used inside the endpoints
+
+SCOPE = {"type": "http", "path": "/predict-price/", "method": "POST"}
+START = {"type": "http.response.start", "status": 200, "headers": []}
+BODY = {"type": "http.response.body", "body": b"{}"}
+
+async def noop_app(scope, receive, send):
+    await send(START)
+    await send(BODY)
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+async def send(message):
+    pass
+
+async def per_request_seconds(app, n):
+    for _ in range(1000):  # warm-up
+        await app(SCOPE, receive, send)
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(SCOPE, receive, send)
+    return (time.perf_counter() - start) / n
+
+def per_call_seconds(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Metrics instrumentation overhead")
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+
+    instrumented = MetricsMiddleware(
+        noop_app,
+        requests=Counter("requests_total", "", ["path", "status"]),
+        errors=Counter("errors_total", "", ["path"]),
+        in_flight=Gauge("in_flight", ""),
+        latency=Histogram("latency_seconds", "", LATENCY_BUCKETS, ["path"]),
+    )
+    bare = asyncio.run(per_request_seconds(noop_app, args.requests))
+    wrapped = asyncio.run(per_request_seconds(instrumented, args.requests))
+    print(f"middleware   bare {bare * 1e6:6.2f} µs   instrumented {wrapped * 1e6:6.2f} µs"
+          f"   overhead {(wrapped - bare) * 1e6:5.2f} µs/request")
+
+    stage = Histogram("stage_seconds", "", LATENCY_BUCKETS, ["stage"]).labels("predict")
+
+    def timed_block():
+        with stage.time():
+            pass
+
+    observe = per_call_seconds(lambda: stage.observe(0.0003), args.requests)
+    timer = per_call_seconds(timed_block, args.requests)
+    empty = per_call_seconds(lambda: None, args.requests)
+    print(f"stage timer  observe {(observe - empty) * 1e6:5.2f} µs   with-block {(timer - empty) * 1e6:5.2f} µs")
+    print(f"5 stage timers + middleware ≈ {((wrapped - bare) + 5 * (timer - empty)) * 1e6:.2f} µs/request")
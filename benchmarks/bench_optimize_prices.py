@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from src.pricing.pricing_engine import optimize_prices
+
+# Original row-wise implementation (kept here only for comparison)
+def optimize_prices_rowwise(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["adjustment"] = 0.0
+    high_demand = df["predicted_units_sold"] > df["rolling_mean_7"] * 1.1
+    low_demand = df["predicted_units_sold"] < df["rolling_mean_7"] * 0.9
+    df.loc[high_demand, "adjustment"] = 0.05
+    df.loc[low_demand, "adjustment"] = -0.05
+    df["optimized_price"] = df["price"] * (1 + df["adjustment"])
+    df["optimized_price"] = df[["optimized_price", "cost"]].apply(
+        lambda x: max(x["optimized_price"], x["cost"] * 1.1), axis=1
+    )
+    df["optimized_price"] = df[["optimized_price", "competitor_price"]].apply(
+        lambda x: min(x["optimized_price"], x["competitor_price"] * 1.1), axis=1
+    )
+    return df
+
+# Synthetic forecast output with the columns the pricing engine reads
+def make_forecast_frame(rows: int, seed: int = 22) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    base_price = rng.uniform(20, 300, rows).round(2)
+    return pd.DataFrame({
+        "price": base_price,
+        "cost": rng.uniform(10, 100, rows).round(2),
+        "competitor_price": (base_price * rng.uniform(0.85, 1.15, rows)).round(2),
+        "rolling_mean_7": rng.integers(0, 70, rows) / 7,
+        "predicted_units_sold": rng.normal(5, 2, rows)
+    })
+
+def timed(fn, df):
+    start = time.perf_counter()
+    out = fn(df)
+    return out, time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Row-wise vs vectorized optimize_prices")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=None,
+                        help="Run the row-wise version on the first N rows only (it takes minutes at 10M)")
+    args = parser.parse_args()
+
+    df = make_forecast_frame(args.rows)
+    legacy_df = df if args.legacy_rows is None else df.iloc[:args.legacy_rows]
+
+    fast, fast_s = timed(optimize_prices, df)
+    slow, slow_s = timed(optimize_prices_rowwise, legacy_df)
+
+    identical = (
+        np.array_equal(fast["optimized_price"].to_numpy()[:len(slow)], slow["optimized_price"].to_numpy())
+        and np.array_equal(fast["adjustment"].to_numpy()[:len(slow)], slow["adjustment"].to_numpy())
+    )
+    slow_per_row = slow_s / len(legacy_df)
+    fast_per_row = fast_s / len(df)
+
+    print(f"Rows: vectorized {len(df):,}, row-wise {len(legacy_df):,}")
+    print(f"Row-wise apply : {slow_s:9.3f} s  ({slow_per_row * 1e9:8.1f} ns/row)")
+    print(f"Vectorized     : {fast_s:9.3f} s  ({fast_per_row * 1e9:8.1f} ns/row)")
+    print(f"Speedup        : {slow_per_row / fast_per_row:9.1f}x")
+    print(f"Identical output: {identical}")
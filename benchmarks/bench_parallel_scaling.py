@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+import lightgbm as lgb
+
+from src.data.storage import read_frame
+from src.data.load_data import raw_data_paths
+from src.pipelines.parallel_executor import run_parallel
+from src.pipelines.streaming_pipeline import score_partition
+
+# Wall time of scoring the raw dataset in one process vs. the process-pool executor
+# with 1..N workers (includes pool start-up and shard transfer, not the file read)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling of the parallel scoring executor")
+    parser.add_argument("--input", default=raw_data_paths()[1])
+    parser.add_argument("--model", default="models/lightgbm_model.txt")
+    parser.add_argument("--mode", default="rules", choices=["rules", "grid"])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    sales_df = read_frame(args.input)
+    print(f"Rows: {len(sales_df):,}   cores: {os.cpu_count()}")
+
+    start = time.perf_counter()
+    expected = score_partition(sales_df, lgb.Booster(model_file=args.model), mode=args.mode)
+    baseline = time.perf_counter() - start
+    print(f"single process   {baseline:7.2f} s")
+
+    workers = 1
+    while workers <= args.max_workers:
+        start = time.perf_counter()
+        result = run_parallel(sales_df, args.model, mode=args.mode, n_workers=workers)
+        seconds = time.perf_counter() - start
+        same = len(result) == len(expected) and result.index.sort_values().equals(expected.index.sort_values())
+        print(f"{workers:3d} workers      {seconds:7.2f} s   speedup {baseline / seconds:5.2f}x   same rows: {same}")
+        workers *= 2
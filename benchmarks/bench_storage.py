@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import tempfile
+import time
+
+from src.data.storage import read_frame, write_frame
+from src.data.load_data import raw_data_paths
+from src.forecasting.forecaster import FEATURE_COLS, TARGET_COL
+
+def timed_read(path, columns=None, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read_frame(path, columns=columns)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CSV vs Parquet load times for the sales dataset")
+    parser.add_argument("--csv", default=None, help="CSV to benchmark (defaults to config paths.raw_data)")
+    args = parser.parse_args()
+
+    csv_path = args.csv or raw_data_paths()[1]
+    df = read_frame(csv_path)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parquet_path = os.path.join(tmp, "sales_data.parquet")
+        write_frame(df, parquet_path)
+
+        # Columns a model-input read would project (those present in raw sales data)
+        projection = [c for c in FEATURE_COLS + [TARGET_COL] if c in df.columns]
+
+        print(f"Rows: {len(df):,}")
+        print(f"Size      CSV {os.path.getsize(csv_path) / 1e6:8.1f} MB   Parquet {os.path.getsize(parquet_path) / 1e6:8.1f} MB")
+        print(f"Full read CSV {timed_read(csv_path):8.3f} s    Parquet {timed_read(parquet_path):8.3f} s")
+        print(f"Projected CSV {timed_read(csv_path, projection):8.3f} s    Parquet {timed_read(parquet_path, projection):8.3f} s"
+              f"   ({len(projection)} columns)")
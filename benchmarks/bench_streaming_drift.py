@@ -0,0 +1,130 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import importlib.util
+import time
+import numpy as np
+from scipy.spatial.distance import jensenshannon
+from scipy.stats import ks_2samp
+
+from src.data.storage import read_frame
+from src.data.load_data import raw_data_paths
+from src.data.preprocess import preprocess_pandas
+from src.features.build_features import build_features
+from src.monitoring.streaming_drift import StreamingDriftDetector, DRIFT_FEATURES
+
+# Streaming drift detector: fit cost, update throughput (blocks and single rows), state
+# size, and agreement with the batch computation per monthly chunk: NannyML's
+# UnivariateDriftCalculator when installed, and always the exact scipy statistics
+# (Doane-binned Jensen-Shannon as NannyML computes it, two-sample KS)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+# NannyML's continuous Jensen-Shannon distance (histogram over the reference's Doane bins)
+def exact_jensen_shannon(reference, chunk):
+    reference, chunk = reference[~np.isnan(reference)], chunk[~np.isnan(chunk)]
+    bins = np.histogram_bin_edges(reference, bins="doane")
+    ref_proba = np.histogram(reference, bins=bins)[0] / len(reference)
+    chunk_proba = np.histogram(chunk, bins=bins)[0] / len(chunk)
+    leftover = 1 - chunk_proba.sum()
+    if leftover > 0:
+        ref_proba, chunk_proba = np.append(ref_proba, 0), np.append(chunk_proba, leftover)
+    return jensenshannon(ref_proba, chunk_proba, base=2)
+
+def exact_ks(reference, chunk):
+    return ks_2samp(reference[~np.isnan(reference)], chunk[~np.isnan(chunk)]).statistic
+
+def nannyml_statistics(reference_df, analysis_df):
+    import nannyml as nml
+
+    calculator = nml.UnivariateDriftCalculator(
+        column_names=DRIFT_FEATURES,
+        timestamp_column_name="date",
+        chunk_period="M",
+        continuous_methods=["jensen_shannon", "kolmogorov_smirnov"]
+    )
+    calculator.fit(reference_df)
+    frame = calculator.calculate(analysis_df).filter(period="analysis").to_df()
+    keys = frame[("chunk", "chunk", "key")].astype(str)
+    return {
+        (key, f, method): value
+        for f in DRIFT_FEATURES for method in ("jensen_shannon", "kolmogorov_smirnov")
+        for key, value in zip(keys, frame[(f, method, "value")])
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming drift detector benchmark")
+    parser.add_argument("--input", default=raw_data_paths()[1])
+    parser.add_argument("--reference-share", type=float, default=0.6, help="earliest dates used as reference")
+    parser.add_argument("--block-rows", type=int, default=10_000)
+    parser.add_argument("--n-quantiles", type=int, default=1000)
+    args = parser.parse_args()
+
+    df = build_features(preprocess_pandas(read_frame(args.input))).sort_values("date", kind="stable")
+    dates = np.sort(df["date"].unique())
+    split = dates[int(len(dates) * args.reference_share)]
+    reference_df = df[df["date"] < split].reset_index(drop=True)
+    analysis_df = df[df["date"] >= split].reset_index(drop=True)
+    # Same drift as post_deploy_monitor.simulate_post_deploy_data
+    rng = np.random.default_rng(22)
+    analysis_df["competitor_price"] *= rng.uniform(0.97, 1.05, size=len(analysis_df))
+    analysis_df["promo_discount"] = np.clip(analysis_df["promo_discount"] + rng.normal(0, 0.01, len(analysis_df)), 0, 0.5)
+    analysis_df["price_vs_competitor"] = analysis_df["price"] / analysis_df["competitor_price"]
+    print(f"Reference rows: {len(reference_df):,}   analysis rows: {len(analysis_df):,}")
+
+    detector, fit_s = timed(lambda: StreamingDriftDetector.fit(
+        reference_df, n_quantiles=args.n_quantiles, chunk_period="M"
+    ))
+    state_bytes = detector._counts.nbytes
+    print(f"Fit {fit_s * 1e3:8.1f} ms   open-chunk state {state_bytes / 1024:.1f} KiB "
+          f"({len(DRIFT_FEATURES)} features, ≤ {args.n_quantiles} quantiles)")
+
+    X = analysis_df[DRIFT_FEATURES].to_numpy(dtype=np.float64)
+    stamps = analysis_df["date"].to_numpy(dtype="datetime64[ns]")
+
+    def stream_blocks():
+        results = []
+        for start in range(0, len(X), args.block_rows):
+            end = start + args.block_rows
+            results.extend(detector.update(X[start:end], timestamps=stamps[start:end]))
+        results.append(detector.flush())
+        return results
+
+    results, stream_s = timed(stream_blocks)
+    print(f"update() in {args.block_rows:,}-row blocks   {len(X) / stream_s:12,.0f} rows/s")
+
+    n_single = min(len(X), 100_000)
+    # Request-path usage: one row per call, chunked by the current time
+    _, single_s = timed(lambda: [detector.observe(X[i]) for i in range(n_single)])
+    detector.flush()
+    print(f"observe() one row at a time (live)  {single_s / n_single * 1e6:9.2f} µs/row")
+
+    # Agreement per monthly chunk
+    chunk_keys = stamps.astype("datetime64[M]").astype(str)
+    exact = {}
+    for key in np.unique(chunk_keys):
+        rows = chunk_keys == key
+        for j, f in enumerate(DRIFT_FEATURES):
+            ref = reference_df[f].to_numpy(dtype=np.float64)
+            exact[(key, f, "jensen_shannon")] = exact_jensen_shannon(ref, X[rows, j])
+            exact[(key, f, "kolmogorov_smirnov")] = exact_ks(ref, X[rows, j])
+    streamed = {
+        (r["chunk"], f, method): stats[method]
+        for r in results for f, stats in r["features"].items() for method in ("jensen_shannon", "kolmogorov_smirnov")
+    }
+    for method in ("jensen_shannon", "kolmogorov_smirnov"):
+        diff = max(abs(streamed[k] - v) for k, v in exact.items() if k[2] == method)
+        print(f"max |Δ| vs exact scipy   {method:<20} {diff:.2e}   ({len(results)} chunks)")
+
+    if importlib.util.find_spec("nannyml") is not None:
+        nml_values, nml_s = timed(lambda: nannyml_statistics(reference_df, analysis_df))
+        print(f"NannyML UnivariateDriftCalculator fit + calculate {nml_s:8.2f} s   "
+              f"(streaming fit + update {fit_s + stream_s:.2f} s)")
+        for method in ("jensen_shannon", "kolmogorov_smirnov"):
+            diff = max(abs(streamed[k] - v) for k, v in nml_values.items() if k[2] == method)
+            print(f"max |Δ| vs NannyML       {method:<20} {diff:.2e}")
@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import resource
+import subprocess
+import tempfile
+import time
+
+# Peak RSS of scoring the raw dataset in memory vs. with the streaming pipeline.
+# Each variant runs in its own interpreter so ru_maxrss only covers that variant.
+
+def run_in_memory(input_path, model_path, output_path):
+    import lightgbm as lgb
+    from src.data.storage import read_frame, write_frame
+    from src.pipelines.streaming_pipeline import score_partition
+
+    model = lgb.Booster(model_file=model_path)
+    write_frame(score_partition(read_frame(input_path), model), output_path)
+
+def run_streaming(input_path, model_path, output_path, n_partitions, chunk_rows):
+    from src.pipelines.streaming_pipeline import run_streaming_pipeline
+
+    run_streaming_pipeline(model_path, input_path=input_path, output_path=output_path,
+                           n_partitions=n_partitions, chunk_rows=chunk_rows)
+
+def measure(variant, args, output_path):
+    cmd = [sys.executable, __file__, "--variant", variant, "--input", args.input, "--model", args.model,
+           "--output", output_path, "--partitions", str(args.partitions), "--chunk-rows", str(args.chunk_rows)]
+    start = time.perf_counter()
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    seconds = time.perf_counter() - start
+    peak_mb = int(out.strip().splitlines()[-1]) / 1024  # ru_maxrss is in KiB on Linux
+    return peak_mb, seconds
+
+if __name__ == "__main__":
+    from src.data.load_data import raw_data_paths
+
+    parser = argparse.ArgumentParser(description="Peak memory: in-memory vs streaming scoring")
+    parser.add_argument("--input", default=raw_data_paths()[1])
+    parser.add_argument("--model", default="models/lightgbm_model.txt")
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--chunk-rows", type=int, default=500_000)
+    parser.add_argument("--variant", choices=["in_memory", "streaming"], default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--output", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant == "in_memory":
+        run_in_memory(args.input, args.model, args.output)
+        print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    elif args.variant == "streaming":
+        run_streaming(args.input, args.model, args.output, args.partitions, args.chunk_rows)
+        print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    else:
+        print(f"Input: {args.input} ({os.path.getsize(args.input) / 1e6:.1f} MB)")
+        with tempfile.TemporaryDirectory() as tmp:
+            for variant in ["in_memory", "streaming"]:
+                peak_mb, seconds = measure(variant, args, os.path.join(tmp, f"{variant}.csv"))
+                print(f"{variant:10s} peak RSS {peak_mb:8.1f} MB   wall {seconds:6.2f} s")
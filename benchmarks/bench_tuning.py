@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import contextlib
+import io
+import shutil
+import tempfile
+import time
+
+from src.data.storage import read_frame
+from src.data.load_data import raw_data_paths
+from src.data.preprocess import preprocess_pandas
+from src.features.build_features import build_features
+from src.models.dataset_cache import DatasetCache
+from src.models.tuning import run_tuning
+
+# Hyperparameter search scaling: the same trials (pruning off, so every worker count does
+# identical work) on 1, 2, 4, ... workers with one LightGBM thread each, reported as
+# speedup and parallel efficiency over one worker; then median pruning on vs off at the
+# largest worker count (wall time, trials pruned, best validation RMSE)
+
+def search(df, cache, workers, trials, prune_every, rounds):
+    output_path = os.path.join(cache.cache_dir, "tuned_params.yaml")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        best, results = run_tuning(
+            df, output_path=output_path, mlflow_experiment=None, dataset_cache=cache, n_trials=trials,
+            n_workers=workers, threads_per_worker=1, num_boost_round=rounds, prune_every=prune_every
+        )
+    return time.perf_counter() - start, best, results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter search benchmark")
+    parser.add_argument("--input", default=raw_data_paths()[1])
+    parser.add_argument("--trials", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=300)
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="default: 1, 2, 4, ... cpu_count")
+    args = parser.parse_args()
+
+    worker_counts = args.workers or sorted({min(2 ** i, os.cpu_count()) for i in range(8) if 2 ** i <= 2 * os.cpu_count()})
+    df = build_features(preprocess_pandas(read_frame(args.input)))
+    print(f"{len(df):,} rows, {args.trials} trials × ≤ {args.rounds} rounds, {os.cpu_count()} cores")
+
+    cache = DatasetCache(cache_dir=tempfile.mkdtemp(prefix="bench-tuning-"))
+    try:
+        search(df, cache, 1, 1, 0, 10)  # builds the cached Datasets outside the timings
+        base = None
+        for workers in worker_counts:
+            seconds, _, _ = search(df, cache, workers, args.trials, 0, args.rounds)
+            base = base or seconds * worker_counts[0]
+            speedup = base / seconds
+            print(f"{workers:3d} workers  {seconds:8.2f} s   speedup {speedup:5.2f}x   "
+                  f"efficiency {speedup / workers:6.1%}")
+
+        workers = worker_counts[-1]
+        for label, prune_every in (("no pruning", 0), ("median pruning", 25)):
+            seconds, best, results = search(df, cache, workers, args.trials, prune_every, args.rounds)
+            pruned = sum(r["state"] == "pruned" for r in results)
+            print(f"{label:<15} {seconds:8.2f} s   {pruned:3d}/{len(results)} pruned   best RMSE {best['rmse']:.4f}")
+    finally:
+        shutil.rmtree(cache.cache_dir)
@@ -0,0 +1,90 @@
+import asyncio
+
+import numpy as np
+
+from src.api.metrics import Histogram
+
+# Coalesces concurrent single-row predictions into one Booster.predict call.
+# A batch is flushed after max_wait_ms from its first request or once
+# max_batch_size requests are queued, whichever comes first.
+class PredictionBatcher:
+    def __init__(self, registry, n_features: int, max_wait_ms: float = 2.0, max_batch_size: int = 64):
+        self.registry = registry
+        self.n_features = n_features
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+
+        self.queue_depth = Histogram(
+            "pricing_batch_queue_depth", "Requests waiting in the coalescing queue at enqueue time",
+            buckets=(0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+        )
+        self.batch_size = Histogram(
+            "pricing_batch_size", "Rows per coalesced Booster.predict call",
+            buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+        )
+
+        self._loop = None
+        self._queue = None
+        self._worker = None
+
+    # The queue and worker belong to the running event loop; recreate them if the loop changed
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def predict(self, row: np.ndarray) -> float:
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self._queue.put_nowait((row, future))
+        self.queue_depth.observe(self._queue.qsize())
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            self.batch_size.observe(len(batch))
+
+            X = np.empty((len(batch), self.n_features), dtype=np.float64)
+            for i, (row, _) in enumerate(batch):
+                X[i] = row
+
+            # Predict off the event loop so new requests keep queueing meanwhile
+            model = self.registry.get()
+            try:
+                preds = await self._loop.run_in_executor(None, model.predict, X)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), pred in zip(batch, preds):
+                if not future.done():  # caller may have gone away
+                    future.set_result(pred)
+
+    def stats(self) -> dict:
+        return {
+            "max_wait_ms": self.max_wait_ms,
+            "max_batch_size": self.max_batch_size,
+            "queue_depth": self.queue_depth.snapshot(),
+            "batch_size": self.batch_size.snapshot()
+        }
@@ -1,18 +1,122 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-import lightgbm as lgb
+from typing import Any, Dict, List, Optional
+import datetime as dt
+
+from fastapi import Body, FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, ValidationError
 import numpy as np
-import pandas as pd
 import uvicorn
+import json
 import os
+import threading
+
+from src.api.batching import PredictionBatcher
+from src.api.metrics import (
+    Counter, Gauge, Histogram, MetricsRegistry, MetricsMiddleware, LATENCY_BUCKETS, observe_since_request_start
+)
+from src.api.model_registry import ModelRegistry
+from src.features.feature_store import OnlineFeatureStore
+from src.monitoring.streaming_drift import StreamingDriftDetector
+from src.pricing.pricing_rules import pricing_rule_kernel
+
+# Load trained model. MODEL_PATH may also point at an MLflow run/experiment
+# directory; the registry watches it and hot-swaps new models.
+MODEL_PATH = os.environ.get("MODEL_PATH", "models/lightgbm_model.txt")
+MODEL_POLL_SECONDS = float(os.environ.get("MODEL_POLL_SECONDS", "5"))
+# Inference backend: "lightgbm" (Booster.predict), "numpy" or "numba" (compiled trees)
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "lightgbm")
+# LightGBM prediction threads per process (unset = LightGBM default); src/api/serve.py
+# sets it per worker so N workers don't each start one thread per core
+LGBM_NUM_THREADS = int(os.environ["LGBM_NUM_THREADS"]) if os.environ.get("LGBM_NUM_THREADS") else None
+registry = ModelRegistry(
+    MODEL_PATH, poll_interval=MODEL_POLL_SECONDS, backend=INFERENCE_BACKEND, num_threads=LGBM_NUM_THREADS
+)
+
+# Optional micro-batching of concurrent /predict-price/ calls
+BATCHING_ENABLED = os.environ.get("PRICING_BATCHING", "0") == "1"
+BATCH_MAX_WAIT_MS = float(os.environ.get("PRICING_BATCH_MAX_WAIT_MS", "2"))
+BATCH_MAX_SIZE = int(os.environ.get("PRICING_BATCH_MAX_SIZE", "64"))
 
-# Load trained model
-MODEL_PATH = "models/lightgbm_model.txt"
-model = lgb.Booster(model_file=MODEL_PATH)
+# Online feature store (lag_1 / rolling_mean_7 / elasticity per SKU), seeded from the featured dataset
+FEATURE_STORE_PATH = os.environ.get("FEATURE_STORE_PATH", "data/processed/featured_sales_data.csv")
+feature_store = (
+    OnlineFeatureStore.from_file(FEATURE_STORE_PATH) if os.path.exists(FEATURE_STORE_PATH)
+    else OnlineFeatureStore()
+)
+
+# Live feature drift of incoming requests against the training reference (reference
+# summary written by python -m src.monitoring.streaming_drift); off when it doesn't exist.
+# Chunks are calendar periods (default: UTC day) of the request time.
+DRIFT_REFERENCE_PATH = os.environ.get("DRIFT_REFERENCE_PATH", "models/drift_reference.npz")
+DRIFT_CHUNK_PERIOD = os.environ.get("DRIFT_CHUNK_PERIOD", "D")
+drift_monitor = (
+    StreamingDriftDetector.load(DRIFT_REFERENCE_PATH, chunk_period=DRIFT_CHUNK_PERIOD)
+    if os.path.exists(DRIFT_REFERENCE_PATH) else None
+)
 
 # Initialize API
 app = FastAPI(title="Dynamic Pricing API", version="1.0")
 
+# Prometheus metrics (GET /metrics): per-route request count / latency / errors and
+# in-flight requests from the ASGI middleware, per-stage latency inside the endpoints
+# (parse = routing + body read + pydantic validation, features, predict, dispatch =
+# wait for the threadpool or micro-batcher, pricing), and the active model version.
+# PRICING_METRICS_DIR (set by src/api/serve.py) merges the values of every worker
+# process at scrape time; per-worker state (model version, drift) gets a pid label.
+metrics = MetricsRegistry(
+    multiprocess_dir=os.environ.get("PRICING_METRICS_DIR") or None,
+    flush_interval=float(os.environ.get("PRICING_METRICS_FLUSH_SECONDS", "1"))
+)
+request_count = metrics.register(Counter("pricing_requests_total", "HTTP requests by route and status", ["path", "status"]))
+request_errors = metrics.register(Counter("pricing_request_errors_total", "5xx responses and unhandled exceptions", ["path"]))
+requests_in_flight = metrics.register(Gauge("pricing_requests_in_flight", "Requests currently being served"))
+request_latency = metrics.register(Histogram(
+    "pricing_request_duration_seconds", "End-to-end request latency", LATENCY_BUCKETS, ["path"]
+))
+stage_latency = metrics.register(Histogram(
+    "pricing_stage_duration_seconds", "Latency of each request stage", LATENCY_BUCKETS, ["stage"]
+))
+model_info = metrics.register(Gauge(
+    "pricing_model_info", "Active model version (always 1)", ["version", "backend"], multiprocess_mode="all"
+))
+model_load_seconds = metrics.register(Gauge(
+    "pricing_model_load_seconds", "Load + warm-up time of the active model", multiprocess_mode="all"
+))
+feature_drift = metrics.register(Gauge(
+    "pricing_feature_drift", "Drift statistic of the open chunk of request features", ["feature", "statistic"],
+    multiprocess_mode="all"
+))
+stage_timers = {
+    stage: stage_latency.labels(stage)
+    for stage in ("parse", "validate", "features", "predict", "dispatch", "pricing")
+}
+
+app.add_middleware(
+    MetricsMiddleware,
+    requests=request_count, errors=request_errors, in_flight=requests_in_flight, latency=request_latency
+)
+
+@app.on_event("startup")
+def start_model_watcher():
+    registry.start()
+    metrics.start()
+
+@app.on_event("shutdown")
+def stop_model_watcher():
+    registry.stop()
+    metrics.stop()
+
+# Feature order expected by the demand model
+feature_cols = [
+    "price", "promo_discount", "competitor_price", "temperature",
+    "price_margin", "price_vs_competitor",
+    "lag_1", "rolling_mean_7", "elasticity",
+    "day_of_week", "is_weekend", "month"
+]
+# Positions of the drift monitor's features in a model feature row
+drift_idx = [feature_cols.index(f) for f in drift_monitor.features] if drift_monitor is not None else None
+
 # Input schema
 class PricingRequest(BaseModel):
     sku_id: str
@@ -28,53 +132,288 @@ class PricingRequest(BaseModel):
     is_weekend: int
     month: int
 
-# Helper: Apply pricing logic
+# Input schema when the server looks up the demand history features by sku_id
+class SkuPricingRequest(BaseModel):
+    sku_id: str
+    price: float
+    competitor_price: float
+    temperature: float
+    promo_discount: float = 0.0
+    cost: Optional[float] = None     # defaults to the SKU's last known cost
+    date: Optional[dt.date] = None   # calendar features; defaults to today (UTC)
+
+# A realized sale (one SKU-day), applied to the feature store in date order
+class SalesEvent(BaseModel):
+    sku_id: str
+    price: float
+    units_sold: float
+    cost: Optional[float] = None
+
+# Helper: Apply pricing logic (same vectorized kernel as the batch pricing engine)
 def apply_pricing_rules(predicted_demand, price, cost, competitor_price, rolling_mean_7):
-    adjustment = 0.0
-    if predicted_demand > rolling_mean_7 * 1.1:
-        adjustment = 0.05
-    elif predicted_demand < rolling_mean_7 * 0.9:
-        adjustment = -0.05
+    _, new_price = pricing_rule_kernel(predicted_demand, price, cost, competitor_price, rolling_mean_7)
+    return round(float(new_price), 2)
 
-    new_price = price * (1 + adjustment)
-    new_price = max(new_price, cost * 1.1)
-    new_price = min(new_price, competitor_price * 1.1)
-    return round(new_price, 2)
+# Helper: price / competitor_price in float64, as the pandas column computed it
+# (x / 0 → inf, 0 / 0 → nan) instead of raising ZeroDivisionError
+def price_ratio(price: float, competitor_price: float) -> float:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.float64(price) / competitor_price
 
-# API endpoint
-@app.post("/predict-price/")
-def predict_price(request: PricingRequest):
-    input_data = pd.DataFrame([request.dict()])
+# Helper: Write one request into a float64 row in feature_cols order.
+# Derived features use the same float64 arithmetic as the pandas columns did.
+def fill_feature_row(row: np.ndarray, r: PricingRequest):
+    row[:] = (
+        r.price, r.promo_discount, r.competitor_price, r.temperature,
+        r.price - r.cost, price_ratio(r.price, r.competitor_price),
+        r.lag_1, r.rolling_mean_7, r.elasticity,
+        r.day_of_week, r.is_weekend, r.month
+    )
 
-    feature_cols = [
-        "price", "promo_discount", "competitor_price", "temperature",
-        "price_margin", "price_vs_competitor",
-        "lag_1", "rolling_mean_7", "elasticity",
-        "day_of_week", "is_weekend", "month"
-    ]
+# Helper: Build a contiguous (n_requests, n_features) matrix in feature_cols order.
+# The derived columns are computed on the whole matrix in float64, like the pandas
+# columns: competitor_price=0 gives inf for that item instead of failing the batch.
+def build_feature_matrix(requests: List[PricingRequest]) -> np.ndarray:
+    X = np.empty((len(requests), len(feature_cols)), dtype=np.float64)
+    for i, r in enumerate(requests):
+        X[i] = (
+            r.price, r.promo_discount, r.competitor_price, r.temperature,
+            r.cost, np.nan,  # cost until price_margin is derived below
+            r.lag_1, r.rolling_mean_7, r.elasticity,
+            r.day_of_week, r.is_weekend, r.month
+        )
+    X[:, 4] = X[:, 0] - X[:, 4]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        X[:, 5] = X[:, 0] / X[:, 2]
+    return X
 
-    # Derived features
-    input_data["price_margin"] = input_data["price"] - input_data["cost"]
-    input_data["price_vs_competitor"] = input_data["price"] / input_data["competitor_price"]
+# Preallocated single-row buffers, one per worker thread (sync endpoints run in a threadpool)
+_buffers = threading.local()
 
-    # Predict demand
-    pred = model.predict(input_data[feature_cols])[0]
+def _row_buffer() -> np.ndarray:
+    buf = getattr(_buffers, "row", None)
+    if buf is None:
+        buf = _buffers.row = np.empty((1, len(feature_cols)), dtype=np.float64)
+    return buf
 
-    # Optimize price
+# Helper: Count one request's features into the live drift chunk
+def observe_drift(row: np.ndarray):
+    if drift_monitor is not None:
+        drift_monitor.observe(row[drift_idx])
+
+# Helper: Predict demand for one request without building a DataFrame
+def predict_demand(request: PricingRequest) -> float:
+    buf = _row_buffer()
+    with stage_timers["features"].time():
+        fill_feature_row(buf[0], request)
+        observe_drift(buf[0])
+    model = registry.get()
+    with stage_timers["predict"].time():
+        return model.predict(buf)[0]
+
+# Micro-batcher for /predict-price/ (None unless PRICING_BATCHING=1)
+batcher = (
+    PredictionBatcher(registry, len(feature_cols), max_wait_ms=BATCH_MAX_WAIT_MS, max_batch_size=BATCH_MAX_SIZE)
+    if BATCHING_ENABLED else None
+)
+if batcher is not None:
+    metrics.register(batcher.queue_depth)
+    metrics.register(batcher.batch_size)
+
+# Helper: Price one request given its predicted demand
+def price_response(sku_id: str, pred: float, price: float, cost: float, competitor_price: float, rolling_mean_7: float) -> dict:
     optimized_price = apply_pricing_rules(
         predicted_demand=pred,
-        price=request.price,
-        cost=request.cost,
-        competitor_price=request.competitor_price,
-        rolling_mean_7=request.rolling_mean_7
+        price=price,
+        cost=cost,
+        competitor_price=competitor_price,
+        rolling_mean_7=rolling_mean_7
     )
 
     return {
-        "sku_id": request.sku_id,
+        "sku_id": sku_id,
         "predicted_demand": round(pred, 2),
         "optimized_price": optimized_price
     }
 
-# Run the server (for local testing)
+# Helper: Predict demand for one prepared feature row
+def predict_row(row: np.ndarray) -> float:
+    model = registry.get()
+    with stage_timers["predict"].time():
+        return model.predict(row.reshape(1, -1))[0]
+
+# API endpoint
+@app.post("/predict-price/")
+async def predict_price(request: PricingRequest):
+    observe_since_request_start(stage_timers["parse"])
+
+    # Predict demand: coalesced with concurrent requests, or directly in the threadpool
+    with stage_timers["dispatch"].time():
+        if batcher is not None:
+            row = np.empty(len(feature_cols), dtype=np.float64)
+            fill_feature_row(row, request)
+            observe_drift(row)
+            pred = await batcher.predict(row)
+        else:
+            pred = await run_in_threadpool(predict_demand, request)
+
+    with stage_timers["pricing"].time():
+        return price_response(
+            request.sku_id, pred, request.price, request.cost, request.competitor_price, request.rolling_mean_7
+        )
+
+# API endpoint: client sends live price/competitor/temperature, history features come from the store
+@app.post("/predict-price/by-sku")
+async def predict_price_by_sku(request: SkuPricingRequest):
+    observe_since_request_start(stage_timers["parse"])
+
+    with stage_timers["features"].time():
+        features = feature_store.lookup(request.sku_id)
+        if features is None:
+            raise HTTPException(status_code=404, detail=f"Unknown sku_id: {request.sku_id}")
+        lag_1, rolling_mean_7, elasticity, stored_cost = features
+
+        cost = request.cost if request.cost is not None else stored_cost
+        day = request.date or dt.datetime.now(dt.timezone.utc).date()
+        day_of_week = day.weekday()
+
+        row = np.array([
+            request.price, request.promo_discount, request.competitor_price, request.temperature,
+            request.price - cost, price_ratio(request.price, request.competitor_price),
+            lag_1, rolling_mean_7, elasticity,
+            day_of_week, int(day_of_week >= 5), day.month
+        ], dtype=np.float64)
+        observe_drift(row)
+
+    with stage_timers["dispatch"].time():
+        if batcher is not None:
+            pred = await batcher.predict(row)
+        else:
+            pred = await run_in_threadpool(predict_row, row)
+
+    with stage_timers["pricing"].time():
+        return price_response(request.sku_id, pred, request.price, cost, request.competitor_price, rolling_mean_7)
+
+# Feed realized sales into the feature store (events for a SKU must arrive in date order)
+@app.post("/sales-events/")
+def record_sales_events(events: List[SalesEvent]):
+    for e in events:
+        feature_store.record_sale(e.sku_id, e.price, e.units_sold, cost=e.cost)
+    return {"recorded": len(events), "skus": len(feature_store)}
+
+# Batch endpoint: one feature matrix, one model call, vectorized pricing rules.
+# Items are validated one by one so a bad item only fails its own slot.
+@app.post("/predict-prices/batch")
+def predict_prices_batch(items: List[Any] = Body(...)):
+    observe_since_request_start(stage_timers["parse"])
+    results: List[Dict[str, Any]] = [None] * len(items)
+    valid_idx, valid_requests = [], []
+
+    with stage_timers["validate"].time():
+        for i, item in enumerate(items):
+            try:
+                valid_requests.append(PricingRequest.parse_obj(item))
+                valid_idx.append(i)
+            except ValidationError as e:
+                sku_id = item.get("sku_id") if isinstance(item, dict) else None
+                results[i] = {"index": i, "sku_id": sku_id, "error": json.loads(e.json())}
+
+    if valid_requests:
+        model = registry.get()
+        with stage_timers["features"].time():
+            X = build_feature_matrix(valid_requests)
+            if drift_monitor is not None:
+                drift_monitor.update(X[:, drift_idx])
+        with stage_timers["predict"].time():
+            preds = model.predict(X)
+
+        with stage_timers["pricing"].time():
+            # Column positions follow feature_cols; cost/rolling_mean_7 come from the requests
+            cost = np.fromiter((r.cost for r in valid_requests), dtype=np.float64, count=len(valid_requests))
+            _, optimized = pricing_rule_kernel(
+                predicted_demand=preds,
+                price=X[:, 0],
+                cost=cost,
+                competitor_price=X[:, 2],
+                rolling_mean_7=X[:, 7]
+            )
+
+            for i, r, pred, price in zip(valid_idx, valid_requests, preds, optimized):
+                results[i] = {
+                    "index": i,
+                    "sku_id": r.sku_id,
+                    "predicted_demand": round(float(pred), 2),
+                    "optimized_price": round(float(price), 2)
+                }
+
+    return results
+
+# Admin: active model version and load time
+@app.get("/admin/model")
+def model_status():
+    return registry.status()
+
+# Admin: load the model source now instead of waiting for the watcher
+@app.post("/admin/model/reload")
+def reload_model():
+    swapped = registry.reload(force=True)
+    return {"swapped": swapped, **registry.status()}
+
+# Admin: micro-batching settings plus queue-depth and batch-size histograms
+@app.get("/admin/batching")
+def batching_status():
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+# Admin: feature store size and source
+@app.get("/admin/feature-store")
+def feature_store_status():
+    return {"skus": len(feature_store), "source": FEATURE_STORE_PATH}
+
+# NaN statistics (a feature with no values yet) as null, for JSON
+def _drift_json(result):
+    if result is None:
+        return None
+    features = {
+        f: {k: (None if isinstance(v, float) and v != v else v) for k, v in stats.items()}
+        for f, stats in result["features"].items()
+    }
+    return {**result, "features": features}
+
+# Admin: drift statistics of the open chunk and the most recent closed chunks
+@app.get("/admin/drift")
+def drift_status(recent: int = 7):
+    if drift_monitor is None:
+        return {"enabled": False, "reference": DRIFT_REFERENCE_PATH}
+    return {
+        "enabled": True,
+        "reference": DRIFT_REFERENCE_PATH,
+        "chunk_period": drift_monitor.chunk_period,
+        "thresholds": drift_monitor.thresholds,
+        "current": _drift_json(drift_monitor.current()),
+        "recent": [_drift_json(r) for r in list(drift_monitor.results)[-recent:]] if recent > 0 else []
+    }
+
+# Gauges read from this process's state, refreshed before every scrape and metrics write
+@metrics.on_collect
+def refresh_state_gauges():
+    active = registry.get()
+    model_info.clear()
+    model_info.labels(active.version, active.backend).set(1)
+    model_load_seconds.set(active.load_seconds)
+    current = drift_monitor.current() if drift_monitor is not None else None
+    if current is not None:
+        for f, stats in current["features"].items():
+            for statistic in ("jensen_shannon", "kolmogorov_smirnov", "psi"):
+                if stats[statistic] == stats[statistic]:  # skip NaN
+                    feature_drift.labels(f, statistic).set(stats[statistic])
+
+# Prometheus scrape endpoint (text exposition format 0.0.4)
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# Run the server (for local testing; production: python -m src.api.serve)
 if __name__ == "__main__":
-    uvicorn.run("src.api.fastapi_server:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("src.api.fastapi_server:app", host="0.0.0.0", port=8000, reload=True)
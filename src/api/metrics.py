@@ -0,0 +1,381 @@
+import contextvars
+import json
+import os
+import threading
+from bisect import bisect_left
+from threading import get_ident
+from time import perf_counter
+
+# In-process metrics with Prometheus text exposition. Each metric can carry labels:
+# .labels(*values) returns (and caches) the child for that label combination, so hot
+# paths can look a child up once and only pay for observe()/inc() afterwards.
+#
+# Multi-process servers (src/api/serve.py: N gunicorn workers behind one port) give the
+# registry a shared directory: every worker writes its raw values to <dir>/<pid>.json
+# (every flush_interval seconds and on each scrape), and /metrics, whichever worker
+# serves it, merges all files. Counters and histograms are summed over every worker
+# that ever wrote, dead ones included, so totals never go backwards when a worker is
+# replaced. Gauges cover live workers only and are summed (multiprocess_mode "sum",
+# e.g. in-flight requests) or kept per worker with a pid label ("all", e.g. the model
+# version each worker serves).
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def clear(self):
+        with self._lock:
+            self._children = {}
+
+    # Raw value of every series by label values; an unlabeled metric is its own only series
+    def values(self) -> dict:
+        if not self.labelnames:
+            return {(): self._raw()}
+        return {values: child._raw() for values, child in list(self._children.items())}
+
+    def _raw(self):
+        raise NotImplementedError
+
+    def _samples(self, pairs, raw):
+        raise NotImplementedError
+
+    # One process's values, or values merged over processes with their label names
+    def expose(self, values: dict = None, labelnames=None) -> list:
+        values = self.values() if values is None else values
+        labelnames = self.labelnames if labelnames is None else labelnames
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for key, raw in values.items():
+            lines.extend(self._samples(tuple(zip(labelnames, key)), raw))
+        return lines
+
+    # Series summed over [(pid, alive, values)] of every process → (values, label names)
+    def merge(self, processes: list) -> tuple:
+        merged = {}
+        for _, _, values in processes:
+            for key, raw in values.items():
+                merged[key] = _add(merged[key], raw) if key in merged else raw
+        return merged, self.labelnames
+
+def _add(a, b):
+    return [x + y for x, y in zip(a, b)] if isinstance(a, list) else a + b
+
+# Updates go to a per-thread shard (only the owning thread writes its slot), so hot
+# paths need no lock; readers sum the shards at scrape time.
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._shards = {}
+
+    def _new_child(self):
+        return Counter(self.name, self.help)
+
+    def inc(self, amount=1):
+        ident = get_ident()
+        self._shards[ident] = self._shards.get(ident, 0) + amount
+
+    @property
+    def value(self):
+        return sum(list(self._shards.values()))
+
+    def _raw(self):
+        return self.value
+
+    def _samples(self, pairs, raw):
+        return [f"{self.name}{_format_labels(pairs)} {_format_value(raw)}"]
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames=(), multiprocess_mode: str = "sum"):
+        if multiprocess_mode not in ("sum", "all"):
+            raise ValueError(f"Unknown multiprocess_mode: {multiprocess_mode} (expected 'sum' or 'all')")
+        super().__init__(name, help, labelnames)
+        self.multiprocess_mode = multiprocess_mode
+        self._base = 0
+
+    def _new_child(self):
+        return Gauge(self.name, self.help)
+
+    # For gauges that are set rather than incremented (e.g. model load time)
+    def set(self, value):
+        with self._lock:
+            self._shards = {}
+            self._base = value
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    @property
+    def value(self):
+        return self._base + sum(list(self._shards.values()))
+
+    # Live processes only: summed, or one series per process under a pid label
+    def merge(self, processes: list) -> tuple:
+        live = [p for p in processes if p[1]]
+        if self.multiprocess_mode == "sum":
+            return super().merge(live)
+        merged = {key + (str(pid),): raw for pid, _, values in live for key, raw in values.items()}
+        return merged, self.labelnames + ("pid",)
+
+# Times a block into a histogram: `with hist.time(): ...`
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(perf_counter() - self.start)
+
+# Minimal cumulative histogram (Prometheus-style "le" buckets) kept in-process.
+# Each thread's shard is [count per bucket..., count for +Inf, sum].
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, buckets, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._shards = {}
+
+    def _new_child(self):
+        return Histogram(self.name, self.help, self.buckets)
+
+    def observe(self, value: float):
+        shard = self._shards.get(get_ident())
+        if shard is None:
+            shard = self._shards.setdefault(get_ident(), [0] * (len(self.buckets) + 1) + [0.0])
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    # Per-bucket counts (not cumulative) followed by the sum, over all thread shards
+    def _raw(self):
+        raw = [0] * (len(self.buckets) + 1) + [0.0]
+        for shard in list(self._shards.values()):
+            shard = list(shard)
+            for i in range(len(raw)):
+                raw[i] += shard[i]
+        return raw
+
+    def _cumulative(self, raw) -> dict:
+        cumulative, running = {}, 0
+        for le, c in zip(list(self.buckets) + ["+Inf"], raw[:-1]):
+            running += c
+            cumulative[str(le)] = running
+        return {"buckets": cumulative, "sum": raw[-1], "count": running}
+
+    def snapshot(self) -> dict:
+        return self._cumulative(self._raw())
+
+    def _samples(self, pairs, raw):
+        snap = self._cumulative(raw)
+        lines = [f"{self.name}_bucket{_format_labels(pairs + (('le', le),))} {count}"
+                 for le, count in snap["buckets"].items()]
+        lines.append(f"{self.name}_sum{_format_labels(pairs)} {_format_value(snap['sum'])}")
+        lines.append(f"{self.name}_count{_format_labels(pairs)} {snap['count']}")
+        return lines
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+# Remove the value files of a previous server run (call before the workers start)
+def reset_multiprocess_dir(path: str):
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".json"):
+            os.remove(os.path.join(path, name))
+
+# Ordered set of metrics rendered together by the /metrics endpoint. With
+# multiprocess_dir set, values are shared with the other worker processes (see top).
+# Collect hooks refresh gauges that are set from state (model version, drift) before
+# every render and every write.
+class MetricsRegistry:
+    def __init__(self, multiprocess_dir: str = None, flush_interval: float = 1.0):
+        self._metrics = []
+        self._collect_hooks = []
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def on_collect(self, fn):
+        self._collect_hooks.append(fn)
+        return fn
+
+    def _collect(self):
+        for fn in self._collect_hooks:
+            fn()
+
+    def render(self) -> str:
+        with self._lock:
+            self._collect()
+            if self.multiprocess_dir is None:
+                exposed = [metric.expose() for metric in self._metrics]
+            else:
+                self._write()
+                processes = self._read_all()
+                exposed = []
+                for metric in self._metrics:
+                    values, labelnames = metric.merge([
+                        (pid, alive, data.get(metric.name, {})) for pid, alive, data in processes
+                    ])
+                    exposed.append(metric.expose(values, labelnames))
+        return "\n".join(line for lines in exposed for line in lines) + "\n"
+
+    # This process's raw values to <dir>/<pid>.json (temp file + rename, so readers
+    # never see a partial file)
+    def _write(self):
+        data = {metric.name: [[list(key), raw] for key, raw in metric.values().items()] for metric in self._metrics}
+        path = os.path.join(self.multiprocess_dir, f"{os.getpid()}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
+
+    def write(self):
+        with self._lock:
+            self._collect()
+            self._write()
+
+    # [(pid, alive, {metric name: {label values: raw}})] for every process that wrote
+    def _read_all(self) -> list:
+        processes = []
+        for name in os.listdir(self.multiprocess_dir):
+            if not name.endswith(".json"):
+                continue
+            pid = int(name[:-len(".json")])
+            try:
+                with open(os.path.join(self.multiprocess_dir, name), "r") as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                continue
+            values = {metric: {tuple(key): raw for key, raw in series} for metric, series in data.items()}
+            processes.append((pid, pid == os.getpid() or _pid_alive(pid), values))
+        return processes
+
+    def _flush(self):
+        while not self._stop.wait(self.flush_interval):
+            self.write()
+
+    # Background writer for this worker's values; a no-op for a single-process registry
+    def start(self):
+        if self.multiprocess_dir is None or (self._thread is not None and self._thread.is_alive()):
+            return
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._flush, name="metrics-writer", daemon=True)
+        self._thread.start()
+
+    # Stops the writer after a last write, so a worker's final counts are kept
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self.flush_interval + 1)
+        self._thread = None
+        self.write()
+
+# Latency buckets (seconds) from 10 µs to 2.5 s
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+# Start time of the current HTTP request, set by MetricsMiddleware (None outside one)
+request_start = contextvars.ContextVar("request_start", default=None)
+
+# Time from request arrival until now, e.g. routing + body read + validation when
+# called at the top of an endpoint
+def observe_since_request_start(histogram):
+    start = request_start.get()
+    if start is not None:
+        histogram.observe(perf_counter() - start)
+
+# Pure ASGI middleware: request count and latency per route and status, 5xx/exception
+# count and in-flight requests. No Request/Response objects are built, so the cost is
+# two perf_counter() calls and a few shard updates per request.
+class MetricsMiddleware:
+    def __init__(self, app, requests: Counter, errors: Counter, in_flight: Gauge, latency: Histogram):
+        self.app = app
+        self.requests = requests
+        self.errors = errors
+        self.in_flight = in_flight
+        self.latency = latency
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        # Each request runs in its own task context, so the value needs no reset
+        request_start.set(start)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            self.in_flight.dec()
+            # Routes have no path parameters; unknown paths share one label
+            path = scope["path"] if status != 404 else "unmatched"
+            self.latency.labels(path).observe(perf_counter() - start)
+            self.requests.labels(path, status).inc()
+            if status >= 500:
+                self.errors.labels(path).inc()
@@ -0,0 +1,165 @@
+import glob
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.models.compiled_model import CompiledModel
+
+# One loaded model. Request handlers grab a reference once and use it for the
+# whole request, so a swap never changes the booster under an in-flight call.
+# `backend` picks the evaluator: the LightGBM booster itself, or the booster compiled
+# to arrays (see src/models/compiled_model.py) for lower per-call overhead.
+# `num_threads` pins Booster.predict's OpenMP threads (None = LightGBM default).
+class ModelVersion:
+    def __init__(self, model_str: str, version: str, path: str, loaded_at: str, load_seconds: float,
+                 backend: str = "lightgbm", num_threads: int = None):
+        self.model_str = model_str
+        self.version = version
+        self.path = path
+        self.loaded_at = loaded_at
+        self.load_seconds = load_seconds
+        self.backend = backend
+        self.num_threads = num_threads
+        self._booster = None
+        if backend == "lightgbm":
+            self.model = self.booster
+        else:
+            self.model = CompiledModel.from_string(model_str, backend=backend)
+
+    # The LightGBM booster. Compiled backends parse the model text themselves, so a
+    # server running one only imports lightgbm (and the pandas / sklearn / scipy it
+    # pulls in) if something asks for the booster.
+    @property
+    def booster(self):
+        if self._booster is None:
+            import lightgbm as lgb
+            self._booster = lgb.Booster(model_str=self.model_str)
+        return self._booster
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if self.backend == "lightgbm" and self.num_threads:
+            return self.booster.predict(X, num_threads=self.num_threads)
+        return self.model.predict(X)
+
+    def info(self) -> dict:
+        return {
+            "version": self.version,
+            "path": self.path,
+            "loaded_at": self.loaded_at,
+            "load_seconds": round(self.load_seconds, 4),
+            "backend": self.backend,
+            "num_threads": self.num_threads,
+            "num_trees": self.model.num_trees(),
+            "num_features": self.model.num_feature()
+        }
+
+# Resolve the model file to load: either a plain model file, or the newest
+# booster saved by mlflow.lightgbm.log_model under an MLflow run/experiment dir
+def resolve_model_file(source: str) -> str:
+    if os.path.isdir(source):
+        candidates = glob.glob(os.path.join(source, "**", "model.lgb"), recursive=True)
+        if not candidates:
+            raise FileNotFoundError(f"No MLflow LightGBM model (model.lgb) found under {source}")
+        return max(candidates, key=os.path.getmtime)
+    return source
+
+# Parse, version (content hash) and warm up a booster from disk
+def load_model_version(path: str, backend: str = "lightgbm", num_threads: int = None) -> ModelVersion:
+    start = time.perf_counter()
+    with open(path, "r") as f:
+        model_str = f.read()
+
+    model_version = ModelVersion(
+        model_str=model_str,
+        version=hashlib.sha256(model_str.encode()).hexdigest()[:12],
+        path=path,
+        loaded_at=datetime.now(timezone.utc).isoformat(),
+        load_seconds=0.0,
+        backend=backend,
+        num_threads=num_threads
+    )
+    # Warm-up call so the first real request doesn't pay for lazy initialization (or JIT).
+    # Single-threaded, so loading before a fork never leaves an OpenMP pool behind.
+    warm_up = np.zeros((1, model_version.model.num_feature()), dtype=np.float64)
+    if backend == "lightgbm":
+        model_version.booster.predict(warm_up, num_threads=1)
+    else:
+        model_version.predict(warm_up)
+    model_version.load_seconds = time.perf_counter() - start
+    return model_version
+
+# Holds the active model and hot-swaps it when the watched source changes
+class ModelRegistry:
+    def __init__(self, source: str, poll_interval: float = 5.0, backend: str = "lightgbm", num_threads: int = None):
+        self.source = source
+        self.poll_interval = poll_interval
+        self.backend = backend
+        self.num_threads = num_threads
+        self.last_error = None
+        self._active = None
+        self._last_stamp = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Fail fast at startup if there is no usable model
+        self.reload(force=True)
+
+    def get(self) -> ModelVersion:
+        return self._active
+
+    def _stamp(self, path: str):
+        st = os.stat(path)
+        return path, st.st_mtime_ns, st.st_size
+
+    # Load the source if it changed; returns True when a new version was swapped in
+    def reload(self, force: bool = False) -> bool:
+        with self._reload_lock:
+            path = resolve_model_file(self.source)
+            stamp = self._stamp(path)
+            if not force and stamp == self._last_stamp:
+                return False
+
+            candidate = load_model_version(path, backend=self.backend, num_threads=self.num_threads)
+            self._last_stamp = stamp
+            self.last_error = None
+            if self._active is not None and candidate.version == self._active.version:
+                return False
+
+            # Single reference assignment: new requests see the new model,
+            # in-flight requests keep the ModelVersion they already hold
+            self._active = candidate
+            return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.reload()
+            except Exception as e:  # keep serving the current model on a bad/partial file
+                self.last_error = repr(e)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="model-registry-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    def status(self) -> dict:
+        return {
+            **self.get().info(),
+            "source": self.source,
+            "watching": self._thread is not None and self._thread.is_alive(),
+            "poll_interval": self.poll_interval,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,86 @@
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+
+# Production launcher: gunicorn master + N uvicorn workers.
+# The FastAPI app (and with it the model registry's booster, compiled trees and the
+# online feature store) is imported once in the master before the workers are forked,
+# so workers share those pages copy-on-write instead of each parsing the model file.
+# Hot-swapped model versions are loaded by each worker's own registry watcher.
+# Each worker predicts with an explicit number of LightGBM threads (default 1), so
+# workers x threads never oversubscribes the cores. On SIGTERM gunicorn stops
+# accepting connections and gives in-flight requests graceful_timeout seconds; each
+# worker then runs the app's shutdown handlers (model watcher stop, last metrics write).
+#
+# Metrics: a scrape of /metrics lands on an arbitrary worker, so workers share their
+# values through PRICING_METRICS_DIR (a fresh temporary directory unless set; emptied
+# at startup) and every scrape returns the totals of all workers (src/api/metrics.py).
+# Scrape the single bind address as usual; do not scrape workers individually.
+
+def serve_options(workers: int, bind: str, graceful_timeout: int, timeout: int, keepalive: int) -> dict:
+    return {
+        "bind": bind,
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "graceful_timeout": graceful_timeout,
+        "timeout": timeout,
+        "keepalive": keepalive,
+        "accesslog": None,
+    }
+
+def run(workers: int, bind: str, threads_per_worker: int, graceful_timeout: int, timeout: int, keepalive: int):
+    # Thread limits must be in the environment before lightgbm / numpy are imported
+    os.environ["LGBM_NUM_THREADS"] = str(threads_per_worker)
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads_per_worker))
+
+    # Shared metrics directory, also read when the app module is imported below
+    from src.api.metrics import reset_multiprocess_dir
+    owned_metrics_dir = not os.environ.get("PRICING_METRICS_DIR")
+    if owned_metrics_dir:
+        os.environ["PRICING_METRICS_DIR"] = tempfile.mkdtemp(prefix="pricing-metrics-")
+    metrics_dir = os.environ["PRICING_METRICS_DIR"]
+    reset_multiprocess_dir(metrics_dir)
+
+    from gunicorn.app.base import BaseApplication
+    from src.api.fastapi_server import app
+
+    # Objects loaded so far are never freed; keep the collector from touching (and so
+    # copying) their pages in every worker
+    gc.collect()
+    gc.freeze()
+
+    class PricingServer(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    print(f"🚀 Serving pricing API on {bind} with {workers} workers x {threads_per_worker} LightGBM threads "
+          f"(metrics merged across workers in {metrics_dir})")
+    try:
+        PricingServer(app, serve_options(workers, bind, graceful_timeout, timeout, keepalive)).run()
+    finally:
+        if owned_metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-worker production server for the pricing API")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count())))
+    parser.add_argument("--bind", default=os.environ.get("BIND", "0.0.0.0:8000"))
+    parser.add_argument("--threads-per-worker", type=int, default=int(os.environ.get("LGBM_NUM_THREADS", "1")))
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.environ.get("GRACEFUL_TIMEOUT", "30")))
+    parser.add_argument("--timeout", type=int, default=60, help="restart workers silent for this many seconds")
+    parser.add_argument("--keepalive", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.workers, args.bind, args.threads_per_worker, args.graceful_timeout, args.timeout, args.keepalive)
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from datetime import timedelta, datetime
+import argparse
 import random
 import os
 
@@ -12,6 +13,7 @@ np.random.seed(22)
 NUM_PRODUCTS = 1000
 DAYS = 365
 START_DATE = datetime(2024, 1, 1)
+SKUS_PER_CHUNK = 2000  # ~730k rows per chunk at 365 days
 
 CATEGORY_SPLIT = {
     "Women_Clothing": 300,
@@ -29,14 +31,14 @@ HOLIDAYS = [
 ]
 
 # Helper to create date range
-def create_date_range():
-    return pd.date_range(start=START_DATE, periods=DAYS, freq="D")
+def create_date_range(days: int = DAYS):
+    return pd.date_range(start=START_DATE, periods=days, freq="D")
 
-# Generate product catalog with SKU-level attributes
-def generate_product_catalog():
+# Generate product catalog with SKU-level attributes (scale multiplies every category count)
+def generate_product_catalog(scale: int = 1):
     skus = []
     for cat, count in CATEGORY_SPLIT.items():
-        for i in range(count):
+        for i in range(count * scale):
             skus.append({
                 "sku_id": f"{cat[:2].upper()}{i:03d}",
                 "category": cat,
@@ -45,51 +47,83 @@ def generate_product_catalog():
             })
     return pd.DataFrame(skus)
 
+# Holiday membership computed once per date: promo discount per day and a holiday mask.
+# The first matching holiday wins, as in the original per-cell loop.
+def holiday_calendar(dates):
+    promo = np.zeros(len(dates))
+    is_holiday = np.zeros(len(dates), dtype=bool)
+    for h in HOLIDAYS:
+        holiday_dates = pd.date_range(start=h["start"], periods=h["length"])
+        hit = dates.isin(holiday_dates) & ~is_holiday
+        promo[hit] = 0.3 if "Eid" in h["name"] else 0.25
+        is_holiday |= hit
+    return promo, is_holiday
+
+# Generate daily sales for a block of products in bulk (SKU-major, date-minor row order).
+# All noise is drawn as whole arrays from the global NumPy RNG, so output is
+# reproducible with np.random.seed(22) for a given chunk size.
+def generate_sales_chunk(products, dates, promo, is_holiday):
+    n_skus, n_days = len(products), len(dates)
+    n_rows = n_skus * n_days
+
+    # daily demand; astype(int) truncates toward zero like int()
+    demand = np.maximum(0, np.random.normal(5, 3, size=n_rows).astype(int))
+    holiday_cells = np.tile(is_holiday, n_skus)
+    demand[holiday_cells] += np.random.poisson(3, size=int(holiday_cells.sum()))
+
+    base_price = np.repeat(products["base_price"].to_numpy(dtype=np.float64), n_days)
+    promo_cells = np.tile(promo, n_skus)
+    competitor_price = np.round(base_price * np.random.uniform(0.85, 1.15, size=n_rows), 2)
+    temperature = np.random.normal(25, 5, size=n_rows)  # simple weather feature
+
+    return pd.DataFrame({
+        "date": np.tile(dates.values, n_skus),
+        "sku_id": np.repeat(products["sku_id"].to_numpy(), n_days),
+        "category": np.repeat(products["category"].to_numpy(), n_days),
+        "price": np.round(base_price * (1 - promo_cells), 2),
+        "cost": np.repeat(products["cost"].to_numpy(dtype=np.float64), n_days),
+        "units_sold": demand,
+        "promo_discount": promo_cells,
+        "competitor_price": competitor_price,
+        "temperature": temperature
+    })
+
+# Stream sales data in chunks of skus_per_chunk products
+def iter_sales_chunks(products, dates, skus_per_chunk: int = SKUS_PER_CHUNK):
+    promo, is_holiday = holiday_calendar(dates)
+    for start in range(0, len(products), skus_per_chunk):
+        yield generate_sales_chunk(products.iloc[start:start + skus_per_chunk], dates, promo, is_holiday)
+
 # Generate daily sales with promotions, competitor pricing, and weather features
 def generate_sales_data(products, dates):
-    rows = []
-    for _, row in products.iterrows():
-        for date in dates:
-            demand = max(0, int(np.random.normal(5, 3)))  # daily demand
-            promo = 0
-            for h in HOLIDAYS:
-                holiday_dates = pd.date_range(start=h["start"], periods=h["length"])
-                if date in holiday_dates:
-                    promo = 0.3 if "Eid" in h["name"] else 0.25
-                    demand += np.random.poisson(3)
-                    break
-
-            competitor_price = round(row["base_price"] * np.random.uniform(0.85, 1.15), 2)
-            temperature = np.random.normal(25, 5)  # simple weather feature
-
-            rows.append({
-                "date": date,
-                "sku_id": row["sku_id"],
-                "category": row["category"],
-                "price": round(row["base_price"] * (1 - promo), 2),
-                "cost": row["cost"],
-                "units_sold": demand,
-                "promo_discount": promo,
-                "competitor_price": competitor_price,
-                "temperature": temperature
-            })
-    return pd.DataFrame(rows)
+    promo, is_holiday = holiday_calendar(dates)
+    return generate_sales_chunk(products, dates, promo, is_holiday)
 
-# Generate and save the datasets
-def main():
+# Generate and save the datasets (sales are written chunk by chunk)
+def main(scale: int = 1, days: int = DAYS, skus_per_chunk: int = SKUS_PER_CHUNK):
     print("Generating synthetic product catalog and sales data...")
 
-    dates = create_date_range()
-    products = generate_product_catalog()
-    sales = generate_sales_data(products, dates)
+    dates = create_date_range(days)
+    products = generate_product_catalog(scale)
 
     output_dir = "data/raw"
     os.makedirs(output_dir, exist_ok=True)
 
     products.to_csv(f"{output_dir}/product_catalog.csv", index=False)
-    sales.to_csv(f"{output_dir}/sales_data.csv", index=False)
 
-    print(f"Saved product catalog and sales data to {output_dir}")
+    sales_path = f"{output_dir}/sales_data.csv"
+    n_rows = 0
+    for i, chunk in enumerate(iter_sales_chunks(products, dates, skus_per_chunk)):
+        chunk.to_csv(sales_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        n_rows += len(chunk)
+
+    print(f"Saved product catalog ({len(products)} SKUs) and sales data ({n_rows} rows) to {output_dir}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate synthetic catalog and sales data")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply SKU counts per category (1 → 1000 SKUs)")
+    parser.add_argument("--days", type=int, default=DAYS)
+    parser.add_argument("--skus-per-chunk", type=int, default=SKUS_PER_CHUNK)
+    args = parser.parse_args()
+
+    main(scale=args.scale, days=args.days, skus_per_chunk=args.skus_per_chunk)
@@ -1,29 +1,49 @@
 # %%
-import pandas as pd
-from pyspark.sql import SparkSession
 import os
 
+from src.data.storage import is_parquet, read_frame
+from src.utils.helpers import load_yaml_config
+
 # Initialize Spark session
 def start_spark(app_name="DynamicPricingSparkApp"):
+    # pyspark is only imported by the Spark code path; pandas runs never load the JVM bridge
+    from pyspark.sql import SparkSession
+
     spark = SparkSession.builder \
         .appName(app_name) \
         .getOrCreate()
     return spark
 
-# Load raw CSVs as pandas DataFrames
-def load_data_pandas(data_dir="data/raw"):
-    product_catalog = pd.read_csv(os.path.join(data_dir, "product_catalog.csv"))
-    sales_data = pd.read_csv(os.path.join(data_dir, "sales_data.csv"), parse_dates=["date"])
+# Raw dataset paths from config.yaml; data_dir overrides the directory but keeps the file names
+def raw_data_paths(data_dir=None):
+    paths = load_yaml_config()["paths"]
+    catalog_path, sales_path = paths["catalog"], paths["raw_data"]
+    if data_dir is not None:
+        catalog_path = os.path.join(data_dir, os.path.basename(catalog_path))
+        sales_path = os.path.join(data_dir, os.path.basename(sales_path))
+    return catalog_path, sales_path
+
+# Load raw datasets (CSV or Parquet) as pandas DataFrames; `columns` projects the sales data
+def load_data_pandas(data_dir=None, columns=None):
+    catalog_path, sales_path = raw_data_paths(data_dir)
+    product_catalog = read_frame(catalog_path)
+    sales_data = read_frame(sales_path, columns=columns)
     return product_catalog, sales_data
 
-# Convert pandas DataFrames to Spark DataFrames
-def load_data_spark(spark, data_dir="data/raw"):
-    product_catalog = spark.read.csv(os.path.join(data_dir, "product_catalog.csv"), header=True, inferSchema=True)
-    sales_data = spark.read.csv(os.path.join(data_dir, "sales_data.csv"), header=True, inferSchema=True)
+# Load raw datasets as Spark DataFrames
+def load_data_spark(spark, data_dir=None):
+    def read(path):
+        if is_parquet(path):
+            return spark.read.parquet(path)
+        return spark.read.csv(path, header=True, inferSchema=True)
+
+    catalog_path, sales_path = raw_data_paths(data_dir)
+    product_catalog = read(catalog_path)
+    sales_data = read(sales_path)
     return product_catalog, sales_data
 
 # Load both formats if needed
-def load_all(data_dir="data/raw"):
+def load_all(data_dir=None):
     spark = start_spark()
     pandas_catalog, pandas_sales = load_data_pandas(data_dir)
     spark_catalog, spark_sales = load_data_spark(spark, data_dir)
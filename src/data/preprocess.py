@@ -1,14 +1,24 @@
 import pandas as pd
-from pyspark.sql import DataFrame as SparkDF
-from pyspark.sql.functions import col, when
-import os
+import numpy as np
+from typing import TYPE_CHECKING
+
+from src.data.storage import write_frame
+from src.utils.helpers import load_yaml_config
+
+if TYPE_CHECKING:  # annotation only; pyspark is imported lazily by preprocess_spark
+    from pyspark.sql import DataFrame as SparkDF
 
 # Basic preprocessing for pandas DataFrame
 def preprocess_pandas(sales_df: pd.DataFrame) -> pd.DataFrame:
-    df = sales_df.copy()
-
-    # Drop rows with nulls in key columns
-    df.dropna(subset=["price", "cost", "units_sold", "competitor_price"], inplace=True)
+    # Drop rows with nulls in key columns and flag unreasonable prices in one mask,
+    # so the input is copied once (take) instead of once per filter
+    valid = (
+        sales_df[["price", "cost", "units_sold", "competitor_price"]].notna().all(axis=1)
+        & (sales_df["price"] > 0)
+        & (sales_df["cost"] > 0)
+        & (sales_df["units_sold"] >= 0)
+    )
+    df = sales_df.take(np.flatnonzero(valid.to_numpy()))
 
     # Feature: price margin
     df["price_margin"] = df["price"] - df["cost"]
@@ -16,15 +26,12 @@ def preprocess_pandas(sales_df: pd.DataFrame) -> pd.DataFrame:
     # Feature: price to competitor ratio
     df["price_vs_competitor"] = df["price"] / df["competitor_price"]
 
-    # Flag unreasonable prices
-    df = df[df["price"] > 0]
-    df = df[df["cost"] > 0]
-    df = df[df["units_sold"] >= 0]
-
     return df
 
 # Basic preprocessing for Spark DataFrame
-def preprocess_spark(sales_df: SparkDF) -> SparkDF:
+def preprocess_spark(sales_df: "SparkDF") -> "SparkDF":
+    from pyspark.sql.functions import col
+
     df = sales_df
 
     # Remove nulls in important columns
@@ -41,10 +48,9 @@ def preprocess_spark(sales_df: SparkDF) -> SparkDF:
 
     return df
 
-# Save cleaned pandas DataFrame to CSV
-def save_processed_pandas(df: pd.DataFrame, output_path: str = "data/processed/clean_sales_data.csv"):
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    df.to_csv(output_path, index=False)
+# Save cleaned pandas DataFrame (CSV or Parquet, per config.yaml paths.processed_data)
+def save_processed_pandas(df: pd.DataFrame, output_path: str = None):
+    write_frame(df, output_path or load_yaml_config()["paths"]["processed_data"])
 
 if __name__ == "__main__":
     from load_data import load_all
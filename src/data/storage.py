@@ -0,0 +1,107 @@
+import os
+import sys
+import pandas as pd
+
+# Storage backend is picked from the file extension of each path in config.yaml:
+# *.parquet → columnar Parquet (pyarrow), anything else → CSV.
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+# Columns kept as categoricals in Parquet and parsed as dates from CSV
+CATEGORICAL_COLS = ["sku_id", "category"]
+DATE_COLS = ["date"]
+
+def is_parquet(path: str) -> bool:
+    return path.endswith(PARQUET_EXTENSIONS)
+
+# Read a dataset; `columns` projects to a subset (only those columns are read/parsed)
+def read_frame(path: str, columns: list = None) -> pd.DataFrame:
+    if is_parquet(path):
+        return pd.read_parquet(path, columns=columns, engine="pyarrow")
+
+    header = pd.read_csv(path, nrows=0).columns
+    wanted = header if columns is None else columns
+    parse_dates = [c for c in DATE_COLS if c in header and c in wanted]
+    df = pd.read_csv(path, usecols=columns, parse_dates=parse_dates)
+    return df if columns is None else df[columns]
+
+# Write a dataset; Parquet keeps dtypes (datetime64 dates, categorical sku_id/category)
+def write_frame(df: pd.DataFrame, path: str):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if is_parquet(path):
+        to_category = {c: "category" for c in CATEGORICAL_COLS if c in df.columns and df[c].dtype == object}
+        df.astype(to_category).to_parquet(path, index=False, engine="pyarrow")
+    else:
+        df.to_csv(path, index=False)
+
+# Read a dataset in chunks of ~chunk_rows rows; the index keeps counting across chunks
+# (like one read_frame call would number the rows), so results can be lined up later
+def iter_frame(path: str, chunk_rows: int = 500_000, columns: list = None):
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+
+        offset = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+        return
+
+    header = pd.read_csv(path, nrows=0).columns
+    wanted = header if columns is None else columns
+    parse_dates = [c for c in DATE_COLS if c in header and c in wanted]
+    for chunk in pd.read_csv(path, usecols=columns, parse_dates=parse_dates, chunksize=chunk_rows):
+        yield chunk if columns is None else chunk[columns]
+
+# Append DataFrames to one output file chunk by chunk (CSV append, or a single
+# Parquet file written row group by row group); replaces any existing file
+class FrameWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._parquet_writer = None
+        self._schema = None
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def write(self, df: pd.DataFrame):
+        if is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # Chunks carry their own categories, so the file stores plain strings
+            to_str = {c: str for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)}
+            table = pa.Table.from_pandas(df.astype(to_str), preserve_index=False)
+            if self._parquet_writer is None:
+                self._schema = table.schema
+                self._parquet_writer = pq.ParquetWriter(self.path, self._schema)
+            self._parquet_writer.write_table(table.cast(self._schema))
+        else:
+            df.to_csv(self.path, mode="a", header=not os.path.exists(self.path), index=False)
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Convert an existing dataset between formats, e.g. CSV → Parquet
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m src.data.storage <input.csv|parquet> <output.csv|parquet>")
+        sys.exit(1)
+
+    src_path, dst_path = sys.argv[1], sys.argv[2]
+    write_frame(read_frame(src_path), dst_path)
+    print(f"✅ Converted {src_path} → {dst_path}")
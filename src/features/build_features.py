@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
-import os
+
+from src.data.storage import read_frame, write_frame
+from src.utils.helpers import load_yaml_config
 
 # Add temporal features and lagged demand
 def add_time_features(df: pd.DataFrame) -> pd.DataFrame:
@@ -14,13 +16,15 @@ def add_lag_features(df: pd.DataFrame, lags=[1, 7], rolling_windows=[7]) -> pd.D
     df = df.sort_values(["sku_id", "date"])
     for lag in lags:
         df[f"lag_{lag}"] = df.groupby("sku_id")["units_sold"].shift(lag)
+    # The rolling window runs over the whole sorted column, but each SKU's first
+    # shifted value is NaN, so a full window never spans two SKUs.
+    # Keep the index so the result lines up with the (sorted) rows it came from.
     for window in rolling_windows:
         df[f"rolling_mean_{window}"] = (
             df.groupby("sku_id")["units_sold"]
             .shift(1)
             .rolling(window=window)
             .mean()
-            .reset_index(0, drop=True)
         )
     return df
 
@@ -32,17 +36,65 @@ def add_price_elasticity_features(df: pd.DataFrame) -> pd.DataFrame:
     df["elasticity"] = df["elasticity"].clip(-10, 10)  # handle outliers
     return df
 
-# Full pipeline
-def build_features(df: pd.DataFrame) -> pd.DataFrame:
+# Full pipeline (engine="numpy" uses the single-pass array kernels in fast_features)
+def build_features(df: pd.DataFrame, engine: str = "pandas") -> pd.DataFrame:
+    if engine == "numpy":
+        from src.features.fast_features import build_features_fast
+        return build_features_fast(df)
+
     df = add_time_features(df)
     df = add_lag_features(df)
     df = add_price_elasticity_features(df)
     return df
 
-# Save engineered dataset
-def save_featured_data(df: pd.DataFrame, output_path: str = "data/processed/featured_sales_data.csv"):
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    df.to_csv(output_path, index=False)
+# Incremental mode: per-SKU tail state is the last rows (in sku_id/date order) that
+# new features depend on: 7 units_sold values for lag_7 / rolling_mean_7, and the
+# last price / units_sold for the pct_change elasticity proxy.
+STATE_COLS = ["sku_id", "date", "price", "units_sold"]
+STATE_ROWS = 7
+
+# Per-SKU tail state from a cleaned or featured history
+def extract_feature_state(df: pd.DataFrame) -> pd.DataFrame:
+    ordered = df[STATE_COLS].sort_values(["sku_id", "date"])
+    return ordered.groupby("sku_id", sort=False, observed=True).tail(STATE_ROWS)
+
+# Features for newly arrived (cleaned) rows only. The new rows are stacked after their
+# SKUs' tail state and run through the same build_features code, so the result equals
+# a full recompute while the work is O(new rows + 7 per touched SKU).
+# Returns (featured new rows, updated state).
+def build_features_incremental(new_df: pd.DataFrame, state: pd.DataFrame):
+    touched = state["sku_id"].isin(new_df["sku_id"].unique())
+    history = state[touched].assign(_is_new=False)
+
+    # Positional index while combining; new rows get their own labels back afterwards
+    new_rows = new_df.assign(_is_new=True, _index=new_df.index)
+    featured = build_features(pd.concat([history, new_rows], ignore_index=True))
+
+    new_featured = featured[featured["_is_new"]].set_index("_index").drop(columns="_is_new")
+    new_featured.index = new_featured.index.astype(new_df.index.dtype).rename(new_df.index.name)
+    new_state = pd.concat([state[~touched], extract_feature_state(featured)], ignore_index=True)
+    return new_featured, new_state
+
+def save_feature_state(state: pd.DataFrame, path: str = None):
+    write_frame(state, path or load_yaml_config()["paths"]["feature_state"])
+
+def load_feature_state(path: str = None) -> pd.DataFrame:
+    return read_frame(path or load_yaml_config()["paths"]["feature_state"])
+
+# Daily job: featurize only the new day(s) of cleaned sales and advance the stored state
+def update_features_incremental(new_df: pd.DataFrame, state_path: str = None) -> pd.DataFrame:
+    state = load_feature_state(state_path)
+    new_featured, new_state = build_features_incremental(new_df, state)
+    save_feature_state(new_state, state_path)
+    return new_featured
+
+# Save engineered dataset (CSV or Parquet, per config.yaml paths.featured_data)
+def save_featured_data(df: pd.DataFrame, output_path: str = None):
+    write_frame(df, output_path or load_yaml_config()["paths"]["featured_data"])
+
+# Load engineered dataset; `columns` reads only the listed columns
+def load_featured_data(path: str = None, columns: list = None) -> pd.DataFrame:
+    return read_frame(path or load_yaml_config()["paths"]["featured_data"], columns=columns)
 
 if __name__ == "__main__":
     from src.data.preprocess import preprocess_pandas
@@ -52,4 +104,5 @@ if __name__ == "__main__":
     cleaned_df = preprocess_pandas(sales_df)
     featured_df = build_features(cleaned_df)
     save_featured_data(featured_df)
-    print("✅ Feature engineering done. File was saved to data/processed/featured_sales_data.csv")
\ No newline at end of file
+    save_feature_state(extract_feature_state(featured_df))
+    print("✅ Feature engineering done. File was saved to", load_yaml_config()["paths"]["featured_data"])
\ No newline at end of file
@@ -2,7 +2,12 @@ import pandas as pd
 import numpy as np
 
 # Inject synthetic external signals: weather forecast and competitor trend
-def add_external_signals(df: pd.DataFrame) -> pd.DataFrame:
+# (engine="numpy" uses the array kernels in fast_features)
+def add_external_signals(df: pd.DataFrame, engine: str = "pandas") -> pd.DataFrame:
+    if engine == "numpy":
+        from src.features.fast_features import add_external_signals_fast
+        return add_external_signals_fast(df)
+
     df = df.copy()
 
     # Simulate moving competitor pricing over time using noise
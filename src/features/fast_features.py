@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+from src.features.build_features import add_time_features
+
+# Array feature engine: the frame is sorted and its SKU group boundaries found once,
+# then every lag / rolling / pct_change / external signal is a NumPy kernel over
+# contiguous arrays instead of a separate pandas groupby per column.
+#
+# Kernels take `pos`: each row's 0-based position inside its SKU group, which is all
+# they need to stop windows and shifts from crossing group boundaries.
+
+# Position of each row within its group; `codes` must be grouped (equal codes contiguous)
+def group_positions(codes: np.ndarray) -> np.ndarray:
+    n = len(codes)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.empty(n, dtype=bool)
+    starts[0] = True
+    np.not_equal(codes[1:], codes[:-1], out=starts[1:])
+    first = np.flatnonzero(starts)
+    group = np.cumsum(starts) - 1
+    return np.arange(n) - first[group]
+
+# groupby().shift(lag)
+def shift_within(values: np.ndarray, pos: np.ndarray, lag: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if lag < len(values):
+        out[lag:] = values[:len(values) - lag]
+    out[pos < lag] = np.nan
+    return out
+
+# groupby().pct_change()
+def pct_change_within(values: np.ndarray, pos: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return values / shift_within(values, pos, 1) - 1
+
+# groupby().shift(1).rolling(window).mean(): mean of the previous `window` values,
+# NaN until a full window exists. Uses a cumulative-sum difference, which is exact
+# for integer-valued inputs such as units_sold.
+def rolling_mean_prev_within(values: np.ndarray, pos: np.ndarray, window: int) -> np.ndarray:
+    csum = np.concatenate([[0.0], np.cumsum(values, dtype=np.float64)])
+    out = np.full(len(values), np.nan)
+    idx = np.flatnonzero(pos >= window)
+    out[idx] = (csum[idx] - csum[idx - window]) / window
+    return out
+
+# groupby().transform(lambda x: x.rolling(window, min_periods=...).mean()), NaN-aware.
+# Sums the window's shifted copies oldest-first (window is small); float results agree
+# with pandas' running-sum algorithm to rounding error.
+def rolling_mean_within(values: np.ndarray, pos: np.ndarray, window: int, min_periods: int = 1) -> np.ndarray:
+    total = np.zeros(len(values))
+    count = np.zeros(len(values))
+    for k in range(window - 1, -1, -1):
+        shifted = values if k == 0 else shift_within(values, pos, k)
+        valid = ~np.isnan(shifted)
+        total += np.where(valid, shifted, 0.0)
+        count += valid
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = total / count
+    out[count < min_periods] = np.nan
+    return out
+
+# Same columns as build_features.build_features (time, lag, rolling, elasticity)
+def build_features_fast(df: pd.DataFrame, lags=[1, 7], rolling_windows=[7]) -> pd.DataFrame:
+    df = add_time_features(df)
+
+    # One factorize (sorted codes) + one stable lexsort: same order as sort_values(["sku_id", "date"])
+    codes = pd.factorize(df["sku_id"], sort=True)[0]
+    order = np.lexsort((df["date"].to_numpy().view(np.int64), codes))
+    df = df.take(order)
+    pos = group_positions(codes[order])
+    units = df["units_sold"].to_numpy(dtype=np.float64)
+    price = df["price"].to_numpy(dtype=np.float64)
+
+    for lag in lags:
+        df[f"lag_{lag}"] = shift_within(units, pos, lag)
+    for window in rolling_windows:
+        df[f"rolling_mean_{window}"] = rolling_mean_prev_within(units, pos, window)
+
+    price_change = pct_change_within(price, pos)
+    demand_change = pct_change_within(units, pos)
+    df["price_change"] = price_change
+    df["demand_change"] = demand_change
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["elasticity"] = np.clip(demand_change / price_change, -10, 10)  # handle outliers
+    return df
+
+# Same columns as external_features.add_external_signals. Rows are grouped by SKU with a
+# stable sort (keeping each SKU's row order, like groupby().transform) and scattered back.
+def add_external_signals_fast(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+
+    codes = pd.factorize(df["sku_id"])[0]
+    order = np.argsort(codes, kind="stable")
+    pos = group_positions(codes[order])
+
+    competitor_price = df["competitor_price"].to_numpy(dtype=np.float64)[order]
+    temperature = df["temperature"].to_numpy(dtype=np.float64)[order]
+    temp_change = np.abs(temperature - shift_within(temperature, pos, 1))
+
+    competitor_trend = np.empty(len(df))
+    temp_volatility = np.empty(len(df))
+    competitor_trend[order] = rolling_mean_within(competitor_price, pos, window=7, min_periods=1)
+    temp_volatility[order] = rolling_mean_within(temp_change, pos, window=3, min_periods=1)
+
+    df["competitor_trend"] = competitor_trend
+    df["temp_volatility"] = temp_volatility
+    return df
@@ -0,0 +1,133 @@
+import threading
+
+import numpy as np
+
+# Number of past units_sold values kept per SKU (rolling_mean_7 / lag_7 horizon)
+HISTORY = 7
+
+# In-process online feature store: the latest demand features per SKU, held in
+# flat NumPy arrays indexed through a sku_id → row dict, so a lookup is O(1)
+# and never touches pandas.
+#
+# Served features describe "tomorrow" given the history so far, matching build_features:
+#   lag_1          = last units_sold
+#   rolling_mean_7 = mean of the last 7 units_sold (NaN until 7 days are known)
+#   elasticity     = pct_change(units) / pct_change(price) of the last event, clipped to ±10
+class OnlineFeatureStore:
+    def __init__(self, capacity: int = 1024):
+        self._index = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        self._units = np.full((capacity, HISTORY), np.nan)  # oldest → newest
+        self._n_seen = np.zeros(capacity, dtype=np.int64)
+        self._last_price = np.full(capacity, np.nan)
+        self._cost = np.full(capacity, np.nan)
+        self._features = np.full((capacity, 3), np.nan)  # lag_1, rolling_mean_7, elasticity
+
+    def _grow(self, capacity: int):
+        old = (self._units, self._n_seen, self._last_price, self._cost, self._features)
+        self._allocate(capacity)
+        n = self._size
+        for new_arr, old_arr in zip((self._units, self._n_seen, self._last_price, self._cost, self._features), old):
+            new_arr[:n] = old_arr[:n]
+
+    def _slot(self, sku_id: str) -> int:
+        i = self._index.get(sku_id)
+        if i is None:
+            if self._size == len(self._n_seen):
+                self._grow(2 * len(self._n_seen))
+            i = self._index[sku_id] = self._size
+            self._size += 1
+        return i
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, sku_id):
+        return sku_id in self._index
+
+    # O(1) lookup: (lag_1, rolling_mean_7, elasticity, cost) or None for an unknown SKU
+    def lookup(self, sku_id: str):
+        i = self._index.get(sku_id)
+        if i is None:
+            return None
+        with self._lock:
+            lag_1, rolling_mean_7, elasticity = self._features[i]
+            return float(lag_1), float(rolling_mean_7), float(elasticity), float(self._cost[i])
+
+    # Apply one sales event (one SKU-day) in date order
+    def record_sale(self, sku_id: str, price: float, units_sold: float, cost: float = None):
+        with self._lock:
+            i = self._slot(sku_id)
+            prev_price = self._last_price[i]
+            prev_units = self._units[i, -1]
+
+            self._units[i, :-1] = self._units[i, 1:]
+            self._units[i, -1] = units_sold
+            self._n_seen[i] += 1
+            self._last_price[i] = price
+            if cost is not None:
+                self._cost[i] = cost
+
+            # Same float64 arithmetic as the pandas pct_change based features
+            with np.errstate(divide="ignore", invalid="ignore"):
+                price_change = np.float64(price) / prev_price - 1
+                demand_change = np.float64(units_sold) / prev_units - 1
+                elasticity = np.clip(demand_change / price_change, -10, 10)
+
+            rolling_mean = self._units[i].sum() / HISTORY if self._n_seen[i] >= HISTORY else np.nan
+            self._features[i] = (units_sold, rolling_mean, elasticity)
+
+    # Bulk-load from a featured (or cleaned) sales frame: last HISTORY rows per SKU
+    @classmethod
+    def from_frame(cls, df) -> "OnlineFeatureStore":
+        import pandas as pd
+
+        tail = (
+            df[["sku_id", "date", "price", "cost", "units_sold"]]
+            .sort_values(["sku_id", "date"])
+            .groupby("sku_id", sort=False, observed=True)
+            .tail(HISTORY + 1)
+        )
+        codes, skus = pd.factorize(tail["sku_id"].astype(str))
+        n_skus = len(skus)
+
+        store = cls(capacity=max(n_skus, 1))
+        store._index = {sku: i for i, sku in enumerate(skus)}
+        store._size = n_skus
+
+        # Right-align each SKU's tail in the history matrix
+        counts = np.bincount(codes, minlength=n_skus)
+        first = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        rank = np.arange(len(tail)) - first[codes]
+        col = HISTORY - counts[codes] + rank  # one extra row per SKU lands at col -1 and is dropped
+        keep = col >= 0
+        units = tail["units_sold"].to_numpy(dtype=np.float64)
+        store._units[codes[keep], col[keep]] = units[keep]
+        store._n_seen[:n_skus] = np.minimum(counts, HISTORY)
+
+        last = first + counts - 1
+        prev = np.where(counts > 1, last - 1, -1)
+        price = tail["price"].to_numpy(dtype=np.float64)
+        store._last_price[:n_skus] = price[last]
+        store._cost[:n_skus] = tail["cost"].to_numpy(dtype=np.float64)[last]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price_change = np.where(prev >= 0, price[last] / price[prev] - 1, np.nan)
+            demand_change = np.where(prev >= 0, units[last] / units[prev] - 1, np.nan)
+            elasticity = np.clip(demand_change / price_change, -10, 10)
+
+        full = store._n_seen[:n_skus] >= HISTORY
+        store._features[:n_skus, 0] = units[last]
+        store._features[:n_skus, 1] = np.where(full, store._units[:n_skus].sum(axis=1) / HISTORY, np.nan)
+        store._features[:n_skus, 2] = elasticity
+        return store
+
+    @classmethod
+    def from_file(cls, path: str) -> "OnlineFeatureStore":
+        from src.data.storage import read_frame
+
+        return cls.from_frame(read_frame(path, columns=["sku_id", "date", "price", "cost", "units_sold"]))
@@ -0,0 +1,102 @@
+from pyspark.sql import DataFrame as SparkDF
+from pyspark.sql import Window
+from pyspark.sql import functions as F
+
+# Spark versions of build_features / add_external_signals. Window functions are
+# partitioned by sku_id and ordered by date, so nothing has to fit on the driver.
+# Column-for-column parity with pandas assumes (sku_id, date) is unique.
+
+def _sku_window():
+    return Window.partitionBy("sku_id").orderBy("date")
+
+# x / y with NumPy semantics: Spark returns null for division by zero,
+# pandas gives ±inf (or NaN for 0 / 0) which the elasticity clip relies on
+def _divide(num, den):
+    return (
+        F.when(num.isNull() | den.isNull(), F.lit(None).cast("double"))
+        .when(den != 0, num / den)
+        .when(F.isnan(num) | (num == 0), F.lit(float("nan")))
+        .when(num > 0, F.lit(float("inf")))
+        .otherwise(F.lit(float("-inf")))
+    )
+
+# Series.clip: NaN/null pass through (Spark's least/greatest would skip nulls and rank NaN highest)
+def _clip(c, lower, upper):
+    return F.when(c.isNull() | F.isnan(c), c).otherwise(F.greatest(F.least(c, F.lit(upper)), F.lit(lower)))
+
+# Add temporal features (pandas dayofweek: Monday=0 … Sunday=6)
+def add_time_features_spark(df: SparkDF) -> SparkDF:
+    df = df.withColumn("day_of_week", ((F.dayofweek("date") + 5) % 7).cast("long"))
+    df = df.withColumn("is_weekend", F.col("day_of_week").isin(5, 6).cast("long"))
+    df = df.withColumn("month", F.month("date").cast("long"))
+    return df
+
+# Add lag and rolling features (rolling mean of the previous `window` days, full windows only)
+def add_lag_features_spark(df: SparkDF, lags=[1, 7], rolling_windows=[7]) -> SparkDF:
+    w = _sku_window()
+    for lag in lags:
+        df = df.withColumn(f"lag_{lag}", F.lag("units_sold", lag).over(w).cast("double"))
+    for window in rolling_windows:
+        frame = w.rowsBetween(-window, -1)
+        df = df.withColumn(
+            f"rolling_mean_{window}",
+            F.when(F.count("units_sold").over(frame) == window, F.avg("units_sold").over(frame))
+        )
+    return df
+
+# Add price elasticity proxy features
+def add_price_elasticity_features_spark(df: SparkDF) -> SparkDF:
+    w = _sku_window()
+    price, units = F.col("price").cast("double"), F.col("units_sold").cast("double")
+    df = df.withColumn("price_change", _divide(price, F.lag(price, 1).over(w)) - 1)
+    df = df.withColumn("demand_change", _divide(units, F.lag(units, 1).over(w)) - 1)
+    df = df.withColumn("elasticity", _clip(_divide(F.col("demand_change"), F.col("price_change")), -10, 10))
+    return df
+
+# Full pipeline
+def build_features_spark(df: SparkDF) -> SparkDF:
+    df = add_time_features_spark(df)
+    df = add_lag_features_spark(df)
+    df = add_price_elasticity_features_spark(df)
+    return df
+
+# Inject synthetic external signals: competitor trend and temperature volatility
+def add_external_signals_spark(df: SparkDF) -> SparkDF:
+    w = _sku_window()
+    df = df.withColumn("competitor_trend", F.avg("competitor_price").over(w.rowsBetween(-6, 0)))
+    temp_change = F.abs(F.col("temperature") - F.lag("temperature", 1).over(w))
+    df = df.withColumn("_temp_change", temp_change)
+    df = df.withColumn("temp_volatility", F.avg("_temp_change").over(w.rowsBetween(-2, 0))).drop("_temp_change")
+    return df
+
+# Compare Spark features with the pandas implementation column by column
+def compare_with_pandas(spark_df: SparkDF, pandas_df, columns: list, rtol: float = 1e-12) -> dict:
+    import numpy as np
+
+    keys = ["sku_id", "date"]
+    left = spark_df.select(keys + columns).toPandas().sort_values(keys).reset_index(drop=True)
+    right = pandas_df[keys + columns].sort_values(keys).reset_index(drop=True)
+    return {
+        col: bool(np.allclose(left[col].astype(float), right[col].astype(float), rtol=rtol, atol=0, equal_nan=True))
+        for col in columns
+    }
+
+if __name__ == "__main__":
+    from src.data.load_data import start_spark, load_data_spark, load_data_pandas
+    from src.data.preprocess import preprocess_spark, preprocess_pandas
+    from src.features.build_features import build_features
+    from src.features.external_features import add_external_signals
+
+    spark = start_spark()
+    _, spark_sales = load_data_spark(spark)
+    spark_featured = add_external_signals_spark(build_features_spark(preprocess_spark(spark_sales)))
+
+    _, sales_df = load_data_pandas()
+    pandas_featured = add_external_signals(build_features(preprocess_pandas(sales_df)))
+
+    columns = [
+        "day_of_week", "is_weekend", "month", "lag_1", "lag_7", "rolling_mean_7",
+        "price_change", "demand_change", "elasticity", "competitor_trend", "temp_volatility"
+    ]
+    for col, ok in compare_with_pandas(spark_featured, pandas_featured, columns).items():
+        print(f"{'✅' if ok else '❌'} {col}")
@@ -1,22 +1,36 @@
 import pandas as pd
-import lightgbm as lgb
 import numpy as np
 import os
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error
 
-# Train model on feature-rich dataframe
-def train_forecast_model(df: pd.DataFrame):
+from src.data.storage import write_frame
+from src.utils.helpers import load_yaml_config
+
+# Model features (column order matters for array-based prediction) and target
+FEATURE_COLS = [
+    "price", "promo_discount", "competitor_price", "temperature",
+    "price_margin", "price_vs_competitor",
+    "lag_1", "rolling_mean_7", "elasticity",
+    "day_of_week", "is_weekend", "month"
+]
+TARGET_COL = "units_sold"
+
+# Train model on feature-rich dataframe. The binned LightGBM Datasets come from the
+# dataset cache (models/dataset_cache.py; DatasetCache.from_config() by default).
+# Parameters and rounds come from the tuning artifact when one exists (models/tuning.py;
+# tuned_params_path defaults to config paths.tuned_params).
+def train_forecast_model(df: pd.DataFrame, dataset_cache=None, tuned_params_path: str = None):
+    # Imported here: modules that only need FEATURE_COLS (pricing, API) stay light
+    import lightgbm as lgb
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import mean_squared_error
+    from src.models.dataset_cache import DatasetCache
+    from src.models.tuning import load_tuned_params
+
     df = df.dropna(subset=["lag_1", "rolling_mean_7", "elasticity"])  # Drop rows with NA lag features
 
     # Define features and target
-    features = [
-        "price", "promo_discount", "competitor_price", "temperature",
-        "price_margin", "price_vs_competitor",
-        "lag_1", "rolling_mean_7", "elasticity",
-        "day_of_week", "is_weekend", "month"
-    ]
-    target = "units_sold"
+    features = FEATURE_COLS
+    target = TARGET_COL
 
     # Train/test split
     train_df, test_df = train_test_split(df, test_size=0.2, shuffle=False)
@@ -26,20 +40,20 @@ def train_forecast_model(df: pd.DataFrame):
     X_test = test_df[features]
     y_test = test_df[target]
 
-    # LightGBM dataset
-    lgb_train = lgb.Dataset(X_train, label=y_train)
-    lgb_test = lgb.Dataset(X_test, label=y_test, reference=lgb_train)
-
-    # Model parameters
-    params = {
+    # Model parameters: tuned ones when a search has run, else these defaults
+    params, num_boost_round = load_tuned_params({
         "objective": "regression",
         "metric": "rmse",
         "verbosity": -1,
         "random_state": 22
-    }
+    }, num_boost_round=100, path=tuned_params_path)
+
+    # LightGBM dataset
+    dataset_cache = dataset_cache or DatasetCache.from_config()
+    lgb_train, lgb_test = dataset_cache.train_valid(X_train, y_train, X_test, y_test, params)
 
     # Train
-    model = lgb.train(params, lgb_train, valid_sets=[lgb_train, lgb_test], num_boost_round=100, early_stopping_rounds=10)
+    model = lgb.train(params, lgb_train, valid_sets=[lgb_train, lgb_test], num_boost_round=num_boost_round, early_stopping_rounds=10)
 
     # Predict and evaluate
     preds = model.predict(X_test)
@@ -48,19 +62,33 @@ def train_forecast_model(df: pd.DataFrame):
 
     return model, test_df.assign(predicted_units_sold=preds)
 
-# Save predictions to CSV
-def save_predictions(df: pd.DataFrame, path: str = "data/processed/predicted_demand.csv"):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    df.to_csv(path, index=False)
+# Incremental mode: update a trained forecast model (Booster or model file) with a newly
+# arrived window of featured rows instead of retraining on the full history.
+# mode="continue" adds boosting rounds, mode="refit" re-estimates leaf values
+# (see train_model.update_lightgbm_regressor for the keyword arguments)
+def update_forecast_model(init_model, new_df: pd.DataFrame, mode: str = "continue", **kwargs):
+    from src.models.train_model import update_lightgbm_regressor
+
+    new_df = new_df.dropna(subset=["lag_1", "rolling_mean_7", "elasticity"])
+    return update_lightgbm_regressor(init_model, new_df, FEATURE_COLS, TARGET_COL, mode=mode, **kwargs)
+
+# Save predictions (CSV or Parquet, per config.yaml paths.predictions)
+def save_predictions(df: pd.DataFrame, path: str = None):
+    write_frame(df, path or load_yaml_config()["paths"]["predictions"])
 
 if __name__ == "__main__":
-    from src.features.build_features import build_features
+    from src.features.build_features import build_features, load_featured_data
     from src.data.load_data import load_data_pandas
     from src.data.preprocess import preprocess_pandas
 
-    _, sales_df = load_data_pandas()
-    cleaned_df = preprocess_pandas(sales_df)
-    featured_df = build_features(cleaned_df)
+    featured_path = load_yaml_config()["paths"]["featured_data"]
+    if os.path.exists(featured_path):
+        # Only the model inputs, target and row keys are read
+        featured_df = load_featured_data(featured_path, columns=["date", "sku_id"] + FEATURE_COLS + [TARGET_COL])
+    else:
+        _, sales_df = load_data_pandas()
+        cleaned_df = preprocess_pandas(sales_df)
+        featured_df = build_features(cleaned_df)
 
     model, forecast_df = train_forecast_model(featured_df)
     save_predictions(forecast_df)
\ No newline at end of file
@@ -0,0 +1,245 @@
+import numpy as np
+
+# Array-compiled LightGBM model: the saved text model (models/lightgbm_model.txt) is
+# parsed into flat per-node arrays covering every tree, and evaluated either with a
+# vectorized NumPy traversal (all unfinished row/tree paths advance one level per
+# step) or a numba-jitted per-row loop (optional dependency; lowest per-call cost).
+# Split semantics follow LightGBM's numerical decision: missing_type None maps NaN to
+# 0.0, Zero/NaN missing values follow default_left, otherwise go left if x <= threshold.
+# Tree outputs are summed in tree order, as LightGBM does.
+
+BACKENDS = ("lightgbm", "numpy", "numba")
+
+# decision_type bit layout (LightGBM tree.h)
+_CATEGORICAL_MASK = 1
+_DEFAULT_LEFT_MASK = 2
+_MISSING_ZERO, _MISSING_NAN = 1, 2
+_ZERO_THRESHOLD = 1e-35
+
+# Output transforms for the supported objectives (first token of objective=...)
+_IDENTITY_OBJECTIVES = {"regression", "regression_l1", "huber", "fair", "quantile", "mape"}
+_EXP_OBJECTIVES = {"poisson", "gamma", "tweedie"}
+
+def _parse_sections(model_str: str):
+    header, trees, current = {}, [], None
+    for line in model_str.splitlines():
+        line = line.strip()
+        if line == "end of trees":
+            break
+        if line.startswith("Tree="):
+            current = {}
+            trees.append(current)
+        elif "=" in line:
+            key, value = line.split("=", 1)
+            (header if current is None else current)[key] = value
+    return header, trees
+
+def _values(tree: dict, key: str, dtype):
+    return np.array(tree[key].split(), dtype=dtype) if tree.get(key, "") else np.empty(0, dtype=dtype)
+
+class CompiledModel:
+    def __init__(self, roots, feature, threshold, left, right, leaf_value, default_left, missing_type,
+                 max_depth: int, num_features: int, objective: str, average_output: bool, backend: str = "numpy"):
+        if backend not in ("numpy", "numba"):
+            raise ValueError(f"Unknown compiled backend: {backend}")
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_value = leaf_value
+        self.default_left = default_left
+        self.missing_type = missing_type
+        self.max_depth = max_depth
+        self.num_features = num_features
+        self.objective = objective
+        self.average_output = average_output
+        self.backend = backend
+        # Without Zero/NaN missing types every split is "NaN → 0.0, then x <= threshold"
+        self.plain_splits = not missing_type.any()
+        self._numba_kernel = None
+
+    # Flatten every tree into global node arrays. Internal nodes keep their tree-local
+    # order and leaves follow them; a leaf points to itself as both children.
+    @classmethod
+    def from_string(cls, model_str: str, backend: str = "numpy"):
+        header, trees = _parse_sections(model_str)
+        if int(header.get("num_class", 1)) != 1:
+            raise ValueError("Only single-output models can be compiled")
+        objective = header.get("objective", "regression").split()[0]
+        if objective not in _IDENTITY_OBJECTIVES | _EXP_OBJECTIVES:
+            raise ValueError(f"Unsupported objective for compiled inference: {objective}")
+
+        roots, feature, threshold, left, right = [], [], [], [], []
+        leaf_value, default_left, missing_type = [], [], []
+        max_depth, offset = 0, 0
+        for tree in trees:
+            if int(tree.get("num_cat", 0)) > 0 or int(tree.get("is_linear", 0)):
+                raise ValueError("Categorical and linear trees are not supported")
+
+            num_leaves = int(tree["num_leaves"])
+            n_internal = num_leaves - 1
+            decision = _values(tree, "decision_type", np.int64)
+            if (decision & _CATEGORICAL_MASK).any():
+                raise ValueError("Categorical splits are not supported")
+
+            def node_ids(children):
+                return np.where(children >= 0, offset + children, offset + n_internal + ~children)
+
+            leaf_ids = offset + n_internal + np.arange(num_leaves)
+            feature.append(np.concatenate([_values(tree, "split_feature", np.int64), np.zeros(num_leaves, np.int64)]))
+            threshold.append(np.concatenate([_values(tree, "threshold", np.float64), np.zeros(num_leaves)]))
+            left.append(np.concatenate([node_ids(_values(tree, "left_child", np.int64)), leaf_ids]))
+            right.append(np.concatenate([node_ids(_values(tree, "right_child", np.int64)), leaf_ids]))
+            leaf_value.append(np.concatenate([np.zeros(n_internal), _values(tree, "leaf_value", np.float64)]))
+            default_left.append(np.concatenate([(decision & _DEFAULT_LEFT_MASK) > 0, np.zeros(num_leaves, bool)]))
+            missing_type.append(np.concatenate([(decision >> 2) & 3, np.zeros(num_leaves, np.int64)]))
+
+            # Depth of the deepest leaf (root is depth 0)
+            depth = np.zeros(n_internal, np.int64)
+            lc, rc = _values(tree, "left_child", np.int64), _values(tree, "right_child", np.int64)
+            for node in range(n_internal):
+                for child in (lc[node], rc[node]):
+                    if child >= 0:
+                        depth[child] = depth[node] + 1
+            max_depth = max(max_depth, int(depth.max()) + 1 if n_internal else 0)
+
+            roots.append(offset if n_internal else offset + n_internal)
+            offset += n_internal + num_leaves
+
+        return cls(
+            roots=np.array(roots, dtype=np.int64),
+            feature=np.concatenate(feature),
+            threshold=np.concatenate(threshold),
+            left=np.concatenate(left),
+            right=np.concatenate(right),
+            leaf_value=np.concatenate(leaf_value),
+            default_left=np.concatenate(default_left),
+            missing_type=np.concatenate(missing_type),
+            max_depth=max_depth,
+            num_features=int(header["max_feature_idx"]) + 1,
+            objective=objective,
+            average_output="average_output" in model_str.split("Tree=", 1)[0].split(),
+            backend=backend,
+        )
+
+    @classmethod
+    def from_file(cls, path: str, backend: str = "numpy"):
+        with open(path, "r") as f:
+            return cls.from_string(f.read(), backend=backend)
+
+    @classmethod
+    def from_booster(cls, booster, backend: str = "numpy"):
+        return cls.from_string(booster.model_to_string(), backend=backend)
+
+    # Same compiled arrays evaluated with another backend
+    def with_backend(self, backend: str):
+        return CompiledModel(
+            self.roots, self.feature, self.threshold, self.left, self.right, self.leaf_value,
+            self.default_left, self.missing_type, self.max_depth, self.num_features,
+            self.objective, self.average_output, backend=backend
+        )
+
+    def num_trees(self) -> int:
+        return len(self.roots)
+
+    def num_feature(self) -> int:
+        return self.num_features
+
+    def predict(self, X, chunk_rows: int = 8192) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        if self.backend == "numba":
+            raw = self._predict_numba(X)
+        else:
+            raw = np.empty(len(X))
+            for start in range(0, len(X), chunk_rows):
+                raw[start:start + chunk_rows] = self._predict_numpy(X[start:start + chunk_rows])
+
+        if self.average_output:
+            raw /= self.num_trees()
+        return np.exp(raw) if self.objective in _EXP_OBJECTIVES else raw
+
+    # One (row, tree) cursor per pair; each step advances only the cursors that have
+    # not reached a leaf yet, so the work is the total path length, not n * trees * depth
+    def _predict_numpy(self, X: np.ndarray) -> np.ndarray:
+        n, n_trees = len(X), len(self.roots)
+        node = np.tile(self.roots, n)
+        row = np.repeat(np.arange(n), n_trees)
+        if self.plain_splits:
+            X = np.where(np.isnan(X), 0.0, X)
+
+        active = np.flatnonzero(self.left[node] != node)
+        while active.size:
+            current = node[active]
+            fval = X[row[active], self.feature[current]]
+            if self.plain_splits:
+                go_left = fval <= self.threshold[current]
+            else:
+                missing_type = self.missing_type[current]
+                is_nan = np.isnan(fval)
+                fval = np.where(is_nan & (missing_type != _MISSING_NAN), 0.0, fval)
+                use_default = (((missing_type == _MISSING_ZERO) & (np.abs(fval) <= _ZERO_THRESHOLD))
+                               | ((missing_type == _MISSING_NAN) & is_nan))
+                go_left = np.where(use_default, self.default_left[current], fval <= self.threshold[current])
+
+            current = np.where(go_left, self.left[current], self.right[current])
+            node[active] = current
+            active = active[self.left[current] != current]
+
+        values = self.leaf_value[node].reshape(n, n_trees)
+        raw = np.zeros(n)
+        for t in range(n_trees):  # tree order, like LightGBM's accumulation
+            raw += values[:, t]
+        return raw
+
+    def _predict_numba(self, X: np.ndarray) -> np.ndarray:
+        if self._numba_kernel is None:
+            self._numba_kernel = _build_numba_kernel()
+        out = np.empty(len(X))
+        self._numba_kernel(X, self.roots, self.feature, self.threshold, self.left, self.right,
+                           self.leaf_value, self.default_left, self.missing_type, out)
+        return out
+
+# numba is only imported when the numba backend is used
+def _build_numba_kernel():
+    from numba import njit
+
+    @njit(cache=True, nogil=True)
+    def kernel(X, roots, feature, threshold, left, right, leaf_value, default_left, missing_type, out):
+        for i in range(X.shape[0]):
+            total = 0.0
+            for t in range(roots.shape[0]):
+                node = roots[t]
+                while left[node] != node:
+                    fval = X[i, feature[node]]
+                    mt = missing_type[node]
+                    if np.isnan(fval) and mt != _MISSING_NAN:
+                        fval = 0.0
+                    if (mt == _MISSING_ZERO and abs(fval) <= _ZERO_THRESHOLD) or (mt == _MISSING_NAN and np.isnan(fval)):
+                        go_left = default_left[node]
+                    else:
+                        go_left = fval <= threshold[node]
+                    node = left[node] if go_left else right[node]
+                total += leaf_value[node]
+            out[i] = total
+        return out
+
+    return kernel
+
+# Model wrapper for a backend name: "lightgbm" keeps the Booster, "numpy"/"numba"
+# compile it (from a Booster, a saved model file or an already compiled model)
+def compile_model(model, backend: str = "numpy"):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend} (expected one of {BACKENDS})")
+    if isinstance(model, CompiledModel):
+        if backend == "lightgbm":
+            raise ValueError("A compiled model cannot be turned back into a LightGBM Booster")
+        return model if model.backend == backend else model.with_backend(backend)
+    if backend == "lightgbm":
+        return model
+    if isinstance(model, str):
+        return CompiledModel.from_file(model, backend=backend)
+    return CompiledModel.from_booster(model, backend=backend)
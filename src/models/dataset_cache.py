@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+import pandas as pd
+
+from src.utils.helpers import load_yaml_config
+from src.utils.stage_cache import StageCache
+
+# Cache of constructed (binned) LightGBM Datasets. Building an lgb.Dataset from pandas
+# re-bins every feature histogram; the constructed Dataset is saved with save_binary and
+# reloaded on later calls with the same inputs, so full retrains and tuning trials on
+# unchanged data skip the binning.
+# The key hashes the feature frame's content, the label, the feature list, the
+# parameters that shape the bins (DATASET_PARAMS) and the LightGBM version; a
+# validation set's key also includes its reference Dataset's key, because its bins are
+# aligned to the reference. Changing any of them gives a new entry; stale entries age
+# out through the StageCache LRU eviction. Entries are <key>.bin plus <key>.json (the
+# Dataset's pandas_categorical, so models trained from a hit match a fresh build).
+
+# Parameters baked into the binary Dataset (aliases included). min_data_in_leaf only
+# matters with feature_pre_filter on (LightGBM's default): trials varying it should set
+# feature_pre_filter=False to share one entry.
+DATASET_PARAMS = (
+    "max_bin", "max_bins", "max_bin_by_feature", "min_data_in_bin", "bin_construct_sample_cnt",
+    "subsample_for_bin", "data_random_seed", "data_seed", "seed", "random_seed", "random_state",
+    "is_enable_sparse", "is_sparse", "enable_sparse", "enable_bundle", "is_enable_bundle", "bundle",
+    "use_missing", "zero_as_missing", "feature_pre_filter", "linear_tree", "linear_trees",
+    "forcedbins_filename", "categorical_feature", "cat_feature", "categorical_column", "cat_column",
+    "pre_partition", "two_round", "precise_float_parser",
+)
+PRE_FILTER_PARAMS = ("min_data_in_leaf", "min_data_per_leaf", "min_data", "min_child_samples", "min_samples_leaf")
+
+# The subset of params that determines the binned Dataset
+def dataset_params(params: dict = None) -> dict:
+    params = params or {}
+    names = DATASET_PARAMS
+    if params.get("feature_pre_filter", True):
+        names = names + PRE_FILTER_PARAMS
+    return {k: v for k, v in params.items() if k in names}
+
+class DatasetCache(StageCache):
+    EXTENSIONS = (".bin", ".json")
+
+    def __init__(self, cache_dir: str = ".cache/datasets", max_size_mb: float = 2048, enabled: bool = True):
+        super().__init__(cache_dir=cache_dir, max_size_mb=max_size_mb, enabled=enabled)
+
+    # Settings from config.yaml `cache` (dataset_dir, dataset_max_size_mb, enabled)
+    @classmethod
+    def from_config(cls):
+        settings = load_yaml_config().get("cache", {})
+        return cls(
+            cache_dir=settings.get("dataset_dir", ".cache/datasets"),
+            max_size_mb=settings.get("dataset_max_size_mb", 2048),
+            enabled=settings.get("enabled", True),
+        )
+
+    def key(self, X: pd.DataFrame, label, params: dict = None, reference=None) -> str:
+        import lightgbm as lgb
+
+        h = hashlib.sha256(lgb.__version__.encode())
+        h.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+        h.update(pd.util.hash_pandas_object(pd.Series(label), index=False).to_numpy().tobytes())
+        h.update(json.dumps([[str(c), str(t)] for c, t in X.dtypes.items()]).encode())
+        h.update(json.dumps(dataset_params(params), sort_keys=True, default=str).encode())
+        h.update(getattr(reference, "cache_key", "").encode())
+        return "dataset-" + h.hexdigest()[:24]
+
+    # lgb.Dataset for (X, label): loaded from the binary cache, or built, constructed
+    # and stored. The returned Dataset carries its key as .cache_key.
+    def dataset(self, X: pd.DataFrame, label, params: dict = None, reference=None):
+        import lightgbm as lgb
+
+        params = dataset_params(params)
+        if not self.enabled:
+            return lgb.Dataset(X, label=label, params=params, reference=reference)
+
+        key = self.key(X, label, params, reference)
+        bin_path, meta_path = self._path(key, ".bin"), self._path(key, ".json")
+        if os.path.exists(bin_path) and os.path.exists(meta_path):
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            os.utime(bin_path)  # LRU: a hit makes the entry recent
+            os.utime(meta_path)
+            dataset = lgb.Dataset(bin_path, params=params, reference=reference)
+            dataset.pandas_categorical = meta["pandas_categorical"]
+        else:
+            dataset = lgb.Dataset(X, label=label, params=params, reference=reference)
+            dataset.construct()
+            dataset.save_binary(bin_path + ".tmp")
+            os.replace(bin_path + ".tmp", bin_path)
+            with open(meta_path + ".tmp", "w") as f:
+                json.dump({"pandas_categorical": dataset.pandas_categorical, "rows": len(X)}, f)
+            os.replace(meta_path + ".tmp", meta_path)
+            self.evict()
+        dataset.cache_key = key
+        return dataset
+
+    # Saved binary of a cached Dataset, loadable with lgb.Dataset(path) in another process
+    def binary_path(self, key: str) -> str:
+        return self._path(key, ".bin")
+
+    # Train + validation Datasets with the validation bins aligned to the training set
+    def train_valid(self, X_train, y_train, X_valid, y_valid, params: dict = None):
+        train_set = self.dataset(X_train, y_train, params)
+        return train_set, self.dataset(X_valid, y_valid, params, reference=train_set)
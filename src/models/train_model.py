@@ -1,13 +1,14 @@
-import lightgbm as lgb
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
 import os
+import hashlib
+import json
 import numpy as np
-import mlflow
-import mlflow.lightgbm
+from datetime import datetime, timezone
 
 # General-purpose training function using LightGBM + MLflow tracking
+# (dataset_cache: models/dataset_cache.py, DatasetCache.from_config() by default).
+# Without explicit params, the tuning artifact's params and rounds are used when one
+# exists (models/tuning.py; tuned_params_path defaults to config paths.tuned_params).
 def train_lightgbm_regressor(
     df: pd.DataFrame,
     feature_cols: list,
@@ -15,8 +16,19 @@ def train_lightgbm_regressor(
     params: dict = None,
     test_size: float = 0.2,
     random_state: int = 22,
-    run_name: str = "lightgbm_forecast"
+    run_name: str = "lightgbm_forecast",
+    dataset_cache=None,
+    tuned_params_path: str = None
 ):
+    # Heavy / optional dependencies load only when training actually runs
+    import lightgbm as lgb
+    import mlflow
+    import mlflow.lightgbm
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import mean_squared_error, r2_score
+    from src.models.dataset_cache import DatasetCache
+    from src.models.tuning import load_tuned_params
+
     df = df.dropna(subset=feature_cols + [target_col])
     X = df[feature_cols]
     y = df[target_col]
@@ -25,16 +37,18 @@ def train_lightgbm_regressor(
         X, y, test_size=test_size, shuffle=False
     )
 
+    num_boost_round = 100
     if params is None:
-        params = {
+        params, num_boost_round = load_tuned_params({
             "objective": "regression",
             "metric": "rmse",
             "verbosity": -1,
             "random_state": random_state
-        }
+        }, num_boost_round=num_boost_round, path=tuned_params_path)
 
-    lgb_train = lgb.Dataset(X_train, label=y_train)
-    lgb_test = lgb.Dataset(X_test, label=y_test, reference=lgb_train)
+    # Binned Datasets are reused across retrains on unchanged data (models/dataset_cache.py)
+    dataset_cache = dataset_cache or DatasetCache.from_config()
+    lgb_train, lgb_test = dataset_cache.train_valid(X_train, y_train, X_test, y_test, params)
 
     # Set tracking directory
     mlflow.set_tracking_uri("experiments/tracking_with_mlflow")
@@ -47,7 +61,7 @@ def train_lightgbm_regressor(
             params,
             lgb_train,
             valid_sets=[lgb_train, lgb_test],
-            num_boost_round=100,
+            num_boost_round=num_boost_round,
             early_stopping_rounds=10,
             verbose_eval=False
         )
@@ -64,15 +78,125 @@ def train_lightgbm_regressor(
         return model, X_test, y_test, preds
 
 # save to disk as well but this is optional
+# Written to a temp file and renamed so the API's model watcher never reads a half-written model
 def save_model(model, path="models/lightgbm_model.txt"):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    model.save_model(path)
+    tmp_path = f"{path}.tmp"
+    model.save_model(tmp_path)
+    os.replace(tmp_path, path)
+
+def write_atomic(path: str, text: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+# Incremental update of a saved booster with a newly arrived data window, instead of
+# retraining on the full history:
+#   mode="continue": up to num_boost_round more trees fitted to the new window's residuals
+#                    (init_model), early-stopped on its last valid_size share when > 0
+#   mode="refit":    same trees, leaf values re-estimated on the new window;
+#                    new leaf = decay_rate * old + (1 - decay_rate) * window estimate
+# init_model is a Booster or a model file path
+def update_lightgbm_regressor(
+    init_model,
+    new_df: pd.DataFrame,
+    feature_cols: list,
+    target_col: str,
+    mode: str = "continue",
+    params: dict = None,
+    num_boost_round: int = 20,
+    early_stopping_rounds: int = 5,
+    valid_size: float = 0.2,
+    decay_rate: float = 0.9,
+    random_state: int = 22
+):
+    import lightgbm as lgb
+
+    if isinstance(init_model, (str, os.PathLike)):
+        init_model = lgb.Booster(model_file=str(init_model))
+
+    new_df = new_df.dropna(subset=feature_cols + [target_col])
+    if mode == "refit":
+        return init_model.refit(new_df[feature_cols], new_df[target_col], decay_rate=decay_rate)
+    if mode != "continue":
+        raise ValueError(f"Unknown incremental mode '{mode}', expected 'continue' or 'refit'")
 
-# For standalone execution
+    if params is None:
+        params = {
+            "objective": "regression",
+            "metric": "rmse",
+            "verbosity": -1,
+            "random_state": random_state
+        }
+
+    # Time-ordered split of the window, as in the full training
+    n_valid = int(len(new_df) * valid_size)
+    train_df, valid_df = new_df.iloc[:len(new_df) - n_valid], new_df.iloc[len(new_df) - n_valid:]
+    lgb_train = lgb.Dataset(train_df[feature_cols], label=train_df[target_col])
+    valid_sets = []
+    if n_valid > 0:
+        valid_sets = [lgb.Dataset(valid_df[feature_cols], label=valid_df[target_col], reference=lgb_train)]
+
+    return lgb.train(
+        params,
+        lgb_train,
+        num_boost_round=num_boost_round,
+        init_model=init_model,
+        valid_sets=valid_sets,
+        early_stopping_rounds=early_stopping_rounds if valid_sets else None,
+        verbose_eval=False
+    )
+
+# Publish a model as a new version: an immutable copy under versions_dir named by the
+# content hash (the version id api.model_registry reports), a line in versions_dir/index.jsonl
+# (parent version, training mode, rows, ...), then an atomic swap of the live model file
+# that the API's model watcher picks up. Returns the version id.
+def register_model_version(model, path: str = "models/lightgbm_model.txt", versions_dir: str = None, **metadata):
+    versions_dir = versions_dir or os.path.join(os.path.dirname(path), "versions")
+    os.makedirs(versions_dir, exist_ok=True)
+    model_str = model.model_to_string()
+    version = hashlib.sha256(model_str.encode()).hexdigest()[:12]
+
+    parent = None
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            parent = hashlib.sha256(f.read().encode()).hexdigest()[:12]
+
+    # Immutable copy and index entry first, so a live version is always indexed
+    write_atomic(os.path.join(versions_dir, f"{version}.txt"), model_str)
+    record = {
+        "version": version,
+        "parent": parent,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "num_trees": model.num_trees(),
+        **metadata
+    }
+    with open(os.path.join(versions_dir, "index.jsonl"), "a") as f:
+        f.write(json.dumps(record, default=str) + "\n")
+    write_atomic(path, model_str)
+
+    print(f"✅ Registered model version {version} (parent {parent}) → {path}")
+    return version
+
+# For standalone execution:
+#   python -m src.models.train_model                                  full training
+#   python -m src.models.train_model --since 2024-06-01 [--mode refit]  update the live
+#       model with rows dated on/after --since (model.incremental in config.yaml)
 if __name__ == "__main__":
+    import argparse
     from src.data.load_data import load_data_pandas
     from src.data.preprocess import preprocess_pandas
     from src.features.build_features import build_features
+    from src.utils.helpers import load_yaml_config
+
+    incremental = load_yaml_config().get("model", {}).get("incremental", {})
+    parser = argparse.ArgumentParser(description="Train or incrementally update the LightGBM demand model")
+    parser.add_argument("--model", default="models/lightgbm_model.txt")
+    parser.add_argument("--since", default=None, help="update the saved model with rows from this date on")
+    parser.add_argument("--mode", default=incremental.get("mode", "continue"), choices=["continue", "refit"])
+    args = parser.parse_args()
 
     _, sales_df = load_data_pandas()
     cleaned_df = preprocess_pandas(sales_df)
@@ -85,5 +209,15 @@ if __name__ == "__main__":
         "day_of_week", "is_weekend", "month"
     ]
 
-    model, X_test, y_test, preds = train_lightgbm_regressor(featured_df, features, "units_sold")
-    save_model(model)
\ No newline at end of file
+    if args.since is None:
+        model, X_test, y_test, preds = train_lightgbm_regressor(featured_df, features, "units_sold")
+        register_model_version(model, args.model, mode="full", rows=len(featured_df))
+    else:
+        new_df = featured_df[featured_df["date"] >= pd.Timestamp(args.since)]
+        model = update_lightgbm_regressor(
+            args.model, new_df, features, "units_sold", mode=args.mode,
+            num_boost_round=incremental.get("num_boost_round", 20),
+            early_stopping_rounds=incremental.get("early_stopping_rounds", 5),
+            decay_rate=incremental.get("decay_rate", 0.9)
+        )
+        register_model_version(model, args.model, mode=args.mode, since=args.since, rows=len(new_df))
@@ -0,0 +1,292 @@
+import os
+import time
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.forecasting.forecaster import FEATURE_COLS, TARGET_COL
+from src.utils.helpers import load_yaml_config
+
+# Random-search hyperparameter tuning for the demand forecaster across a process pool.
+# The train / validation split matches forecaster.train_forecast_model. Its binned
+# Datasets are built once through the dataset cache (models/dataset_cache.py) and every
+# worker loads the saved binaries, so trials neither copy DataFrames nor re-bin.
+# Workers are spawned (as in pipelines/parallel_executor.py) and each trial runs with
+# num_threads = threads_per_worker, so n_workers trials never oversubscribe the cores.
+#
+# Median pruning: every prune_every rounds (after prune_warmup_rounds) a trial reports
+# its best validation RMSE so far to a dict shared through a multiprocessing Manager,
+# and stops when that is worse than the median the other trials (running, finished or
+# pruned) reported at the same round. The median applies once at least
+# min_trials_before_pruning other trials have reached that round, so trials running
+# side by side prune each other even when every trial has its own worker.
+#
+# Each finished trial is logged as a nested MLflow run under the demand_forecasting
+# experiment; the best parameters go to paths.tuned_params (YAML) and are logged as an
+# artifact of the search run.
+
+# name → (kind, low, high); kind "log" samples log-uniformly, "int" inclusive integers
+SEARCH_SPACE = {
+    "learning_rate": ("log", 0.01, 0.3),
+    "num_leaves": ("int", 8, 256),
+    "min_data_in_leaf": ("int", 5, 200),
+    "feature_fraction": ("float", 0.5, 1.0),
+    "bagging_fraction": ("float", 0.5, 1.0),
+    "lambda_l2": ("log", 1e-3, 10.0),
+}
+
+# Fixed for every trial. feature_pre_filter off lets trials vary min_data_in_leaf on
+# one binned Dataset.
+BASE_PARAMS = {
+    "objective": "regression",
+    "metric": "rmse",
+    "verbosity": -1,
+    "random_state": 22,
+    "bagging_freq": 1,
+    "feature_pre_filter": False,
+}
+
+class TrialPruned(Exception):
+    pass
+
+def sample_params(rng: np.random.Generator, space: dict = None) -> dict:
+    params = {}
+    for name, (kind, low, high) in (space or SEARCH_SPACE).items():
+        if kind == "log":
+            params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        elif kind == "int":
+            params[name] = int(rng.integers(low, high + 1))
+        else:
+            params[name] = float(rng.uniform(low, high))
+    return params
+
+# Median RMSE the other trials reported at a pruning round; None until min_trials of
+# them got there. reports maps (trial, round) → best RMSE so far.
+def step_median(reports, step: int, trial: int, min_trials: int):
+    values = [rmse for (other, other_step), rmse in reports.items() if other_step == step and other != trial]
+    if not values or len(values) < min_trials:
+        return None
+    return float(np.median(values))
+
+_worker_datasets = None
+
+def _init_worker(train_path: str, valid_path: str):
+    global _worker_datasets
+    _worker_datasets = (train_path, valid_path)
+
+def _run_trial(trial: int, params: dict, num_boost_round: int, early_stopping_rounds: int,
+               prune_steps: tuple, reports, min_trials: int) -> dict:
+    import lightgbm as lgb
+
+    start = time.perf_counter()
+    train_path, valid_path = _worker_datasets
+    # Fresh Dataset handles per trial: the binaries load in milliseconds
+    train_set = lgb.Dataset(train_path)
+    valid_set = lgb.Dataset(valid_path, reference=train_set)
+
+    curve, best = {}, [np.inf]
+
+    def prune(env):
+        step = env.iteration + 1
+        for data_name, _, value, _ in env.evaluation_result_list:
+            if data_name == "valid":
+                best[0] = min(best[0], value)
+        if step in prune_steps:
+            curve[step] = best[0]
+            reports[(trial, step)] = best[0]
+            median = step_median(reports, step, trial, min_trials)
+            if median is not None and best[0] > median:
+                raise TrialPruned()
+
+    result = {"trial": trial, "params": params, "curve": curve}
+    try:
+        model = lgb.train(
+            params, train_set, num_boost_round=num_boost_round,
+            valid_sets=[valid_set], valid_names=["valid"],
+            early_stopping_rounds=early_stopping_rounds, verbose_eval=False, callbacks=[prune]
+        )
+        result.update(state="complete", rmse=model.best_score["valid"]["rmse"], best_iteration=model.best_iteration)
+    except TrialPruned:
+        result.update(state="pruned", rmse=best[0], best_iteration=max(curve))
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+# One parent run per search, a nested run per trial as it finishes
+class MlflowTrialLogger:
+    def __init__(self, experiment: str = "demand_forecasting", run_name: str = "lightgbm_tuning"):
+        import mlflow
+
+        self.mlflow = mlflow
+        mlflow.set_tracking_uri("experiments/tracking_with_mlflow")
+        mlflow.set_experiment(experiment)
+        mlflow.start_run(run_name=run_name)
+
+    def log_trial(self, result: dict):
+        with self.mlflow.start_run(run_name=f"trial_{result['trial']}", nested=True):
+            self.mlflow.log_params(result["params"])
+            self.mlflow.set_tag("state", result["state"])
+            for step, rmse in sorted(result["curve"].items()):
+                self.mlflow.log_metric("valid_rmse", rmse, step=step)
+            self.mlflow.log_metrics({
+                "rmse": result["rmse"], "best_iteration": result["best_iteration"], "seconds": result["seconds"]
+            })
+
+    def finish(self, best: dict, artifact_path: str):
+        self.mlflow.log_params({f"best_{k}": v for k, v in best["params"].items()})
+        self.mlflow.log_metrics({"best_rmse": best["rmse"], "best_trial": best["trial"]})
+        self.mlflow.log_artifact(artifact_path)
+        self.mlflow.end_run()
+
+# Best trial as a config artifact: LightGBM params + rounds, loadable with yaml.safe_load
+def write_tuned_params(best: dict, path: str, n_trials: int):
+    params = {k: v for k, v in best["params"].items() if k != "num_threads"}
+    artifact = {
+        "lightgbm_params": params,
+        "num_boost_round": int(best["best_iteration"]),
+        "validation_rmse": float(best["rmse"]),
+        "trial": int(best["trial"]),
+        "n_trials": n_trials,
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write("# Best forecaster parameters from src/models/tuning.py\n")
+        yaml.safe_dump(artifact, f, sort_keys=False)
+    os.replace(tmp_path, path)
+
+# LightGBM params + rounds for training: the tuned artifact at path (default
+# paths.tuned_params) when a search has written one, else the given defaults. The
+# caller's params (objective, seed, ...) win over tuned ones they name.
+def load_tuned_params(params: dict, num_boost_round: int, path: str = None) -> tuple:
+    path = path or load_yaml_config()["paths"]["tuned_params"]
+    if not os.path.exists(path):
+        return params, num_boost_round
+    with open(path, "r") as f:
+        artifact = yaml.safe_load(f)
+    return {**artifact["lightgbm_params"], **params}, int(artifact["num_boost_round"])
+
+# Settings from config.yaml `tuning`, overridden by explicit arguments
+def tuning_settings(**overrides) -> dict:
+    settings = {
+        "n_trials": 32,
+        "n_workers": None,
+        "threads_per_worker": 1,
+        "num_boost_round": 500,
+        "early_stopping_rounds": 20,
+        "prune_warmup_rounds": 25,
+        "prune_every": 25,
+        "min_trials_before_pruning": 4,
+        "seed": 22,
+        **(load_yaml_config().get("tuning") or {}),
+    }
+    settings.update({k: v for k, v in overrides.items() if v is not None})
+    settings["n_workers"] = settings["n_workers"] or os.cpu_count()
+    return settings
+
+# Binary train / validation Datasets for the workers: same rows and split as
+# train_forecast_model, saved through the dataset cache. With the cache disabled they
+# go to tmp_dir instead, which the caller owns and removes after the search.
+def tuning_datasets(df: pd.DataFrame, dataset_cache=None, tmp_dir: str = None) -> tuple:
+    from sklearn.model_selection import train_test_split
+    from src.models.dataset_cache import DatasetCache
+
+    df = df.dropna(subset=["lag_1", "rolling_mean_7", "elasticity"])
+    train_df, valid_df = train_test_split(df, test_size=0.2, shuffle=False)
+    dataset_cache = dataset_cache or DatasetCache.from_config()
+    if not dataset_cache.enabled:
+        if tmp_dir is None:
+            raise ValueError("tuning_datasets needs a tmp_dir when the dataset cache is disabled")
+        dataset_cache = DatasetCache(cache_dir=tmp_dir)
+    train_set, valid_set = dataset_cache.train_valid(
+        train_df[FEATURE_COLS], train_df[TARGET_COL], valid_df[FEATURE_COLS], valid_df[TARGET_COL], BASE_PARAMS
+    )
+    return dataset_cache.binary_path(train_set.cache_key), dataset_cache.binary_path(valid_set.cache_key)
+
+# Run the search on a featured frame; returns (best trial, all trials in finish order).
+# prune_every=0 disables pruning; mlflow_experiment=None skips MLflow logging.
+def run_tuning(
+    df: pd.DataFrame,
+    output_path: str = None,
+    mlflow_experiment: str = "demand_forecasting",
+    dataset_cache=None,
+    space: dict = None,
+    **overrides
+):
+    settings = tuning_settings(**overrides)
+    output_path = output_path or load_yaml_config()["paths"]["tuned_params"]
+
+    rng = np.random.default_rng(settings["seed"])
+    trial_params = [
+        {**BASE_PARAMS, **sample_params(rng, space), "num_threads": settings["threads_per_worker"]}
+        for _ in range(settings["n_trials"])
+    ]
+    prune_steps = ()
+    if settings["prune_every"]:
+        prune_steps = tuple(range(settings["prune_warmup_rounds"], settings["num_boost_round"] + 1, settings["prune_every"]))
+
+    logger = MlflowTrialLogger(mlflow_experiment) if mlflow_experiment else None
+    results, pending, submitted = [], set(), 0
+    mp_context = multiprocessing.get_context("spawn")
+    # Binaries for a disabled cache live only as long as the search
+    with tempfile.TemporaryDirectory(prefix="tuning-datasets-") as tmp_dir, mp_context.Manager() as manager:
+        paths = tuning_datasets(df, dataset_cache, tmp_dir)
+        reports = manager.dict()  # (trial, round) → best RMSE so far, read live by every trial
+        start = time.perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=settings["n_workers"],
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=paths,
+        ) as pool:
+            while submitted < len(trial_params) or pending:
+                # Keep every worker busy
+                while submitted < len(trial_params) and len(pending) < settings["n_workers"]:
+                    pending.add(pool.submit(
+                        _run_trial, submitted, trial_params[submitted], settings["num_boost_round"],
+                        settings["early_stopping_rounds"], prune_steps, reports,
+                        settings["min_trials_before_pruning"]
+                    ))
+                    submitted += 1
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results.append(result)
+                    if logger:
+                        logger.log_trial(result)
+                    print(f"🔎 Trial {result['trial']:3d} {result['state']:<8} RMSE {result['rmse']:.4f} "
+                          f"@ {result['best_iteration']:4d} rounds ({result['seconds']:.1f} s)")
+
+    completed = [r for r in results if r["state"] == "complete"]
+    best = min(completed or results, key=lambda r: r["rmse"])
+    write_tuned_params(best, output_path, len(results))
+    if logger:
+        logger.finish(best, output_path)
+    n_pruned = len(results) - len(completed)
+    print(f"✅ Tuning done: {len(results)} trials ({n_pruned} pruned) on {settings['n_workers']} workers in "
+          f"{time.perf_counter() - start:.1f} s. Best RMSE {best['rmse']:.4f} (trial {best['trial']}) → {output_path}")
+    return best, results
+
+if __name__ == "__main__":
+    import argparse
+    from src.data.storage import read_frame
+    from src.data.load_data import raw_data_paths
+    from src.data.preprocess import preprocess_pandas
+    from src.features.build_features import build_features
+
+    parser = argparse.ArgumentParser(description="Parallel LightGBM hyperparameter search for the forecaster")
+    parser.add_argument("--input", default=raw_data_paths()[1])
+    parser.add_argument("--trials", type=int, default=None, help="default: config tuning.n_trials")
+    parser.add_argument("--workers", type=int, default=None, help="default: config tuning.n_workers")
+    parser.add_argument("--threads", type=int, default=None, help="LightGBM threads per worker")
+    parser.add_argument("--output", default=None, help="default: config paths.tuned_params")
+    parser.add_argument("--no-mlflow", action="store_true")
+    args = parser.parse_args()
+
+    featured_df = build_features(preprocess_pandas(read_frame(args.input)))
+    run_tuning(
+        featured_df, output_path=args.output, mlflow_experiment=None if args.no_mlflow else "demand_forecasting",
+        n_trials=args.trials, n_workers=args.workers, threads_per_worker=args.threads
+    )
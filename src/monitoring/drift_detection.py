@@ -1,19 +1,18 @@
 import pandas as pd
-import nannyml as nml
 import os
 
-# Run univariate feature drift detection using NannyML
+from src.monitoring.streaming_drift import DRIFT_FEATURES
+
+# Run univariate feature drift detection using NannyML (batch; for continuous or
+# in-process monitoring see src/monitoring/streaming_drift.py)
 def detect_feature_drift(reference_df: pd.DataFrame, analysis_df: pd.DataFrame) -> pd.DataFrame:
-    features = [
-        "price", "promo_discount", "competitor_price", "temperature",
-        "price_margin", "price_vs_competitor", "lag_1", "rolling_mean_7", "elasticity"
-    ]
+    import nannyml as nml
 
     # Configure drift calculator
     calculator = nml.UnivariateDriftCalculator(
-        column_names=features,
+        column_names=DRIFT_FEATURES,
         timestamp_column_name="date",
-        chunk_size="30d"
+        chunk_period="M"
     )
 
     # Fit on reference data
@@ -30,17 +29,11 @@ def save_drift_output(results, output_path="data/processed/feature_drift_results
     results.to_pandas().to_csv(output_path, index=False)
 
 if __name__ == "__main__":
-    from src.forecasting.forecaster import train_forecast_model
-    from src.features.build_features import build_features
-    from src.data.load_data import load_data_pandas
-    from src.data.preprocess import preprocess_pandas
+    from src.pipelines.forecasting_pipeline import forecast_stages
     from src.monitoring.post_deploy_monitor import simulate_post_deploy_data
 
-    # Load and prepare data
-    _, sales_df = load_data_pandas()
-    cleaned_df = preprocess_pandas(sales_df)
-    featured_df = build_features(cleaned_df)
-    _, predicted_df = train_forecast_model(featured_df)
+    # Load and prepare data (reuses the cached forecasting stages when unchanged)
+    _, predicted_df = forecast_stages().value
     post_df = simulate_post_deploy_data(predicted_df)
 
     # Detect drift
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+
+# Incremental forecast-accuracy monitor: predicted_units_sold vs actual_units_sold per
+# SKU and per category over time windows, without rescanning history.
+#
+# Time is cut into buckets of slide_days (aligned to 1970-01-01). Each bucket holds the
+# sufficient statistics of every (category, sku_id) slot in fixed-size arrays
+# [count, Σ error², Σ error] with error = predicted - actual, and a window is the ring of
+# the last window_days / slide_days buckets. When a later bucket starts, the window that
+# just ended is emitted and the oldest bucket is zeroed for reuse. slide_days equal to
+# window_days gives tumbling windows; smaller values give sliding windows.
+#
+# Category statistics are the SKU slots regrouped at emission (O(SKUs)). Rows for a
+# bucket still inside the window are added late; rows older than the window are counted
+# in late_rows and dropped.
+
+COUNT, SSE, ERROR_SUM = 0, 1, 2
+
+class IncrementalPerformanceMonitor:
+    def __init__(self, window_days: int = 28, slide_days: int = None, capacity: int = 1024):
+        slide_days = slide_days or window_days
+        if window_days % slide_days:
+            raise ValueError(f"window_days ({window_days}) must be a multiple of slide_days ({slide_days})")
+        self.window_days = window_days
+        self.slide_days = slide_days
+        self.n_buckets = window_days // slide_days
+        self.late_rows = 0
+
+        # (category, sku_id) → slot, and per-slot labels
+        self._slot_of = {}
+        self._sku_ids = []
+        self._categories = []
+        self._category_codes = []
+        self._category_index = {}
+
+        self._ring = np.zeros((self.n_buckets, 3, capacity))
+        self._bucket = None  # newest bucket seen
+
+    @classmethod
+    def from_config(cls, config: dict = None):
+        if config is None:
+            from src.utils.helpers import load_yaml_config
+            config = load_yaml_config()
+        settings = config.get("performance_monitor", {})
+        return cls(window_days=settings.get("window_days", 28), slide_days=settings.get("slide_days"))
+
+    def _add_slot(self, key) -> int:
+        slot = len(self._sku_ids)
+        if slot == self._ring.shape[2]:
+            grown = np.zeros((self.n_buckets, 3, 2 * slot))
+            grown[:, :, :slot] = self._ring
+            self._ring = grown
+        category, sku_id = key
+        self._slot_of[key] = slot
+        self._sku_ids.append(sku_id)
+        self._categories.append(category)
+        self._category_codes.append(self._category_index.setdefault(category, len(self._category_index)))
+        return slot
+
+    # Slot per row; only the distinct (category, sku_id) pairs of the batch go through the
+    # dict, rows are mapped with integer codes. Rows with a missing key get -1.
+    def _slots(self, sku_ids, categories) -> np.ndarray:
+        sku_codes, sku_uniques = pd.factorize(sku_ids)
+        cat_codes, cat_uniques = pd.factorize(categories)
+        n_skus = max(len(sku_uniques), 1)
+        pairs = np.where((sku_codes < 0) | (cat_codes < 0), -1, cat_codes.astype(np.int64) * n_skus + sku_codes)
+        pair_codes, distinct = pd.factorize(pairs)
+
+        known = distinct >= 0
+        keys = zip(np.asarray(cat_uniques, dtype=object)[distinct[known] // n_skus].tolist(),
+                   np.asarray(sku_uniques, dtype=object)[distinct[known] % n_skus].tolist())
+        pair_slots = np.full(len(distinct), -1, dtype=np.int64)
+        pair_slots[known] = [
+            slot if (slot := self._slot_of.get(key)) is not None else self._add_slot(key) for key in keys
+        ]
+        return pair_slots[pair_codes]
+
+    def _accumulate(self, bucket: int, slots: np.ndarray, error: np.ndarray):
+        stats = self._ring[bucket % self.n_buckets]
+        capacity = stats.shape[1]
+        stats[COUNT] += np.bincount(slots, minlength=capacity)
+        stats[SSE] += np.bincount(slots, weights=error * error, minlength=capacity)
+        stats[ERROR_SUM] += np.bincount(slots, weights=error, minlength=capacity)
+
+    # Results of the window ending with `bucket`: one row per SKU and per category with
+    # data in the window, plus an overall row
+    def _window_frame(self, bucket: int) -> pd.DataFrame:
+        n_slots = len(self._sku_ids)
+        totals = self._ring.sum(axis=0)[:, :n_slots]
+        category_codes = np.array(self._category_codes, dtype=np.int64)
+        category_totals = np.stack([
+            np.bincount(category_codes, weights=row, minlength=len(self._category_index)) for row in totals
+        ])
+        category_names = list(self._category_index)
+
+        def rows(level, categories, sku_ids, stats):
+            keep = stats[COUNT] > 0
+            count = stats[COUNT][keep]
+            return pd.DataFrame({
+                "level": level,
+                "category": np.asarray(categories, dtype=object)[keep],
+                "sku_id": np.asarray(sku_ids, dtype=object)[keep],
+                "count": count.astype(np.int64),
+                "rmse": np.sqrt(stats[SSE][keep] / count),
+                "bias": stats[ERROR_SUM][keep] / count,
+            })
+
+        frame = pd.concat([
+            rows("sku", self._categories, self._sku_ids, totals),
+            rows("category", category_names, [None] * len(category_names), category_totals),
+            rows("overall", [None], [None], totals.sum(axis=1, keepdims=True)),
+        ], ignore_index=True)
+        first_day = (bucket - self.n_buckets + 1) * self.slide_days
+        frame.insert(0, "window_start", np.datetime64(int(first_day), "D"))
+        frame.insert(1, "window_end", np.datetime64(int((bucket + 1) * self.slide_days - 1), "D"))
+        return frame
+
+    # Emit the windows ending before `bucket` and rotate the ring up to it
+    def _advance(self, bucket: int) -> list:
+        closed = []
+        while self._bucket < bucket:
+            if not self._ring[:, COUNT].any():
+                self._bucket = bucket  # nothing left in the window: jump over the gap
+                break
+            closed.append(self._window_frame(self._bucket))
+            self._bucket += 1
+            self._ring[self._bucket % self.n_buckets] = 0
+        return closed
+
+    # Add prediction/actual pairs; returns the frames of the windows that closed
+    def update(self, dates, sku_ids, categories, predicted, actual) -> list:
+        error = np.asarray(predicted, dtype=np.float64) - np.asarray(actual, dtype=np.float64)
+        buckets = np.asarray(dates, dtype="datetime64[D]").astype(np.int64) // self.slide_days
+        slots = self._slots(sku_ids, categories)
+
+        valid = np.isfinite(error) & (slots >= 0)
+        if not valid.all():
+            buckets, slots, error = buckets[valid], slots[valid], error[valid]
+        if len(buckets) == 0:
+            return []
+        if (buckets[1:] < buckets[:-1]).any():
+            order = np.argsort(buckets, kind="stable")
+            buckets, slots, error = buckets[order], slots[order], error[order]
+
+        closed = []
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1, [len(buckets)]])
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            bucket = int(buckets[start])
+            if self._bucket is None:
+                self._bucket = bucket
+            if bucket > self._bucket:
+                closed.extend(self._advance(bucket))
+            elif self._bucket - bucket >= self.n_buckets:
+                self.late_rows += end - start
+                continue
+            self._accumulate(bucket, slots[start:end], error[start:end])
+        return closed
+
+    def update_frame(self, df: pd.DataFrame, date_col: str = "date", predicted_col: str = "predicted_units_sold",
+                     actual_col: str = "actual_units_sold") -> list:
+        return self.update(df[date_col], df["sku_id"], df["category"], df[predicted_col], df[actual_col])
+
+    # Results of the open window so far (None before the first row)
+    def current(self):
+        if self._bucket is None or not self._ring[:, COUNT].any():
+            return None
+        return self._window_frame(self._bucket)
+
+    # Emit the open window and start over (end of a batch run)
+    def flush(self):
+        frame = self.current()
+        self._ring[:] = 0
+        self._bucket = None
+        return frame
+
+if __name__ == "__main__":
+    from src.pipelines.forecasting_pipeline import forecast_stages
+    from src.monitoring.post_deploy_monitor import simulate_post_deploy_data
+    from src.data.storage import write_frame
+    from src.utils.helpers import load_yaml_config
+
+    config = load_yaml_config()
+
+    # Post-deploy predictions vs simulated actuals, streamed in date order
+    _, predicted_df = forecast_stages().value
+    post_df = simulate_post_deploy_data(predicted_df).sort_values("date", kind="stable")
+
+    monitor = IncrementalPerformanceMonitor.from_config(config)
+    windows = []
+    for start in range(0, len(post_df), 100_000):
+        windows.extend(monitor.update_frame(post_df.iloc[start:start + 100_000]))
+    final = monitor.flush()
+    if final is not None:
+        windows.append(final)
+
+    output_path = config["paths"]["performance_windows_output"]
+    results = pd.concat(windows, ignore_index=True)
+    write_frame(results, output_path)
+    overall = results[results["level"] == "overall"]
+    print(f"✅ Performance monitor: {len(windows)} windows, overall RMSE "
+          f"{overall['rmse'].min():.2f}–{overall['rmse'].max():.2f}. Results saved to {output_path}")
@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-import nannyml as nml
 import os
 
 # Simulate post-deployment data drift (to mimic production environment)
@@ -28,6 +27,8 @@ def run_monitoring(reference_df: pd.DataFrame, analysis_df: pd.DataFrame):
     target = "actual_units_sold"
     prediction = "predicted_units_sold"
 
+    import nannyml as nml
+
     # Initialize CBPE
     cbpe = nml.CBPE(
         problem_type='regression',
@@ -51,16 +52,10 @@ def save_monitoring_output(results, output_path="data/processed/monitoring_resul
     results.to_pandas().to_csv(output_path, index=False)
 
 if __name__ == "__main__":
-    from src.forecasting.forecaster import train_forecast_model
-    from src.features.build_features import build_features
-    from src.data.load_data import load_data_pandas
-    from src.data.preprocess import preprocess_pandas
+    from src.pipelines.forecasting_pipeline import forecast_stages
 
-    # Load and build pipeline
-    _, sales_df = load_data_pandas()
-    cleaned_df = preprocess_pandas(sales_df)
-    featured_df = build_features(cleaned_df)
-    _, predicted_df = train_forecast_model(featured_df)
+    # Load and prepare data (reuses the cached forecasting stages when unchanged)
+    _, predicted_df = forecast_stages().value
 
     # Simulate post-deploy data
     post_df = simulate_post_deploy_data(predicted_df)
@@ -0,0 +1,346 @@
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# Streaming feature drift. Each monitored feature's reference distribution is reduced
+# once to fixed-size summaries; live rows then only add to per-bin counts of the open
+# chunk, so memory is O(bins) per feature and no chunk or reference row is rescanned.
+#
+#   jensen_shannon      Doane-binned reference histogram, as NannyML's continuous
+#                       Jensen-Shannon method; chunk values outside the reference range
+#                       count in under/overflow slots (NannyML's "leftover" bin)
+#   psi                 population stability index over the same slots (ε-smoothed)
+#   kolmogorov_smirnov  reference quantile sketch: the chunk CDF is tracked just below and
+#                       at each of ≤ n_quantiles + 1 reference quantiles (plus the bin
+#                       edges) and compared with the exact reference CDF there. Exact when
+#                       a feature has at most n_quantiles + 1 distinct reference values,
+#                       otherwise within the reference mass between adjacent quantiles
+#                       (≈ 1 / n_quantiles)
+#
+# Chunks follow NannyML's chunkers: calendar periods of the row timestamps (chunk_period
+# "D", "M" or "Y", like chunk_period="M" in NannyML) or fixed row counts (chunk_size).
+# Rows are expected in time order; a late row is counted in the open chunk.
+
+# Monitored model inputs (the columns of the NannyML drift run)
+DRIFT_FEATURES = [
+    "price", "promo_discount", "competitor_price", "temperature",
+    "price_margin", "price_vs_competitor", "lag_1", "rolling_mean_7", "elasticity"
+]
+STATISTICS = ("jensen_shannon", "kolmogorov_smirnov", "psi")
+DEFAULT_THRESHOLDS = {"jensen_shannon": 0.1, "kolmogorov_smirnov": 0.1, "psi": 0.2}
+CHUNK_PERIODS = ("D", "M", "Y")
+PSI_EPSILON = 1e-4
+
+# Fixed-size summary of one feature's reference values (see the module comment). The
+# sketch points are the reference quantiles plus the histogram edges, so one search per
+# value yields both the KS counts and (summed over slot ranges) the histogram counts.
+class FeatureReference:
+    def __init__(self, edges: np.ndarray, ref_proba: np.ndarray, points: np.ndarray,
+                 ref_lt: np.ndarray, ref_le: np.ndarray):
+        self.edges = edges          # histogram bin edges
+        self.ref_proba = ref_proba  # reference share per bin: [underflow, bins..., overflow]
+        self.points = points        # sorted sketch points
+        self.ref_lt = ref_lt        # reference CDF just below each point
+        self.ref_le = ref_le        # reference CDF at each point
+
+        # Slot ranges of the histogram bins: below the first edge, [e_k, e_k+1) per bin with
+        # the last bin closed on the right (as np.histogram), above the last edge
+        at = 2 * np.searchsorted(points, edges)
+        self.hist_starts = np.concatenate([[0], at[:-1] + 1, [at[-1] + 2]])
+
+    @classmethod
+    def fit(cls, values: np.ndarray, n_quantiles: int = 1000):
+        values = np.asarray(values, dtype=np.float64)
+        values = np.sort(values[~np.isnan(values)])
+        if len(values) == 0:
+            raise ValueError("Reference column has no non-missing values")
+
+        edges = np.histogram_bin_edges(values, bins="doane")
+        counts = np.histogram(values, bins=edges)[0]
+        ref_proba = np.concatenate([[0.0], counts / len(values), [0.0]])
+
+        distinct = np.unique(values)
+        if len(distinct) <= n_quantiles + 1:
+            quantiles = distinct
+        else:
+            quantiles = np.quantile(values, np.linspace(0, 1, n_quantiles + 1))
+        points = np.union1d(quantiles, edges)
+        ref_lt = np.searchsorted(values, points, side="left") / len(values)
+        ref_le = np.searchsorted(values, points, side="right") / len(values)
+        return cls(edges, ref_proba, points, ref_lt, ref_le)
+
+    # Slots: 2k for values strictly between points k-1 and k, 2k+1 for values equal to
+    # point k, 2·len(points) above the last point, and a final slot for NaN (which sorts
+    # past every point and never equals one)
+    @property
+    def n_slots(self) -> int:
+        return 2 * len(self.points) + 2
+
+    def slots(self, values: np.ndarray) -> np.ndarray:
+        idx = np.searchsorted(self.points, values, side="left")
+        on_point = self.points[np.minimum(idx, len(self.points) - 1)] == values
+        return 2 * idx + on_point + np.isnan(values)
+
+# Σ a·log2(a/m) over a > 0 (one half of the Jensen-Shannon divergence)
+def _kl_to_mixture(a: np.ndarray, m: np.ndarray) -> float:
+    nonzero = a > 0
+    return float(np.sum(a[nonzero] * np.log2(a[nonzero] / m[nonzero])))
+
+# Drift statistics of one feature's chunk slot counts against its reference
+def drift_statistics(reference: FeatureReference, counts: np.ndarray) -> dict:
+    counts = counts[:-1]  # without NaNs
+    n = counts.sum()
+    if n == 0:
+        return {name: float("nan") for name in STATISTICS}
+
+    p = reference.ref_proba
+    q = np.add.reduceat(counts, reference.hist_starts) / n
+    m = (p + q) / 2
+    jensen_shannon = np.sqrt(max(0.5 * (_kl_to_mixture(p, m) + _kl_to_mixture(q, m)), 0.0))
+
+    p_smooth, q_smooth = np.maximum(p, PSI_EPSILON), np.maximum(q, PSI_EPSILON)
+    psi = float(np.sum((q_smooth - p_smooth) * np.log(q_smooth / p_smooth)))
+
+    cdf = np.cumsum(counts) / n
+    kolmogorov_smirnov = max(
+        np.abs(cdf[0:-1:2] - reference.ref_lt).max(),
+        np.abs(cdf[1::2] - reference.ref_le).max()
+    )
+    return {"jensen_shannon": float(jensen_shannon), "kolmogorov_smirnov": float(kolmogorov_smirnov), "psi": psi}
+
+# Chunked drift monitor over a stream of feature rows. update() takes blocks of rows
+# (array in `features` order or a DataFrame); observe() takes one row at a time and
+# buffers it, for use on the request path. Closed chunks are returned by update() /
+# flush() and the last `history` of them are kept in .results. Thread-safe.
+class StreamingDriftDetector:
+    def __init__(self, references: dict, chunk_period: str = None, chunk_size: int = None,
+                 thresholds: dict = None, history: int = 64, buffer_rows: int = 1024):
+        if chunk_period is not None and chunk_size is not None:
+            raise ValueError("Give at most one of chunk_period and chunk_size")
+        if chunk_period is not None and chunk_period not in CHUNK_PERIODS:
+            raise ValueError(f"Unknown chunk_period: {chunk_period} (expected one of {CHUNK_PERIODS})")
+
+        self.references = references
+        self.features = list(references)
+        self.chunk_period = chunk_period
+        self.chunk_size = chunk_size
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.results = deque(maxlen=history)
+        self._refs = [references[f] for f in self.features]
+        self._lock = threading.Lock()
+
+        # Open chunk: its key and the slot counts of all features in one flat array
+        # (feature j at _offsets[j]), allocated once and zeroed on close
+        self._key = None
+        self._rows = 0
+        self._rows_seen = 0
+        self._offsets = np.cumsum([0] + [ref.n_slots for ref in self._refs])
+        self._counts = np.zeros(self._offsets[-1], dtype=np.int64)
+
+        # Rows from observe() waiting to be counted
+        self._buffer = np.empty((buffer_rows, len(self.features)), dtype=np.float64)
+        self._buffer_keys = np.empty(buffer_rows, dtype=np.int64)
+        self._buffered = 0
+        self._today = (None, None)  # (UTC day number, its chunk key) for observe() without a timestamp
+
+    @classmethod
+    def fit(cls, reference_df, features: list = None, n_quantiles: int = 1000, **kwargs):
+        features = features or DRIFT_FEATURES
+        references = {
+            f: FeatureReference.fit(reference_df[f].to_numpy(dtype=np.float64), n_quantiles) for f in features
+        }
+        return cls(references, **kwargs)
+
+    # Detector settings from config.yaml's drift section
+    @classmethod
+    def from_config(cls, reference_df, config: dict = None):
+        if config is None:
+            from src.utils.helpers import load_yaml_config
+            config = load_yaml_config()
+        settings = config.get("drift", {})
+        return cls.fit(
+            reference_df,
+            n_quantiles=settings.get("n_quantiles", 1000),
+            chunk_period=settings.get("chunk_period"),
+            chunk_size=settings.get("chunk_size"),
+            thresholds=settings.get("thresholds")
+        )
+
+    # Reference summaries as .npz, so a serving process can load them without the data
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays = {"features": np.array(self.features)}
+        for i, ref in enumerate(self._refs):
+            for name in ("edges", "ref_proba", "points", "ref_lt", "ref_le"):
+                arrays[f"{i}_{name}"] = getattr(ref, name)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str, **kwargs):
+        with np.load(path) as data:
+            references = {
+                str(f): FeatureReference(*(data[f"{i}_{name}"] for name in ("edges", "ref_proba", "points", "ref_lt", "ref_le")))
+                for i, f in enumerate(data["features"])
+            }
+        return cls(references, **kwargs)
+
+    def _as_matrix(self, X) -> np.ndarray:
+        if hasattr(X, "columns"):
+            return X[self.features].to_numpy(dtype=np.float64)
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(self.features):
+            raise ValueError(f"Expected rows of {len(self.features)} features ({self.features}), got shape {X.shape}")
+        return X
+
+    # Chunk key per row: period number since the epoch, row-count block, or one open chunk
+    def _chunk_keys(self, n: int, timestamps) -> np.ndarray:
+        if self.chunk_size is not None:
+            return (self._rows_seen + np.arange(n)) // self.chunk_size
+        if self.chunk_period is None:
+            return np.zeros(n, dtype=np.int64)
+        if timestamps is None:
+            timestamps = np.full(n, np.datetime64("now"))
+        stamps = np.asarray(timestamps, dtype="datetime64[ns]")
+        return stamps.astype(f"datetime64[{self.chunk_period}]").astype(np.int64)
+
+    # Scalar version of _chunk_keys for observe(). Every period is a whole number of days,
+    # so "now" only needs converting once per UTC day.
+    def _chunk_key(self, timestamp) -> int:
+        if self.chunk_size is not None:
+            return self._rows_seen // self.chunk_size
+        if self.chunk_period is None:
+            return 0
+        if timestamp is None:
+            day = int(time.time() // 86400)
+            if day != self._today[0]:
+                key = np.datetime64(day, "D").astype(f"datetime64[{self.chunk_period}]").astype(np.int64)
+                self._today = (day, int(key))
+            return self._today[1]
+        return int(np.datetime64(timestamp, "ns").astype(f"datetime64[{self.chunk_period}]").astype(np.int64))
+
+    def _chunk_label(self, key) -> str:
+        if self.chunk_size is not None:
+            return f"[{key * self.chunk_size}:{(key + 1) * self.chunk_size - 1}]"
+        if self.chunk_period is None:
+            return "all"
+        return str(np.datetime64(int(key), self.chunk_period))
+
+    def _accumulate(self, X: np.ndarray):
+        self._rows += len(X)
+        columns = np.ascontiguousarray(X.T)
+        slots = np.concatenate([ref.slots(columns[j]) + self._offsets[j] for j, ref in enumerate(self._refs)])
+        self._counts += np.bincount(slots, minlength=len(self._counts))
+
+    def _result(self) -> dict:
+        features = {}
+        for j, (f, ref) in enumerate(zip(self.features, self._refs)):
+            counts = self._counts[self._offsets[j]:self._offsets[j + 1]]
+            stats = drift_statistics(ref, counts)
+            stats["missing"] = int(counts[-1])
+            stats["alert"] = any(stats[name] > self.thresholds[name] for name in STATISTICS)
+            features[f] = stats
+        return {"chunk": self._chunk_label(self._key), "rows": int(self._rows), "features": features}
+
+    def _close(self) -> dict:
+        result = self._result()
+        self._rows = 0
+        self._counts[:] = 0
+        self.results.append(result)
+        return result
+
+    # Count rows into their chunks, closing the open chunk whenever a later one starts
+    def _ingest(self, X: np.ndarray, keys: np.ndarray) -> list:
+        if len(X) == 0:
+            return []
+        if self._key is not None:
+            keys = np.maximum(keys, self._key)
+        keys = np.maximum.accumulate(keys)
+
+        closed = []
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(keys)) + 1, [len(X)]])
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if self._key is not None and keys[start] != self._key:
+                closed.append(self._close())
+            self._key = keys[start]
+            self._accumulate(X[start:end])
+        return closed
+
+    def _drain(self) -> list:
+        n, self._buffered = self._buffered, 0
+        return self._ingest(self._buffer[:n], self._buffer_keys[:n])
+
+    # Add a block of rows; returns the chunks it closed
+    def update(self, X, timestamps=None) -> list:
+        X = self._as_matrix(X)
+        with self._lock:
+            closed = self._drain()
+            keys = self._chunk_keys(len(X), timestamps)
+            self._rows_seen += len(X)
+            return closed + self._ingest(X, keys)
+
+    # Add one row (features in self.features order); timestamp defaults to now (UTC)
+    def observe(self, row, timestamp=None):
+        with self._lock:
+            i = self._buffered
+            self._buffer[i] = row
+            self._buffer_keys[i] = self._chunk_key(timestamp)
+            self._rows_seen += 1
+            self._buffered = i + 1
+            if self._buffered == len(self._buffer):
+                self._drain()
+
+    # Statistics of the open chunk so far (None before the first row)
+    def current(self):
+        with self._lock:
+            self._drain()
+            return self._result() if self._key is not None else None
+
+    # Close the open chunk (end of a batch run); returns its result, or None if empty
+    def flush(self):
+        with self._lock:
+            self._drain()
+            if self._key is None:
+                return None
+            result = self._close()
+            self._key = None
+            return result
+
+# Long-format frame of chunk results: one row per (chunk, feature)
+def results_frame(results: list):
+    import pandas as pd
+
+    return pd.DataFrame([
+        {"chunk": r["chunk"], "rows": r["rows"], "feature": f, **stats}
+        for r in results for f, stats in r["features"].items()
+    ])
+
+if __name__ == "__main__":
+    from src.pipelines.forecasting_pipeline import forecast_stages
+    from src.monitoring.post_deploy_monitor import simulate_post_deploy_data
+    from src.data.storage import write_frame
+    from src.utils.helpers import load_yaml_config
+
+    config = load_yaml_config()
+
+    # Reference = model output on historical data; live stream = simulated post-deploy rows
+    _, predicted_df = forecast_stages().value
+    post_df = simulate_post_deploy_data(predicted_df).sort_values("date", kind="stable")
+
+    detector = StreamingDriftDetector.from_config(predicted_df, config)
+    detector.save(config["paths"]["drift_reference"])
+
+    results = []
+    for start in range(0, len(post_df), 10_000):
+        block = post_df.iloc[start:start + 10_000]
+        results.extend(detector.update(block, timestamps=block["date"]))
+    final = detector.flush()
+    if final is not None:
+        results.append(final)
+
+    output_path = config["paths"]["streaming_drift_output"]
+    write_frame(results_frame(results), output_path)
+    alerts = sum(stats["alert"] for r in results for stats in r["features"].values())
+    print(f"✅ Streaming drift: {len(results)} chunks, {alerts} feature alerts. Results saved to {output_path}")
@@ -1,30 +1,32 @@
 import pandas as pd
-from src.data.load_data import load_data_pandas
+from src.data.load_data import raw_data_paths
 from src.data.preprocess import preprocess_pandas
+from src.data.storage import read_frame
 from src.features.build_features import build_features
-from src.forecasting.forecaster import train_forecast_model
-import os
+from src.forecasting.forecaster import train_forecast_model, save_predictions
+from src.utils.helpers import load_yaml_config
+from src.utils.stage_cache import StageCache
 
-# Orchestrate end-to-end forecasting pipeline
-def run_forecasting_pipeline():
-    # Step 1: Load raw data
-    _, sales_df = load_data_pandas()
-
-    # Step 2: Clean + validate
-    cleaned_df = preprocess_pandas(sales_df)
+# Load → preprocess → features → train as cached stages (see utils/stage_cache.py).
+# Returns the lazy train stage; .value is (model, forecast_df), .item(0) / .item(1)
+# feed either part into a downstream stage.
+def forecast_stages(cache: StageCache = None):
+    cache = cache or StageCache.from_config()
+    sales_df = cache.stage("load_sales", read_frame, raw_data_paths()[1])
+    cleaned_df = cache.stage("preprocess", preprocess_pandas, sales_df)
+    featured_df = cache.stage("build_features", build_features, cleaned_df)
+    return cache.stage("train_forecast_model", train_forecast_model, featured_df)
 
-    # Step 3: Engineer features
-    featured_df = build_features(cleaned_df)
-
-    # Step 4: Train model and forecast
-    model, forecast_df = train_forecast_model(featured_df)
+# Orchestrate end-to-end forecasting pipeline
+def run_forecasting_pipeline(cache: StageCache = None):
+    # Steps 1-4: Load raw data, clean + validate, engineer features, train and forecast
+    model, forecast_df = forecast_stages(cache).value
 
     # Step 5: Save predictions
-    output_path = "data/processed/predicted_demand.csv"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    forecast_df.to_csv(output_path, index=False)
+    output_path = load_yaml_config()["paths"]["predictions"]
+    save_predictions(forecast_df, output_path)
 
     print("✅ Forecasting pipeline complete. Output saved to:", output_path)
 
 if __name__ == "__main__":
-    run_forecasting_pipeline()
\ No newline at end of file
+    run_forecasting_pipeline()
@@ -0,0 +1,151 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import pandas as pd
+import pyarrow as pa
+
+from src.data.storage import read_frame, write_frame
+from src.data.load_data import raw_data_paths
+from src.pipelines.streaming_pipeline import sku_partition, score_partition
+from src.utils.helpers import load_yaml_config
+
+# Parallel variant of the scoring pipeline. Everything after training (preprocess →
+# features → predict → price) is independent across sku_id, so the raw frame is
+# sharded by hash(sku_id) and each shard is scored in a worker process.
+# Shards travel as Arrow IPC streams in shared memory blocks: the parent writes a
+# shard once, the worker maps it instead of unpickling a DataFrame, and results come
+# back the same way. Workers are spawned (not forked) so LightGBM's OpenMP runtime is
+# never inherited mid-use, and each worker loads the model once with a bounded
+# number of prediction threads.
+
+# Serialize a frame (with its index) into a new shared memory block; returns (name, size)
+def frame_to_shared_memory(df: pd.DataFrame):
+    table = pa.Table.from_pandas(df, preserve_index=True)
+
+    mock = pa.MockOutputStream()
+    with pa.ipc.new_stream(mock, table.schema) as writer:
+        writer.write_table(table)
+    size = mock.size()
+
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    sink = pa.FixedSizeBufferWriter(pa.py_buffer(shm.buf))
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    sink.close()
+    del sink, writer  # drop every view of shm.buf, or close() refuses
+    shm.close()
+    return shm.name, size
+
+# Read a frame back from a shared memory block; unlink=True frees the block afterwards
+def frame_from_shared_memory(name: str, size: int, unlink: bool = False) -> pd.DataFrame:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        source = pa.py_buffer(shm.buf)[:size]
+        df = pa.ipc.open_stream(source).read_all().to_pandas()
+        del source
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+    return df
+
+# Close and unlink a shared memory block by name; a block already freed is skipped
+def free_shared_memory(name: str):
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+# Booster wrapper that pins predict() to a fixed thread count, so N workers don't each
+# start one OpenMP thread per core
+class ThreadBoundModel:
+    def __init__(self, booster, num_threads: int):
+        self.booster = booster
+        self.num_threads = num_threads
+
+    def predict(self, X, **kwargs):
+        return self.booster.predict(X, num_threads=self.num_threads, **kwargs)
+
+_worker_model = None
+
+def _init_worker(model_path: str, threads_per_worker: int):
+    import lightgbm as lgb
+
+    global _worker_model
+    _worker_model = ThreadBoundModel(lgb.Booster(model_file=model_path), threads_per_worker)
+
+def _score_shard(name: str, size: int, mode: str, engine: str):
+    sales_df = frame_from_shared_memory(name, size)
+    result_df = score_partition(sales_df, _worker_model, mode=mode, engine=engine)
+    return frame_to_shared_memory(result_df)
+
+# Worker count and threads from config.yaml `parallel` (n_workers: null → all cores)
+def parallel_settings(n_workers: int = None, threads_per_worker: int = None):
+    settings = load_yaml_config().get("parallel", {})
+    n_workers = n_workers or settings.get("n_workers") or os.cpu_count()
+    threads_per_worker = threads_per_worker or settings.get("threads_per_worker", 1)
+    return n_workers, threads_per_worker
+
+# Score a raw sales frame across a process pool; same rows and order as
+# score_partition(sales_df, model) in one process
+def run_parallel(
+    sales_df: pd.DataFrame,
+    model_path: str = "models/lightgbm_model.txt",
+    mode: str = "rules",
+    n_workers: int = None,
+    n_shards: int = None,
+    threads_per_worker: int = None,
+    engine: str = "pandas",
+) -> pd.DataFrame:
+    n_workers, threads_per_worker = parallel_settings(n_workers, threads_per_worker)
+    n_shards = n_shards or n_workers * 2  # a few shards per worker evens out the tail
+
+    shard_ids = sku_partition(sales_df["sku_id"], n_shards)
+    inputs = [frame_to_shared_memory(shard) for _, shard in sales_df.groupby(shard_ids, sort=False)]
+
+    futures = []
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_path, threads_per_worker),
+        ) as pool:
+            futures = [pool.submit(_score_shard, name, size, mode, engine) for name, size in inputs]
+            results = [frame_from_shared_memory(*future.result()) for future in futures]
+    finally:
+        # The pool has drained here, so every shard that succeeded has a result block,
+        # read or not (one failed shard must not leak the others' blocks)
+        names = [name for name, _ in inputs]
+        names += [f.result()[0] for f in futures if f.done() and not f.cancelled() and f.exception() is None]
+        for name in names:
+            free_shared_memory(name)
+
+    # Shards interleave SKUs; restore the single-process (sku_id, date) order
+    return pd.concat(results).sort_values(["sku_id", "date"], kind="stable")
+
+# Load raw sales, score them in parallel and save (CSV or Parquet by extension)
+def run_parallel_pipeline(model_path: str = "models/lightgbm_model.txt", mode: str = "rules",
+                          input_path: str = None, output_path: str = None, n_workers: int = None):
+    input_path = input_path or raw_data_paths()[1]
+    output_path = output_path or load_yaml_config()["paths"]["optimized_prices"]
+
+    optimized_df = run_parallel(read_frame(input_path), model_path, mode=mode, n_workers=n_workers)
+    write_frame(optimized_df, output_path)
+    print(f"✅ Parallel pipeline complete: {len(optimized_df)} rows. Output saved to: {output_path}")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Process-pool forecast + pricing run")
+    parser.add_argument("--model", default="models/lightgbm_model.txt")
+    parser.add_argument("--mode", default="rules", choices=["rules", "grid"])
+    parser.add_argument("--input", default=None, help="raw sales file (default: config paths.raw_data)")
+    parser.add_argument("--output", default=None, help="output file (default: config paths.optimized_prices)")
+    parser.add_argument("--workers", type=int, default=None, help="default: config parallel.n_workers")
+    args = parser.parse_args()
+
+    run_parallel_pipeline(args.model, args.mode, args.input, args.output, args.workers)
@@ -1,31 +1,30 @@
 import pandas as pd
 from src.pricing.pricing_engine import optimize_prices, save_optimized_prices
-from src.forecasting.forecaster import train_forecast_model
-from src.features.build_features import build_features
-from src.data.load_data import load_data_pandas
-from src.data.preprocess import preprocess_pandas
+from src.pipelines.forecasting_pipeline import forecast_stages
+from src.utils.helpers import load_yaml_config
+from src.utils.stage_cache import StageCache
 import os
 
-# End-to-end pricing pipeline
-def run_pricing_pipeline():
-    # Step 1: Load raw sales data
-    _, sales_df = load_data_pandas()
+# End-to-end pricing pipeline (mode: "rules" or "grid", see optimize_prices).
+# Every step is a cached stage, so a rerun after editing only the pricing code
+# recomputes just the last one.
+def run_pricing_pipeline(mode: str = "rules", cache: StageCache = None):
+    cache = cache or StageCache.from_config()
 
-    # Step 2: Preprocess
-    cleaned_df = preprocess_pandas(sales_df)
-
-    # Step 3: Feature engineering
-    featured_df = build_features(cleaned_df)
-
-    # Step 4: Forecast demand
-    _, forecast_df = train_forecast_model(featured_df)
+    # Steps 1-4: Load raw sales data, preprocess, feature engineering, forecast demand
+    trained = forecast_stages(cache)
 
     # Step 5: Optimize prices
-    optimized_df = optimize_prices(forecast_df)
+    optimized = cache.stage(
+        "optimize_prices", optimize_prices, trained.item(1),
+        mode=mode, model=trained.item(0) if mode == "grid" else None,
+        code=("src.pricing.pricing_rules",),
+    )
 
     # Step 6: Save
-    save_optimized_prices(optimized_df)
-    print("✅ Pricing pipeline complete. Output saved to data/processed/optimized_prices.csv")
+    save_optimized_prices(optimized.value)
+    print("✅ Pricing pipeline complete. Output saved to:", load_yaml_config()["paths"]["optimized_prices"])
 
 if __name__ == "__main__":
-    run_pricing_pipeline()
\ No newline at end of file
+    import sys
+    run_pricing_pipeline(mode=sys.argv[1] if len(sys.argv) > 1 else "rules")
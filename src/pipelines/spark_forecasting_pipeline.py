@@ -0,0 +1,50 @@
+from pyspark.sql.types import StructType, StructField, DoubleType
+
+from src.data.load_data import start_spark, load_data_spark
+from src.data.preprocess import preprocess_spark
+from src.features.spark_features import build_features_spark, add_external_signals_spark
+from src.forecasting.forecaster import FEATURE_COLS
+from src.utils.helpers import load_yaml_config
+
+# Spark variant of the forecasting pipeline: featurize with window functions, write
+# partitioned Parquet, and score every partition with the trained LightGBM model.
+def run_spark_forecasting_pipeline(model_path: str = "models/lightgbm_model.txt", partition_col: str = "month"):
+    paths = load_yaml_config()["paths"]
+    spark = start_spark()
+
+    # Step 1: Load raw data
+    _, sales_df = load_data_spark(spark)
+
+    # Step 2: Clean + validate
+    cleaned_df = preprocess_spark(sales_df)
+
+    # Step 3: Engineer features (same columns as build_features + add_external_signals)
+    featured_df = add_external_signals_spark(build_features_spark(cleaned_df))
+    featured_df.write.mode("overwrite").partitionBy(partition_col).parquet(paths["spark_features"])
+
+    # Step 4: Forecast with the saved booster, one pandas batch at a time on the executors
+    featured_df = spark.read.parquet(paths["spark_features"])
+    scoring_df = featured_df.dropna(subset=["lag_1", "rolling_mean_7", "elasticity"])
+
+    with open(model_path, "r") as f:
+        model_str = spark.sparkContext.broadcast(f.read())
+
+    def predict_batches(batches):
+        import lightgbm as lgb
+
+        booster = lgb.Booster(model_str=model_str.value)
+        for pdf in batches:
+            pdf["predicted_units_sold"] = booster.predict(pdf[FEATURE_COLS].to_numpy(dtype="float64"))
+            yield pdf
+
+    # StructType.add mutates in place, so extend a copy of the input schema
+    output_schema = StructType(scoring_df.schema.fields + [StructField("predicted_units_sold", DoubleType())])
+    forecast_df = scoring_df.mapInPandas(predict_batches, schema=output_schema)
+
+    # Step 5: Save predictions
+    forecast_df.write.mode("overwrite").partitionBy(partition_col).parquet(paths["spark_predictions"])
+
+    print("✅ Spark forecasting pipeline complete. Output saved to:", paths["spark_predictions"])
+
+if __name__ == "__main__":
+    run_spark_forecasting_pipeline()
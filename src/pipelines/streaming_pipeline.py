@@ -0,0 +1,113 @@
+import os
+import pickle
+import tempfile
+import pandas as pd
+
+from src.data.load_data import raw_data_paths
+from src.data.preprocess import preprocess_pandas
+from src.data.storage import iter_frame, FrameWriter
+from src.features.build_features import build_features
+from src.forecasting.forecaster import FEATURE_COLS
+from src.pricing.pricing_engine import optimize_prices
+from src.utils.helpers import load_yaml_config
+
+# Streaming mode for the forecasting/pricing pipelines. Every feature is computed
+# within a sku_id, so the raw data can be processed one group of SKUs at a time:
+#   1. read the raw file in row chunks and spill each chunk's rows to one of
+#      n_partitions files by hash(sku_id) (a SKU always lands in the same partition)
+#   2. load one partition, run preprocess → features → predict → price, append the
+#      result to the output file and drop it before loading the next one
+# Peak memory is one raw chunk during step 1 and one partition (~rows / n_partitions)
+# during step 2, instead of several copies of the whole dataset.
+
+# Partition id per row, stable across chunks and file formats (hash of the sku_id value)
+def sku_partition(sku_ids: pd.Series, n_partitions: int):
+    return pd.util.hash_pandas_object(sku_ids.astype(str), index=False).to_numpy() % n_partitions
+
+# Step 1: split the raw file into per-partition spill files; returns the non-empty ones
+def partition_by_sku(path: str, spill_dir: str, n_partitions: int = 16, chunk_rows: int = 500_000) -> list:
+    spill_paths = [os.path.join(spill_dir, f"part-{i:04d}.pkl") for i in range(n_partitions)]
+    used = set()
+    files = [open(p, "wb") for p in spill_paths]
+    try:
+        for chunk in iter_frame(path, chunk_rows=chunk_rows):
+            for part, part_df in chunk.groupby(sku_partition(chunk["sku_id"], n_partitions), sort=False):
+                pickle.dump(part_df, files[part], protocol=pickle.HIGHEST_PROTOCOL)
+                used.add(part)
+    finally:
+        for f in files:
+            f.close()
+    return [spill_paths[i] for i in sorted(used)]
+
+# All spilled chunks of one partition, in original row order
+def read_partition(spill_path: str) -> pd.DataFrame:
+    chunks = []
+    with open(spill_path, "rb") as f:
+        while True:
+            try:
+                chunks.append(pickle.load(f))
+            except EOFError:
+                break
+    return pd.concat(chunks)
+
+# Step 2 for one partition: the in-memory pipeline steps with an already trained model
+def score_partition(sales_df: pd.DataFrame, model, mode: str = "rules", engine: str = "pandas") -> pd.DataFrame:
+    featured_df = build_features(preprocess_pandas(sales_df), engine=engine)
+    forecast_df = featured_df.dropna(subset=["lag_1", "rolling_mean_7", "elasticity"])
+    forecast_df = forecast_df.assign(predicted_units_sold=model.predict(forecast_df[FEATURE_COLS]))
+    return optimize_prices(forecast_df, mode=mode, model=model)
+
+# Score the full raw dataset partition by partition and append results to output_path
+# (CSV or Parquet by extension). Returns the number of rows written.
+def run_streaming_pipeline(
+    model_path: str = "models/lightgbm_model.txt",
+    mode: str = "rules",
+    input_path: str = None,
+    output_path: str = None,
+    n_partitions: int = None,
+    chunk_rows: int = None,
+    engine: str = "pandas",
+) -> int:
+    import lightgbm as lgb
+
+    config = load_yaml_config()
+    settings = config.get("streaming", {})
+    input_path = input_path or raw_data_paths()[1]
+    output_path = output_path or config["paths"]["streaming_output"]
+    n_partitions = n_partitions or settings.get("n_partitions", 16)
+    chunk_rows = chunk_rows or settings.get("chunk_rows", 500_000)
+
+    model = lgb.Booster(model_file=model_path)
+
+    with tempfile.TemporaryDirectory(prefix="pricing_spill_") as spill_dir:
+        spill_paths = partition_by_sku(input_path, spill_dir, n_partitions, chunk_rows)
+
+        largest = 0
+        with FrameWriter(output_path) as writer:
+            for spill_path in spill_paths:
+                sales_df = read_partition(spill_path)
+                largest = max(largest, len(sales_df))
+                result_df = score_partition(sales_df, model, mode=mode, engine=engine)
+                if len(result_df):
+                    writer.write(result_df)
+                os.remove(spill_path)
+
+    print(f"✅ Streaming pipeline complete: {writer.rows} rows from {len(spill_paths)} partitions "
+          f"(largest {largest} raw rows). Output saved to: {output_path}")
+    return writer.rows
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Chunked forecast + pricing run with bounded memory")
+    parser.add_argument("--model", default="models/lightgbm_model.txt")
+    parser.add_argument("--mode", default="rules", choices=["rules", "grid"])
+    parser.add_argument("--input", default=None, help="raw sales file (default: config paths.raw_data)")
+    parser.add_argument("--output", default=None, help="output file (default: config paths.streaming_output)")
+    parser.add_argument("--partitions", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=None)
+    parser.add_argument("--engine", default="pandas", choices=["pandas", "numpy"])
+    args = parser.parse_args()
+
+    run_streaming_pipeline(args.model, args.mode, args.input, args.output,
+                           args.partitions, args.chunk_rows, args.engine)
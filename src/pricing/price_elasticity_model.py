@@ -1,49 +1,104 @@
 import pandas as pd
-from sklearn.linear_model import Ridge
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import r2_score, mean_squared_error
 import numpy as np
+from typing import TYPE_CHECKING
 
-# Train a segment-level elasticity model using Ridge regression
-def train_elasticity_model(df: pd.DataFrame, segment_col: str = "category") -> dict:
-    df = df.dropna(subset=[
-        "price", "promo_discount", "competitor_price", "temperature",
-        "units_sold", "price_margin", "price_vs_competitor"
-    ])
+if TYPE_CHECKING:  # annotation only; sklearn is imported lazily where models are fit
+    from sklearn.linear_model import Ridge
 
-    feature_cols = [
-        "price", "promo_discount", "competitor_price", "temperature",
-        "price_margin", "price_vs_competitor"
-    ]
-    target_col = "units_sold"
+# Ridge inputs and target (column order matters for the stacked coefficients)
+ELASTICITY_FEATURES = [
+    "price", "promo_discount", "competitor_price", "temperature",
+    "price_margin", "price_vs_competitor"
+]
+ELASTICITY_TARGET = "units_sold"
 
-    segment_models = {}
+# Fit and score one segment's Ridge on its rows (kept in original order for the split)
+def fit_segment_model(X: np.ndarray, y: np.ndarray, alpha: float = 1.0):
+    from sklearn.linear_model import Ridge
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import r2_score, mean_squared_error
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
+    model = Ridge(alpha=alpha)
+    model.fit(X_train, y_train)
 
-    for segment, group in df.groupby(segment_col):
-        if len(group) < 30:
-            continue  # skip small groups
+    preds = model.predict(X_test)
+    r2 = r2_score(y_test, preds)
+    rmse = np.sqrt(mean_squared_error(y_test, preds))
+    return model, r2, rmse
 
-        X = group[feature_cols]
-        y = group[target_col]
+# Train a segment-level elasticity model using Ridge regression. segment_col can be as
+# coarse as "category" or as fine as "sku_id" (thousands of models); segments are fitted
+# in parallel with joblib when n_jobs != 1.
+def train_elasticity_model(df: pd.DataFrame, segment_col: str = "category", n_jobs: int = 1,
+                           min_rows: int = 30, alpha: float = 1.0) -> dict:
+    from joblib import Parallel, delayed
 
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
-        model = Ridge(alpha=1.0)
-        model.fit(X_train, y_train)
+    df = df.dropna(subset=ELASTICITY_FEATURES + [ELASTICITY_TARGET])
 
-        preds = model.predict(X_test)
-        r2 = r2_score(y_test, preds)
-        rmse = np.sqrt(mean_squared_error(y_test, preds))
+    # One stable sort instead of a groupby copy per segment: segment i is rows
+    # starts[i]:ends[i] of the sorted arrays, in their original order
+    codes, segments = pd.factorize(df[segment_col], sort=True)
+    order = np.argsort(codes, kind="stable")
+    order = order[codes[order] >= 0]  # drop rows without a segment
+    X = df[ELASTICITY_FEATURES].to_numpy(dtype=np.float64)[order]
+    y = df[ELASTICITY_TARGET].to_numpy(dtype=np.float64)[order]
+    counts = np.bincount(codes[order], minlength=len(segments))
+    ends = np.cumsum(counts)
+    starts = ends - counts
 
-        print(f"📦 Segment '{segment}' → R²: {r2:.2f}, RMSE: {rmse:.1f}")
-        segment_models[segment] = model
+    fit = [i for i in range(len(segments)) if counts[i] >= min_rows]  # skip small groups
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(fit_segment_model)(X[starts[i]:ends[i]], y[starts[i]:ends[i]], alpha) for i in fit
+    )
+
+    segment_models = {}
+    for i, (model, r2, rmse) in zip(fit, results):
+        if len(fit) <= 20:
+            print(f"📦 Segment '{segments[i]}' → R²: {r2:.2f}, RMSE: {rmse:.1f}")
+        segment_models[segments[i]] = model
+    if len(fit) > 20:
+        print(f"📦 Trained {len(fit)} '{segment_col}' segment models ({len(segments) - len(fit)} skipped, < {min_rows} rows)")
 
     return segment_models
 
 # Predict demand for a single row based on learned segment elasticity
-def predict_demand_with_elasticity(row: pd.Series, model: Ridge, feature_cols: list) -> float:
+def predict_demand_with_elasticity(row: pd.Series, model: "Ridge", feature_cols: list) -> float:
     input_data = row[feature_cols].values.reshape(1, -1)
     return model.predict(input_data)[0]
 
+# All segment Ridge models stacked into one coefficient matrix, so a batch of rows
+# from any mix of segments is scored with a gather + row-wise dot product instead of
+# one sklearn call per row (or per segment)
+class StackedSegmentModel:
+    def __init__(self, segments, coef: np.ndarray, intercept: np.ndarray):
+        self.segments = pd.Index(segments)
+        self.coef = coef
+        self.intercept = intercept
+
+    @classmethod
+    def from_models(cls, segment_models: dict):
+        segments = list(segment_models)
+        coef = np.array([segment_models[s].coef_ for s in segments], dtype=np.float64)
+        intercept = np.array([segment_models[s].intercept_ for s in segments], dtype=np.float64)
+        return cls(segments, coef.reshape(len(segments), -1), intercept)
+
+    # X rows in ELASTICITY_FEATURES order; rows of unknown segments get NaN
+    def predict(self, X: np.ndarray, segments) -> np.ndarray:
+        idx = self.segments.get_indexer(segments)
+        known = idx >= 0
+        preds = np.full(len(idx), np.nan)
+        rows = idx[known]
+        preds[known] = np.einsum("ij,ij->i", X[known], self.coef[rows]) + self.intercept[rows]
+        return preds
+
+# Batch demand prediction for a frame (e.g. a full day of SKUs) from trained segment models
+def predict_demand_batch(df: pd.DataFrame, segment_models, segment_col: str = "category") -> np.ndarray:
+    if not isinstance(segment_models, StackedSegmentModel):
+        segment_models = StackedSegmentModel.from_models(segment_models)
+    X = df[ELASTICITY_FEATURES].to_numpy(dtype=np.float64)
+    return segment_models.predict(X, df[segment_col].to_numpy())
+
 if __name__ == "__main__":
     from src.data.load_data import load_data_pandas
     from src.data.preprocess import preprocess_pandas
@@ -53,4 +108,6 @@ if __name__ == "__main__":
     cleaned_df = preprocess_pandas(sales_df)
     featured_df = build_features(cleaned_df)
 
-    models = train_elasticity_model(featured_df)
\ No newline at end of file
+    import sys
+    segment_col = sys.argv[1] if len(sys.argv) > 1 else "category"
+    models = train_elasticity_model(featured_df, segment_col=segment_col, n_jobs=-1)
\ No newline at end of file
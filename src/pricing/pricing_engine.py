@@ -1,40 +1,103 @@
 import pandas as pd
 import numpy as np
-import os
 
-# Rule-based pricing optimization logic
-def optimize_prices(df: pd.DataFrame) -> pd.DataFrame:
+from src.data.storage import write_frame
+from src.forecasting.forecaster import FEATURE_COLS
+from src.models.compiled_model import compile_model
+from src.pricing.pricing_rules import pricing_rule_kernel
+from src.utils.helpers import load_yaml_config
+
+# Pricing optimization: "rules" (demand-based ±5% nudge) or "grid" (profit-maximizing
+# search over candidate prices, needs the trained demand model). `backend` selects how
+# the grid's candidate rows are scored: "lightgbm" (Booster.predict) or the compiled
+# "numpy" / "numba" tree evaluators from src/models/compiled_model.py.
+def optimize_prices(df: pd.DataFrame, mode: str = "rules", model=None, n_candidates: int = 50,
+                    backend: str = "lightgbm") -> pd.DataFrame:
+    if mode == "grid":
+        if model is None:
+            raise ValueError("mode='grid' needs the trained demand model")
+        return optimize_prices_grid(df, compile_model(model, backend), n_candidates=n_candidates)
+    if mode != "rules":
+        raise ValueError(f"Unknown pricing mode: {mode}")
+
     df = df.copy()
 
-    # Strategy:
+    # Strategy (see pricing_rules.pricing_rule_kernel):
     # - If demand is high → increase price (but cap at 10% above competitor)
     # - If demand is low → decrease price (but floor at 10% above cost)
     # - Else → keep price stable
+    # All rules run as whole-column NumPy operations, no per-row Python.
+    adjustment, optimized_price = pricing_rule_kernel(
+        predicted_demand=df["predicted_units_sold"].to_numpy(dtype=np.float64),
+        price=df["price"].to_numpy(dtype=np.float64),
+        cost=df["cost"].to_numpy(dtype=np.float64),
+        competitor_price=df["competitor_price"].to_numpy(dtype=np.float64),
+        rolling_mean_7=df["rolling_mean_7"].to_numpy(dtype=np.float64)
+    )
+
+    df["adjustment"] = adjustment
+    df["optimized_price"] = optimized_price
 
-    df["adjustment"] = 0.0
-    high_demand = df["predicted_units_sold"] > df["rolling_mean_7"] * 1.1
-    low_demand = df["predicted_units_sold"] < df["rolling_mean_7"] * 0.9
+    return df
 
-    df.loc[high_demand, "adjustment"] = 0.05  # +5% price bump
-    df.loc[low_demand, "adjustment"] = -0.05  # -5% price cut
+# Profit-maximizing optimizer: for every row (SKU-day) score a grid of candidate prices
+# between cost * 1.1 and competitor_price * 1.1 with the demand model and keep the
+# price with the highest expected profit = predicted units * (price - cost).
+# Candidate feature rows are built with NumPy broadcasting and scored in one
+# predict call per chunk; chunk_size bounds the number of candidate rows in memory.
+def optimize_prices_grid(df: pd.DataFrame, model, n_candidates: int = 50, chunk_size: int = 1_000_000) -> pd.DataFrame:
+    df = df.copy()
 
-    # Apply new price
-    df["optimized_price"] = df["price"] * (1 + df["adjustment"])
+    X = df[FEATURE_COLS].to_numpy(dtype=np.float64)
+    cost = df["cost"].to_numpy(dtype=np.float64)
+    competitor_price = df["competitor_price"].to_numpy(dtype=np.float64)
 
-    # Boundaries: not lower than cost * 1.1, not more than competitor * 1.1
-    df["optimized_price"] = df[["optimized_price", "cost"]].apply(
-        lambda x: max(x["optimized_price"], x["cost"] * 1.1), axis=1
-    )
-    df["optimized_price"] = df[["optimized_price", "competitor_price"]].apply(
-        lambda x: min(x["optimized_price"], x["competitor_price"] * 1.1), axis=1
-    )
+    # Same guardrails as the rule engine; the competitor cap wins if the bounds cross
+    upper = competitor_price * 1.1
+    lower = np.minimum(cost * 1.1, upper)
+    steps = np.linspace(0.0, 1.0, n_candidates)
+
+    price_idx = FEATURE_COLS.index("price")
+    margin_idx = FEATURE_COLS.index("price_margin")
+    ratio_idx = FEATURE_COLS.index("price_vs_competitor")
+
+    n_rows = len(df)
+    best_price = np.empty(n_rows)
+    best_units = np.empty(n_rows)
+    best_profit = np.empty(n_rows)
+    rows_per_chunk = max(1, chunk_size // n_candidates)
+
+    for start in range(0, n_rows, rows_per_chunk):
+        chunk = slice(start, min(start + rows_per_chunk, n_rows))
+        m = chunk.stop - chunk.start
+
+        # (m, n_candidates) price grid and the matching (m * n_candidates, n_features) matrix
+        candidates = lower[chunk, None] + (upper[chunk] - lower[chunk])[:, None] * steps
+        flat = candidates.ravel()
+        X_cand = np.repeat(X[chunk], n_candidates, axis=0)
+        X_cand[:, price_idx] = flat
+        X_cand[:, margin_idx] = flat - np.repeat(cost[chunk], n_candidates)
+        X_cand[:, ratio_idx] = flat / np.repeat(competitor_price[chunk], n_candidates)
+
+        units = np.maximum(model.predict(X_cand), 0.0).reshape(m, n_candidates)  # demand can't be negative
+        profit = units * (candidates - cost[chunk, None])
+
+        best = profit.argmax(axis=1)
+        rows = np.arange(m)
+        best_price[chunk] = candidates[rows, best]
+        best_units[chunk] = units[rows, best]
+        best_profit[chunk] = profit[rows, best]
+
+    df["optimized_price"] = best_price
+    df["adjustment"] = best_price / df["price"].to_numpy(dtype=np.float64) - 1
+    df["expected_units_sold"] = best_units
+    df["expected_profit"] = best_profit
 
     return df
 
-# Save optimized pricing outputs
-def save_optimized_prices(df: pd.DataFrame, path: str = "data/processed/optimized_prices.csv"):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    df.to_csv(path, index=False)
+# Save optimized pricing outputs (CSV or Parquet, per config.yaml paths.optimized_prices)
+def save_optimized_prices(df: pd.DataFrame, path: str = None):
+    write_frame(df, path or load_yaml_config()["paths"]["optimized_prices"])
 
 if __name__ == "__main__":
     from src.forecasting.forecaster import train_forecast_model
@@ -51,4 +114,4 @@ if __name__ == "__main__":
     # Run pricing engine
     optimized_df = optimize_prices(predicted_df)
     save_optimized_prices(optimized_df)
-    print("✅ Pricing optimization complete. Saved to data/processed/optimized_prices.csv")
\ No newline at end of file
+    print("✅ Pricing optimization complete. Saved to", load_yaml_config()["paths"]["optimized_prices"])
@@ -0,0 +1,21 @@
+import numpy as np
+
+# Vectorized rule kernel shared by the batch optimizer (pricing_engine) and the API.
+# Works on scalars or equally-shaped arrays; returns (adjustment, optimized_price).
+#
+# Strategy:
+# - If demand is high → increase price by 5%
+# - If demand is low → decrease price by 5%
+# - Else → keep price stable
+# Boundaries: not lower than cost * 1.1, not more than competitor * 1.1
+def pricing_rule_kernel(predicted_demand, price, cost, competitor_price, rolling_mean_7):
+    high_demand = predicted_demand > rolling_mean_7 * 1.1
+    low_demand = predicted_demand < rolling_mean_7 * 0.9
+
+    # low_demand takes precedence, matching the original .loc assignment order
+    adjustment = np.where(low_demand, -0.05, np.where(high_demand, 0.05, 0.0))
+
+    optimized_price = price * (1 + adjustment)
+    optimized_price = np.maximum(optimized_price, cost * 1.1)
+    optimized_price = np.minimum(optimized_price, competitor_price * 1.1)
+    return adjustment, optimized_price
@@ -0,0 +1,222 @@
+import os
+import ast
+import sys
+import json
+import time
+import pickle
+import hashlib
+import pandas as pd
+
+from src.utils.helpers import load_yaml_config
+
+# Content-addressed memoization for pipeline stages.
+# A stage's key hashes (stage name, source of the modules that implement it and of
+# every src.* module they import, its arguments). Arguments that are themselves stage results contribute their key
+# (lineage), raw file paths contribute size + mtime, DataFrames their content hash,
+# anything else its JSON / pickle bytes. Stages are lazy: asking for the last stage's
+# value only loads that stage's cached output, so a chain whose inputs and code are
+# unchanged is skipped without touching the upstream data.
+# Outputs live in cache_dir as <key>.parquet (DataFrames) or <key>.pkl (anything else);
+# hits refresh the file's mtime and the least recently used files are evicted once the
+# directory grows past max_size_mb.
+
+_SRC_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_code_hashes = {}
+
+# Source file of a src.* module or package, found on disk without importing it
+def _src_path(module_name: str):
+    base = os.path.join(_SRC_ROOT, *module_name.split("."))
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(path):
+            return path
+    return None
+
+# Source file of a module. src.* modules are located on disk; anything else (a test
+# module, a library) must already be imported.
+def module_source_path(module_name: str) -> str:
+    if module_name == "src" or module_name.startswith("src."):
+        path = _src_path(module_name)
+        if path is None:
+            raise ValueError(f"No source file for module {module_name}")
+        return path
+    path = getattr(sys.modules.get(module_name), "__file__", None)
+    if path is None or not os.path.isfile(path):
+        raise ValueError(f"No source file for module {module_name} (not imported, or built in)")
+    return path
+
+# src.* modules a source file imports, at top level or lazily inside functions.
+# `from src.x import y` counts src.x.y too when y is a module.
+def src_imports(path: str) -> set:
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names
+                         if _src_path(f"{node.module}.{alias.name}"))
+    return {name for name in names if name == "src" or name.startswith("src.")}
+
+# Hash of a module's source and of every src.* module it pulls in, transitively
+# (cached per process)
+def module_source_hash(module_name: str) -> str:
+    if module_name not in _code_hashes:
+        paths, pending = {}, [module_name]
+        while pending:
+            name = pending.pop()
+            if name not in paths:
+                paths[name] = module_source_path(name)
+                pending.extend(src_imports(paths[name]) - paths.keys())
+        h = hashlib.sha256()
+        for name in sorted(paths):
+            with open(paths[name], "rb") as f:
+                h.update(name.encode() + hashlib.sha256(f.read()).digest())
+        _code_hashes[module_name] = h.hexdigest()
+    return _code_hashes[module_name]
+
+# Stable fingerprint of one stage argument
+def fingerprint(obj) -> str:
+    if isinstance(obj, StageResult):
+        return obj.key
+    if isinstance(obj, pd.DataFrame):
+        h = hashlib.sha256(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        h.update(repr([(str(c), str(t)) for c, t in obj.dtypes.items()]).encode())
+        return "frame:" + h.hexdigest()
+    if isinstance(obj, str) and os.path.isfile(obj):
+        stat = os.stat(obj)
+        return f"file:{os.path.abspath(obj)}:{stat.st_size}:{stat.st_mtime_ns}"
+    try:
+        return "json:" + json.dumps(obj, sort_keys=True)
+    except TypeError:
+        return "pickle:" + hashlib.sha256(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+# Lazy handle on one stage's output; .value loads it from the cache or computes it
+class StageResult:
+    def __init__(self, cache, name, fn, args, kwargs, key):
+        self.cache = cache
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self._value = None
+        self._resolved = False
+
+    @property
+    def value(self):
+        if not self._resolved:
+            self._value = self.cache.resolve(self)
+            self._resolved = True
+        return self._value
+
+    # Element of a tuple-valued stage, e.g. the model from (model, forecast_df)
+    def item(self, index: int):
+        return StageItem(self, index)
+
+class StageItem(StageResult):
+    def __init__(self, parent: StageResult, index: int):
+        self.parent = parent
+        self.index = index
+        self.name = f"{parent.name}[{index}]"
+        self.key = f"{parent.key}[{index}]"
+
+    @property
+    def value(self):
+        return self.parent.value[self.index]
+
+class StageCache:
+    # File types owned by the cache (counted and evicted by evict())
+    EXTENSIONS = (".parquet", ".pkl")
+
+    def __init__(self, cache_dir: str = ".cache/stages", max_size_mb: float = 2048, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        if enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # Settings from config.yaml `cache` (dir, max_size_mb, enabled)
+    @classmethod
+    def from_config(cls):
+        settings = load_yaml_config().get("cache", {})
+        return cls(
+            cache_dir=settings.get("dir", ".cache/stages"),
+            max_size_mb=settings.get("max_size_mb", 2048),
+            enabled=settings.get("enabled", True),
+        )
+
+    # Declare a stage: fn(*args, **kwargs), where any argument may be an upstream
+    # StageResult. fn's module and the src.* modules it imports are hashed; `code` lists
+    # extra modules whose source the output depends on.
+    def stage(self, name: str, fn, *args, code=(), **kwargs) -> StageResult:
+        h = hashlib.sha256(name.encode())
+        for module_name in (fn.__module__,) + tuple(code):
+            h.update(module_source_hash(module_name).encode())
+        for arg in args:
+            h.update(fingerprint(arg).encode())
+        for k in sorted(kwargs):
+            h.update(k.encode() + fingerprint(kwargs[k]).encode())
+        return StageResult(self, name, fn, args, kwargs, f"{name}-{h.hexdigest()[:24]}")
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.cache_dir, key + ext)
+
+    def resolve(self, result: StageResult):
+        start = time.perf_counter()
+        if self.enabled:
+            for ext in (".parquet", ".pkl"):
+                path = self._path(result.key, ext)
+                if os.path.exists(path):
+                    value = self._load(path)
+                    os.utime(path)  # LRU: a hit makes the entry recent
+                    print(f"⚡ Stage '{result.name}' loaded from cache ({(time.perf_counter() - start) * 1e3:.0f} ms)")
+                    return value
+
+        args = [a.value if isinstance(a, StageResult) else a for a in result.args]
+        kwargs = {k: v.value if isinstance(v, StageResult) else v for k, v in result.kwargs.items()}
+        value = result.fn(*args, **kwargs)
+        print(f"🔧 Stage '{result.name}' computed ({time.perf_counter() - start:.2f} s)")
+
+        if self.enabled:
+            self._store(result.key, value)
+            self.evict()
+        return value
+
+    def _load(self, path: str):
+        if path.endswith(".parquet"):
+            return pd.read_parquet(path, engine="pyarrow")
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    # Write to a temp file and rename, so a crash never leaves a truncated entry
+    def _store(self, key: str, value):
+        ext = ".parquet" if isinstance(value, pd.DataFrame) else ".pkl"
+        path = self._path(key, ext)
+        tmp_path = path + ".tmp"
+        if ext == ".parquet":
+            value.to_parquet(tmp_path, engine="pyarrow")
+        else:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    # Remove least recently used entries until the cache fits in max_size_mb
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.EXTENSIONS):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            os.remove(os.path.join(self.cache_dir, name))
@@ -2,8 +2,14 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
+import asyncio
+import numpy as np
+import pandas as pd
 from fastapi.testclient import TestClient
-from src.api.fastapi_server import app
+import lightgbm as lgb
+from src.api.fastapi_server import app, registry, feature_store, feature_cols, PricingRequest, predict_demand
+from src.api.batching import PredictionBatcher
+from src.api.model_registry import ModelRegistry
 
 client = TestClient(app)
 
@@ -31,3 +37,259 @@ def test_predict_price_endpoint():
     assert "predicted_demand" in data
     assert "optimized_price" in data
     assert data["optimized_price"] > 0
+
+def test_predict_prices_batch_endpoint():
+    item = {
+        "sku_id": "WM001",
+        "price": 100.0,
+        "cost": 60.0,
+        "promo_discount": 0.1,
+        "competitor_price": 105.0,
+        "temperature": 28.0,
+        "lag_1": 7,
+        "rolling_mean_7": 6.5,
+        "elasticity": -1.2,
+        "day_of_week": 2,
+        "is_weekend": 0,
+        "month": 5
+    }
+    bad_item = {"sku_id": "WM002", "price": "not-a-number"}
+
+    response = client.post("/predict-prices/batch", json=[item, bad_item, dict(item, sku_id="WM003")])
+    assert response.status_code == 200
+    data = response.json()
+
+    assert [d["index"] for d in data] == [0, 1, 2]
+    assert "error" in data[1]
+
+    single = client.post("/predict-price/", json=item).json()
+    assert data[0]["predicted_demand"] == single["predicted_demand"]
+    assert data[0]["optimized_price"] == single["optimized_price"]
+    assert data[2]["sku_id"] == "WM003"
+
+    # competitor_price=0 only affects its own item (price_vs_competitor = inf, as in pandas)
+    response = client.post("/predict-prices/batch", json=[item, dict(item, sku_id="WM004", competitor_price=0.0), item])
+    assert response.status_code == 200
+    mixed = response.json()
+    assert mixed[0] == data[0] and mixed[2] == dict(data[0], index=2)
+    assert mixed[1]["sku_id"] == "WM004" and "predicted_demand" in mixed[1]
+
+def test_fast_path_matches_dataframe_path():
+    request = PricingRequest(
+        sku_id="WM001", price=79.99, cost=31.7, promo_discount=0.3,
+        competitor_price=91.13, temperature=21.4, lag_1=3, rolling_mean_7=4.857142857142857,
+        elasticity=-10.0, day_of_week=6, is_weekend=1, month=4
+    )
+
+    # Original pandas construction of the model input
+    input_data = pd.DataFrame([request.dict()])
+    input_data["price_margin"] = input_data["price"] - input_data["cost"]
+    input_data["price_vs_competitor"] = input_data["price"] / input_data["competitor_price"]
+    expected = registry.get().booster.predict(input_data[feature_cols])[0]
+
+    assert predict_demand(request) == expected
+
+def test_fast_path_handles_zero_competitor_price():
+    item = {
+        "sku_id": "WM001", "price": 79.99, "cost": 31.7, "promo_discount": 0.3,
+        "competitor_price": 0.0, "temperature": 21.4, "lag_1": 3, "rolling_mean_7": 4.857142857142857,
+        "elasticity": -10.0, "day_of_week": 6, "is_weekend": 1, "month": 4
+    }
+
+    # The pandas path gives price_vs_competitor = inf and still predicts
+    input_data = pd.DataFrame([item])
+    input_data["price_margin"] = input_data["price"] - input_data["cost"]
+    input_data["price_vs_competitor"] = input_data["price"] / input_data["competitor_price"]
+    expected = registry.get().booster.predict(input_data[feature_cols])[0]
+
+    assert predict_demand(PricingRequest(**item)) == expected
+    response = client.post("/predict-price/", json=item)
+    assert response.status_code == 200
+    assert response.json()["predicted_demand"] == round(expected, 2)
+
+def test_model_registry_hot_swap(tmp_path):
+    model_file = tmp_path / "lightgbm_model.txt"
+    booster = lgb.Booster(model_file=registry.get().path)
+    booster.save_model(str(model_file))
+
+    local_registry = ModelRegistry(str(model_file))
+    old = local_registry.get()
+
+    # Roll out a different model (fewer trees) and pick it up
+    booster.save_model(str(model_file), num_iteration=5)
+    assert local_registry.reload()
+    new = local_registry.get()
+
+    assert new.version != old.version
+    assert new.booster.num_trees() == 5
+    # A request that grabbed the old version can still finish on it
+    assert old.predict(np.zeros((1, len(feature_cols)))).shape == (1,)
+
+def test_registry_num_threads_and_serve_options():
+    from src.api.serve import serve_options
+
+    local_registry = ModelRegistry(registry.get().path, num_threads=1)
+    X = np.random.default_rng(0).uniform(0, 100, size=(32, len(feature_cols)))
+    assert local_registry.get().info()["num_threads"] == 1
+    np.testing.assert_allclose(local_registry.get().predict(X), registry.get().booster.predict(X))
+
+    options = serve_options(workers=3, bind="127.0.0.1:9000", graceful_timeout=30, timeout=60, keepalive=5)
+    assert options["workers"] == 3
+    assert options["preload_app"] is True
+    assert options["worker_class"] == "uvicorn.workers.UvicornWorker"
+
+def test_admin_model_endpoint():
+    response = client.get("/admin/model")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["version"] == registry.get().version
+    assert "loaded_at" in data
+
+def test_prediction_batcher_coalesces_requests():
+    rows = np.random.default_rng(22).uniform(0, 100, size=(40, len(feature_cols)))
+    batcher = PredictionBatcher(registry, len(feature_cols), max_wait_ms=20, max_batch_size=16)
+
+    async def run():
+        return await asyncio.gather(*(batcher.predict(row) for row in rows))
+
+    preds = asyncio.run(run())
+
+    assert np.array_equal(preds, registry.get().predict(rows))
+    stats = batcher.stats()
+    assert stats["batch_size"]["count"] == 3  # 16 + 16 + 8
+    assert stats["queue_depth"]["count"] == 40
+
+def test_predict_price_by_sku_uses_feature_store():
+    events = [
+        {"sku_id": "TEST001", "price": 100.0, "cost": 60.0, "units_sold": u}
+        for u in [5, 6, 4, 7, 5, 6, 8]
+    ]
+    response = client.post("/sales-events/", json=events)
+    assert response.status_code == 200
+
+    lag_1, rolling_mean_7, elasticity, cost = feature_store.lookup("TEST001")
+    assert lag_1 == 8 and rolling_mean_7 == 41 / 7 and cost == 60.0
+
+    request = {"sku_id": "TEST001", "price": 100.0, "competitor_price": 105.0, "temperature": 28.0, "date": "2024-05-15"}
+    data = client.post("/predict-price/by-sku", json=request).json()
+
+    # Same answer as sending the full feature vector
+    full = client.post("/predict-price/", json={
+        "sku_id": "TEST001", "price": 100.0, "cost": 60.0, "promo_discount": 0.0,
+        "competitor_price": 105.0, "temperature": 28.0, "lag_1": lag_1,
+        "rolling_mean_7": rolling_mean_7, "elasticity": elasticity,
+        "day_of_week": 2, "is_weekend": 0, "month": 5
+    }).json()
+    assert data == full
+
+    assert client.post("/predict-price/by-sku", json=dict(request, sku_id="NOPE")).status_code == 404
+
+    # competitor_price=0 follows the full-vector path (price_vs_competitor = inf), not a 500
+    response = client.post("/predict-price/by-sku", json=dict(request, competitor_price=0.0))
+    assert response.status_code == 200
+    assert response.json() == client.post("/predict-price/", json={
+        "sku_id": "TEST001", "price": 100.0, "cost": 60.0, "promo_discount": 0.0,
+        "competitor_price": 0.0, "temperature": 28.0, "lag_1": lag_1,
+        "rolling_mean_7": rolling_mean_7, "elasticity": elasticity,
+        "day_of_week": 2, "is_weekend": 0, "month": 5
+    }).json()
+
+
+def test_prometheus_metrics_endpoint():
+    sample_input = {
+        "sku_id": "WM001", "price": 100.0, "cost": 60.0, "promo_discount": 0.1,
+        "competitor_price": 105.0, "temperature": 28.0, "lag_1": 7, "rolling_mean_7": 6.5,
+        "elasticity": -1.2, "day_of_week": 2, "is_weekend": 0, "month": 5
+    }
+    assert client.post("/predict-price/", json=sample_input).status_code == 200
+    assert client.post("/predict-price/", json={"sku_id": "WM001"}).status_code == 422
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+
+    assert 'pricing_requests_total{path="/predict-price/",status="200"}' in text
+    assert 'pricing_requests_total{path="/predict-price/",status="422"}' in text
+    assert "# TYPE pricing_requests_in_flight gauge" in text
+    assert 'pricing_request_duration_seconds_bucket{path="/predict-price/",le="+Inf"}' in text
+    for stage in ["parse", "dispatch", "features", "predict", "pricing"]:
+        assert f'pricing_stage_duration_seconds_count{{stage="{stage}"}}' in text
+    assert f'pricing_model_info{{version="{registry.get().version}",backend="{registry.get().backend}"}} 1' in text
+
+def test_metrics_merge_across_worker_processes(tmp_path):
+    import json
+    import subprocess
+    from src.api.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+    metrics = MetricsRegistry(multiprocess_dir=str(tmp_path))
+    requests = metrics.register(Counter("requests_total", "Requests", ["path"]))
+    in_flight = metrics.register(Gauge("in_flight", "In flight"))
+    model = metrics.register(Gauge("model_info", "Model", ["version"], multiprocess_mode="all"))
+    latency = metrics.register(Histogram("latency_seconds", "Latency", (0.1, 1.0)))
+    requests.labels("/a").inc(2)
+    in_flight.inc()
+    model.labels("v1").set(1)
+    latency.observe(0.05)
+
+    # Files of two other workers: one still running, one that has exited
+    dead = subprocess.Popen(["true"])
+    dead.wait()
+    other = {
+        "requests_total": [[["/a"], 3], [["/b"], 1]],
+        "in_flight": [[[], 2]],
+        "model_info": [[["v2"], 1]],
+        "latency_seconds": [[[], [0, 1, 0, 0.5]]],
+    }
+    for pid in (os.getppid(), dead.pid):
+        (tmp_path / f"{pid}.json").write_text(json.dumps(other))
+
+    text = metrics.render()
+    assert 'requests_total{path="/a"} 8' in text  # 2 + 3 live + 3 exited
+    assert 'requests_total{path="/b"} 2' in text
+    assert "in_flight 3" in text  # live workers only
+    assert f'model_info{{version="v1",pid="{os.getpid()}"}} 1' in text
+    assert f'model_info{{version="v2",pid="{os.getppid()}"}} 1' in text
+    assert f'pid="{dead.pid}"' not in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text and 'latency_seconds_bucket{le="1.0"} 3' in text
+    assert "latency_seconds_count 3" in text
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+
+
+def test_live_drift_monitor_counts_request_features(monkeypatch):
+    import src.api.fastapi_server as server
+    from src.monitoring.streaming_drift import StreamingDriftDetector, DRIFT_FEATURES
+
+    rng = np.random.default_rng(3)
+    reference = pd.DataFrame(rng.normal(50, 10, size=(2000, len(DRIFT_FEATURES))), columns=DRIFT_FEATURES)
+    monitor = StreamingDriftDetector.fit(reference, chunk_period="D")
+    monkeypatch.setattr(server, "drift_monitor", monitor)
+    monkeypatch.setattr(server, "drift_idx", [feature_cols.index(f) for f in monitor.features])
+
+    item = {
+        "sku_id": "WM001", "price": 100.0, "cost": 60.0, "promo_discount": 0.1,
+        "competitor_price": 105.0, "temperature": 28.0, "lag_1": 7, "rolling_mean_7": 6.5,
+        "elasticity": -1.2, "day_of_week": 2, "is_weekend": 0, "month": 5
+    }
+    assert client.post("/predict-price/", json=item).status_code == 200
+    assert client.post("/predict-prices/batch", json=[item] * 4).status_code == 200
+
+    status = client.get("/admin/drift").json()
+    assert status["enabled"] and status["chunk_period"] == "D"
+    assert status["current"]["rows"] == 5
+    assert status["current"]["features"]["price"]["alert"]  # all requests far outside the reference
+    assert 'pricing_feature_drift{feature="price",statistic="psi"}' in client.get("/metrics").text
+
+def test_entry_points_import_without_heavy_dependencies():
+    import subprocess
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    heavy = ["lightgbm", "sklearn", "pyspark", "mlflow", "nannyml"]
+    script = (
+        "import sys, os; os.environ['INFERENCE_BACKEND'] = 'numpy'; "
+        "import src.api.fastapi_server, src.pipelines.pricing_pipeline, src.pipelines.forecasting_pipeline, "
+        "src.models.train_model, src.monitoring.drift_detection; "
+        f"print(','.join(m for m in {heavy!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
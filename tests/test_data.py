@@ -10,3 +10,41 @@ def test_load_data_shapes():
     assert not sales.empty, "Sales data is empty"
     assert "sku_id" in catalog.columns
     assert "price" in sales.columns
+
+def test_generate_sales_data_vectorized():
+    import numpy as np
+    from src.data.generate_data import create_date_range, generate_product_catalog, generate_sales_data
+
+    dates = create_date_range()
+    products = generate_product_catalog().head(20)
+
+    np.random.seed(22)
+    sales = generate_sales_data(products, dates)
+    np.random.seed(22)
+    again = generate_sales_data(products, dates)
+
+    assert len(sales) == 20 * len(dates)
+    assert sales.equals(again), "Generator is not seed-reproducible"
+    assert (sales["units_sold"] >= 0).all()
+
+    # Promotions only on holiday dates (Eid → 30%, other → 25%)
+    eid = sales[sales["date"] == "2024-04-12"]
+    assert (eid["promo_discount"] == 0.3).all()
+    assert (sales[sales["date"] == "2024-03-01"]["promo_discount"] == 0).all()
+
+def test_parquet_roundtrip_preserves_dtypes(tmp_path):
+    from src.data.storage import read_frame, write_frame
+
+    _, sales = load_data_pandas()
+    sales = sales.head(1000)
+    path = str(tmp_path / "sales_data.parquet")
+    write_frame(sales, path)
+
+    loaded = read_frame(path)
+    assert str(loaded["date"].dtype).startswith("datetime64")
+    assert str(loaded["sku_id"].dtype) == "category"
+    assert str(loaded["category"].dtype) == "category"
+    assert loaded["units_sold"].equals(sales["units_sold"])
+
+    projected = read_frame(path, columns=["price", "units_sold"])
+    assert projected.columns.tolist() == ["price", "units_sold"]
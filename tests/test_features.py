@@ -2,6 +2,7 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
+import pandas as pd
 from src.data.load_data import load_data_pandas
 from src.data.preprocess import preprocess_pandas
 from src.features.build_features import build_features
@@ -15,3 +16,112 @@ def test_feature_engineering():
     expected_cols = ["lag_1", "rolling_mean_7", "elasticity", "day_of_week"]
     for col in expected_cols:
         assert col in featured_df.columns, f"Missing feature: {col}"
+
+
+def test_incremental_features_match_full_recompute():
+    from src.features.build_features import build_features_incremental, extract_feature_state
+
+    _, sales_df = load_data_pandas()
+    clean_df = preprocess_pandas(sales_df)
+    full_df = build_features(clean_df.copy())
+
+    cutoff = clean_df["date"].max() - pd.Timedelta(days=3)
+    history = build_features(clean_df[clean_df["date"] <= cutoff].copy())
+    state = extract_feature_state(history)
+
+    # Three daily increments
+    parts = []
+    for day in sorted(clean_df.loc[clean_df["date"] > cutoff, "date"].unique()):
+        new_rows, state = build_features_incremental(clean_df[clean_df["date"] == day], state)
+        parts.append(new_rows)
+    incremental_df = pd.concat(parts)
+
+    expected = full_df[full_df["date"] > cutoff].sort_index()
+    incremental_df = incremental_df.sort_index()
+    cols = ["lag_1", "lag_7", "rolling_mean_7", "price_change", "demand_change", "elasticity", "day_of_week"]
+    pd.testing.assert_frame_equal(incremental_df[cols], expected[cols])
+
+
+def test_online_feature_store_matches_build_features():
+    import numpy as np
+    from src.features.feature_store import OnlineFeatureStore
+
+    _, sales_df = load_data_pandas()
+    clean_df = preprocess_pandas(sales_df)
+    # The store is keyed by sku_id alone; skip ids shared by several catalog entries
+    single = clean_df.groupby("sku_id")["category"].nunique() == 1
+    clean_df = clean_df[clean_df["sku_id"].isin(single[single].index)]
+    last_day = clean_df["date"].max()
+    history = clean_df[clean_df["date"] < last_day]
+    today = clean_df[clean_df["date"] == last_day]
+
+    store = OnlineFeatureStore.from_frame(history)
+    for row in today.itertuples():
+        store.record_sale(row.sku_id, row.price, row.units_sold, cost=row.cost)
+
+    # Features build_features would give a (hypothetical) next day
+    next_day = today.assign(date=last_day + pd.Timedelta(days=1))
+    expected = build_features(pd.concat([clean_df, next_day]))
+    expected = expected[expected["date"] == next_day["date"].iloc[0]]
+    last_elasticity = build_features(clean_df.copy())
+    last_elasticity = last_elasticity[last_elasticity["date"] == last_day]
+
+    for row, el in zip(expected.itertuples(), last_elasticity["elasticity"]):
+        lag_1, rolling_mean_7, elasticity, _ = store.lookup(row.sku_id)
+        assert lag_1 == row.lag_1
+        assert rolling_mean_7 == row.rolling_mean_7
+        assert np.isclose(elasticity, el, equal_nan=True)
+
+    assert store.lookup("UNKNOWN") is None
+
+
+def test_numpy_feature_engine_matches_pandas():
+    import numpy as np
+    from src.features.external_features import add_external_signals
+
+    _, sales_df = load_data_pandas()
+    clean_df = preprocess_pandas(sales_df)
+
+    expected = add_external_signals(build_features(clean_df.copy()))
+    actual = add_external_signals(build_features(clean_df.copy(), engine="numpy"), engine="numpy")
+
+    assert actual.index.equals(expected.index)
+    exact_cols = ["day_of_week", "is_weekend", "month", "lag_1", "lag_7", "rolling_mean_7",
+                  "price_change", "demand_change", "elasticity"]
+    pd.testing.assert_frame_equal(actual[exact_cols], expected[exact_cols])
+    for col in ["competitor_trend", "temp_volatility"]:
+        assert np.allclose(actual[col], expected[col], rtol=1e-12, atol=0, equal_nan=True), col
+
+def test_spark_features_match_pandas(tmp_path):
+    import shutil
+    import pytest
+    pytest.importorskip("pyspark")
+    if shutil.which("java") is None and not os.environ.get("JAVA_HOME"):
+        pytest.skip("Spark local mode needs Java (java on PATH or JAVA_HOME)")
+
+    import numpy as np
+    from src.data.load_data import start_spark, load_data_spark, raw_data_paths
+    from src.data.preprocess import preprocess_spark
+    from src.features.external_features import add_external_signals
+    from src.features.spark_features import build_features_spark, add_external_signals_spark, compare_with_pandas
+
+    # Parity assumes (sku_id, date) is unique: skip ids shared by several catalog entries
+    catalog_df, sales_df = load_data_pandas()
+    single = sales_df.groupby("sku_id")["category"].nunique() == 1
+    sales_df = sales_df[sales_df["sku_id"].isin(single[single].index)].reset_index(drop=True)
+    catalog_path, sales_path = raw_data_paths(str(tmp_path))
+    sales_df.to_csv(sales_path, index=False)
+    catalog_df.to_csv(catalog_path, index=False)
+
+    spark = start_spark()
+    _, spark_sales = load_data_spark(spark, str(tmp_path))
+    spark_featured = add_external_signals_spark(build_features_spark(preprocess_spark(spark_sales)))
+    pandas_featured = add_external_signals(build_features(preprocess_pandas(sales_df)))
+
+    # Every numeric column of the pandas output
+    columns = [c for c in pandas_featured.columns
+               if c not in ("sku_id", "date") and np.issubdtype(pandas_featured[c].dtype, np.number)]
+    assert set(columns) <= set(spark_featured.columns)
+    assert spark_featured.count() == len(pandas_featured)
+    mismatched = [col for col, ok in compare_with_pandas(spark_featured, pandas_featured, columns).items() if not ok]
+    assert mismatched == []
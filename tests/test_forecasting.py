@@ -17,3 +17,282 @@ def test_forecasting_pipeline_runs():
 
     assert "predicted_units_sold" in forecast_df.columns
     assert forecast_df["predicted_units_sold"].notnull().all(), "Missing predictions"
+
+
+def test_streaming_pipeline_matches_in_memory(tmp_path):
+    import pandas as pd
+    from src.data.storage import read_frame
+    from src.pipelines.streaming_pipeline import run_streaming_pipeline, score_partition
+
+    _, sales_df = load_data_pandas()
+    # Partitions are keyed by sku_id; skip ids shared by several catalog entries
+    single = sales_df.groupby("sku_id")["category"].nunique() == 1
+    sales_df = sales_df[sales_df["sku_id"].isin(single[single].index)].reset_index(drop=True)
+    raw_path = tmp_path / "sales_data.csv"
+    sales_df.to_csv(raw_path, index=False)
+
+    model, _ = train_forecast_model(build_features(preprocess_pandas(sales_df)))
+    model_path = tmp_path / "model.txt"
+    model.save_model(str(model_path))
+
+    expected = score_partition(read_frame(str(raw_path)), model)
+    output_path = tmp_path / "streamed.parquet"
+    rows = run_streaming_pipeline(str(model_path), input_path=str(raw_path), output_path=str(output_path),
+                                  n_partitions=4, chunk_rows=1000)
+    streamed = read_frame(str(output_path))
+
+    assert rows == len(expected)
+    keys = ["sku_id", "date"]
+    expected = expected.sort_values(keys).reset_index(drop=True)
+    streamed = streamed.sort_values(keys).reset_index(drop=True)
+    assert list(streamed.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+
+def test_parallel_executor_matches_single_process(tmp_path):
+    import pandas as pd
+    from src.pipelines.parallel_executor import run_parallel
+    from src.pipelines.streaming_pipeline import score_partition
+
+    _, sales_df = load_data_pandas()
+    single = sales_df.groupby("sku_id")["category"].nunique() == 1
+    sales_df = sales_df[sales_df["sku_id"].isin(single[single].index)]
+
+    model, _ = train_forecast_model(build_features(preprocess_pandas(sales_df)))
+    model_path = tmp_path / "model.txt"
+    model.save_model(str(model_path))
+
+    expected = score_partition(sales_df, model)
+    result = run_parallel(sales_df, str(model_path), n_workers=2, n_shards=5)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_parallel_executor_frees_shared_memory_when_a_shard_fails(tmp_path):
+    import pandas as pd
+    import pytest
+    from src.pipelines.parallel_executor import run_parallel
+    from src.pipelines.streaming_pipeline import sku_partition
+
+    if not os.path.isdir("/dev/shm"):
+        pytest.skip("needs /dev/shm to list shared memory blocks")
+
+    _, sales_df = load_data_pandas()
+    sales_df = sales_df[sales_df["sku_id"].isin(sales_df["sku_id"].unique()[:3])]
+    model, _ = train_forecast_model(build_features(preprocess_pandas(sales_df)))
+    model_path = tmp_path / "model.txt"
+    model.save_model(str(model_path))
+
+    # A one-row SKU has no lag features, so its shard predicts on no rows and fails. It
+    # comes first, so its shard is read first and the other shards' results are left
+    # unread; the shard count gives it a shard of its own.
+    sales_df = pd.concat([sales_df.iloc[[0]].assign(sku_id="ZZ000"), sales_df], ignore_index=True)
+    n_shards = next(n for n in range(4, 64)
+                    if (sku_partition(sales_df["sku_id"], n) == sku_partition(pd.Series(["ZZ000"]), n)[0]).sum() == 1)
+
+    before = set(os.listdir("/dev/shm"))
+    with pytest.raises(ValueError):
+        run_parallel(sales_df, str(model_path), n_workers=2, n_shards=n_shards)
+    assert set(os.listdir("/dev/shm")) - before == set()
+
+
+def test_stage_cache_skips_unchanged_stages(tmp_path):
+    import pandas as pd
+    from src.utils.stage_cache import StageCache
+
+    calls = []
+    def double(df, factor=2):
+        calls.append(len(df))
+        return df * factor
+
+    cache = StageCache(cache_dir=str(tmp_path / "cache"))
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    first = cache.stage("double", double, df).value
+    again = cache.stage("double", double, cache.stage("copy", pd.DataFrame.copy, df)).value
+    cached = cache.stage("double", double, df).value
+    assert calls == [3, 3]  # the copy stage has a different key, the repeat is a hit
+    pd.testing.assert_frame_equal(cached, first)
+    pd.testing.assert_frame_equal(again, first)
+
+    cache.stage("double", double, df, factor=3).value
+    assert len(calls) == 3  # parameters are part of the key
+
+    # Downstream keys come from upstream keys, so declaring a chain computes nothing
+    chain = cache.stage("double", double, cache.stage("double", double, df))
+    assert len(calls) == 3
+    pd.testing.assert_frame_equal(chain.value, df * 4)
+
+    StageCache(cache_dir=str(tmp_path / "cache"), max_size_mb=0).evict()
+    assert os.listdir(tmp_path / "cache") == []
+
+
+def test_stage_code_hash_follows_src_imports(tmp_path, monkeypatch):
+    import pytest
+    from src.utils import stage_cache
+
+    # A stage module that imports its helper lazily, inside a function
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "__init__.py").write_text("")
+    (tmp_path / "src" / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "src" / "pkg" / "stage.py").write_text(
+        "def run(df):\n    from src.pkg import helper\n    return helper.scale(df)\n")
+    (tmp_path / "src" / "pkg" / "helper.py").write_text("def scale(df):\n    return df * 2\n")
+    monkeypatch.setattr(stage_cache, "_SRC_ROOT", str(tmp_path))
+    monkeypatch.setattr(stage_cache, "_code_hashes", {})
+
+    before = stage_cache.module_source_hash("src.pkg.stage")
+    (tmp_path / "src" / "pkg" / "helper.py").write_text("def scale(df):\n    return df * 3\n")
+    stage_cache._code_hashes.clear()
+    assert stage_cache.module_source_hash("src.pkg.stage") != before
+
+    with pytest.raises(ValueError):
+        stage_cache.module_source_hash("src.pkg.missing")
+
+
+def test_compiled_model_matches_booster():
+    import importlib.util
+    import numpy as np
+    import pytest
+    import lightgbm as lgb
+    from src.forecasting.forecaster import FEATURE_COLS
+    from src.models.compiled_model import compile_model
+
+    _, sales_df = load_data_pandas()
+    featured_df = build_features(preprocess_pandas(sales_df))
+    model, _ = train_forecast_model(featured_df)
+    X = featured_df[FEATURE_COLS].to_numpy(dtype=np.float64)  # includes NaN lags
+
+    # Second model trained with missing values, so splits carry NaN / zero missing types
+    rng = np.random.default_rng(0)
+    X_missing = rng.normal(size=(2000, 4))
+    X_missing[rng.random(X_missing.shape) < 0.2] = np.nan
+    y = np.nan_to_num(X_missing).sum(axis=1) + 3 * np.isnan(X_missing[:, 0])
+    nan_model = lgb.train({"objective": "regression", "verbosity": -1}, lgb.Dataset(X_missing, y), 20)
+    zero_model = lgb.train({"objective": "regression", "verbosity": -1, "zero_as_missing": True},
+                           lgb.Dataset(np.nan_to_num(X_missing), y), 20)
+
+    backends = ["numpy"] + (["numba"] if importlib.util.find_spec("numba") else [])
+    for backend in backends:
+        np.testing.assert_allclose(compile_model(model, backend).predict(X), model.predict(X), rtol=0, atol=1e-12)
+        np.testing.assert_allclose(compile_model(nan_model, backend).predict(X_missing),
+                                   nan_model.predict(X_missing), rtol=0, atol=1e-12)
+        np.testing.assert_allclose(compile_model(zero_model, backend).predict(np.nan_to_num(X_missing)),
+                                   zero_model.predict(np.nan_to_num(X_missing)), rtol=0, atol=1e-12)
+
+    # An already compiled model is rebuilt for another backend from the same arrays
+    compiled = compile_model(model, "numpy")
+    assert compile_model(compiled, "numpy") is compiled
+    for backend in backends:
+        recompiled = compile_model(compiled, backend)
+        assert recompiled.backend == backend
+        np.testing.assert_allclose(recompiled.predict(X), model.predict(X), rtol=0, atol=1e-12)
+    with pytest.raises(ValueError):
+        compile_model(compiled, "lightgbm")
+
+
+def test_incremental_update_registers_new_version(tmp_path):
+    import json
+    import numpy as np
+    from src.api.model_registry import load_model_version
+    from src.forecasting.forecaster import FEATURE_COLS, update_forecast_model
+    from src.models.train_model import register_model_version
+
+    _, sales_df = load_data_pandas()
+    featured_df = build_features(preprocess_pandas(sales_df)).sort_values("date", kind="stable")
+    cutoff = featured_df["date"].max() - np.timedelta64(30, "D")
+    model, _ = train_forecast_model(featured_df[featured_df["date"] < cutoff])
+    model_path = str(tmp_path / "lightgbm_model.txt")
+    base_version = register_model_version(model, model_path, mode="full")
+
+    new_df = featured_df[featured_df["date"] >= cutoff]
+    continued = update_forecast_model(model_path, new_df, mode="continue", num_boost_round=5, early_stopping_rounds=None)
+    refitted = update_forecast_model(model, new_df, mode="refit")
+    assert continued.num_trees() == model.num_trees() + 5
+    assert refitted.num_trees() == model.num_trees()
+    X = new_df[FEATURE_COLS].dropna().to_numpy(dtype=np.float64)
+    assert not np.allclose(refitted.predict(X), model.predict(X))
+
+    # The registered version is what the API's registry loads, with its lineage indexed
+    version = register_model_version(continued, model_path, mode="continue", rows=len(new_df))
+    assert load_model_version(model_path).version == version
+    assert (tmp_path / "versions" / f"{base_version}.txt").exists()
+    index = [json.loads(line) for line in open(tmp_path / "versions" / "index.jsonl")]
+    assert [r["version"] for r in index] == [base_version, version]
+    assert index[1]["parent"] == base_version and index[1]["mode"] == "continue"
+
+
+def test_dataset_cache_reuses_binned_datasets(tmp_path):
+    from src.models.dataset_cache import DatasetCache
+    from src.forecasting.forecaster import FEATURE_COLS, TARGET_COL
+
+    _, sales_df = load_data_pandas()
+    featured_df = build_features(preprocess_pandas(sales_df))
+    cache = DatasetCache(cache_dir=str(tmp_path / "datasets"))
+
+    fresh, _ = train_forecast_model(featured_df, dataset_cache=DatasetCache(enabled=False))
+    built, _ = train_forecast_model(featured_df, dataset_cache=cache)
+    entries = sorted(os.listdir(tmp_path / "datasets"))
+    assert len(entries) == 4  # train + validation, .bin + .json each
+    reused, _ = train_forecast_model(featured_df, dataset_cache=cache)
+    assert sorted(os.listdir(tmp_path / "datasets")) == entries
+    assert fresh.model_to_string() == built.model_to_string() == reused.model_to_string()
+
+    # Keys follow the data and binning parameters, not the boosting parameters
+    X, y = featured_df[FEATURE_COLS], featured_df[TARGET_COL]
+    key = cache.key(X, y, {"random_state": 22, "learning_rate": 0.1})
+    assert cache.key(X, y, {"random_state": 22, "learning_rate": 0.05}) == key
+    assert cache.key(X, y, {"random_state": 22, "max_bin": 63}) != key
+    assert cache.key(X.assign(price=X["price"] * 1.01), y, {"random_state": 22}) != key
+
+
+def test_tuning_prunes_and_writes_best_params(tmp_path, monkeypatch):
+    import tempfile
+    import yaml
+    from src.models.dataset_cache import DatasetCache
+    from src.models import tuning
+
+    _, sales_df = load_data_pandas()
+    featured_df = build_features(preprocess_pandas(sales_df))
+    cache = DatasetCache(cache_dir=str(tmp_path / "datasets"))
+    output_path = str(tmp_path / "tuned_params.yaml")
+
+    # One worker per trial: every trial runs from the start and prunes against the
+    # rounds the others report live. Tiny learning rates give trials that lag the median.
+    space = {"learning_rate": ("log", 1e-4, 0.3), "num_leaves": ("int", 15, 15)}
+    best, results = tuning.run_tuning(
+        featured_df, output_path=output_path, mlflow_experiment=None, dataset_cache=cache, space=space,
+        n_trials=6, n_workers=6, num_boost_round=60, prune_warmup_rounds=10, prune_every=10,
+        min_trials_before_pruning=2
+    )
+    assert sorted(r["trial"] for r in results) == list(range(6))
+    assert any(r["state"] == "pruned" for r in results)
+    assert all(r["params"]["num_threads"] == 1 for r in results)
+    assert best["rmse"] == min(r["rmse"] for r in results if r["state"] == "complete")
+    artifact = yaml.safe_load(open(output_path))
+    assert artifact["trial"] == best["trial"] and artifact["num_boost_round"] == best["best_iteration"]
+    assert "num_threads" not in artifact["lightgbm_params"]
+
+    # Training picks the artifact up, and keeps its defaults when there is none
+    tuned, _ = train_forecast_model(featured_df, dataset_cache=cache, tuned_params_path=output_path)
+    assert tuned.params["learning_rate"] == artifact["lightgbm_params"]["learning_rate"]
+    assert tuned.current_iteration() <= artifact["num_boost_round"]
+    default, _ = train_forecast_model(featured_df, dataset_cache=cache, tuned_params_path=str(tmp_path / "none.yaml"))
+    assert "learning_rate" not in default.params
+
+    # A trial above the median the others reported stops at that round, and reports it
+    tuning._init_worker(*tuning.tuning_datasets(featured_df, cache))
+    params = {**tuning.BASE_PARAMS, "learning_rate": 0.1, "num_threads": 1}
+    reports = {(1, 10): 0.0, (2, 10): 0.0}
+    pruned = tuning._run_trial(0, params, 60, 20, (10, 20), reports, 2)
+    assert pruned["state"] == "pruned" and list(pruned["curve"]) == [10] and (0, 10) in reports
+    kept = tuning._run_trial(1, params, 60, 20, (10, 20), {(2, 10): 1e9, (2, 20): 0.0}, 2)
+    assert kept["state"] == "complete" and list(kept["curve"]) == [10, 20]
+
+    # With the cache disabled the binaries go to a temporary directory removed after the search
+    tmp_root = tmp_path / "tmp"
+    tmp_root.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_root))
+    tuning.run_tuning(
+        featured_df, output_path=output_path, mlflow_experiment=None, dataset_cache=DatasetCache(enabled=False),
+        n_trials=2, n_workers=2, num_boost_round=20, prune_every=0
+    )
+    assert os.listdir(tmp_root) == []
@@ -0,0 +1,115 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import numpy as np
+import pandas as pd
+from scipy.spatial.distance import jensenshannon
+from scipy.stats import ks_2samp
+from src.monitoring.streaming_drift import StreamingDriftDetector, results_frame
+from src.monitoring.incremental_monitor import IncrementalPerformanceMonitor
+
+FEATURES = ["price", "lag_1", "elasticity"]
+
+def make_frame(rng, start, days, rows_per_day, shift=0.0):
+    n = days * rows_per_day
+    elasticity = rng.normal(-1.0, 0.5, n)
+    elasticity[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        "date": np.repeat(pd.date_range(start, periods=days, freq="D"), rows_per_day),
+        "price": rng.lognormal(4.0 + shift, 0.3, n),
+        "lag_1": rng.poisson(6 + 4 * shift, n).astype(float),
+        "elasticity": elasticity
+    })
+
+# NannyML's continuous Jensen-Shannon distance and the two-sample KS statistic
+def batch_statistics(reference, chunk):
+    reference, chunk = reference[~np.isnan(reference)], chunk[~np.isnan(chunk)]
+    bins = np.histogram_bin_edges(reference, bins="doane")
+    ref_proba = np.histogram(reference, bins=bins)[0] / len(reference)
+    chunk_proba = np.histogram(chunk, bins=bins)[0] / len(chunk)
+    leftover = 1 - chunk_proba.sum()
+    if leftover > 0:
+        ref_proba, chunk_proba = np.append(ref_proba, 0), np.append(chunk_proba, leftover)
+    return jensenshannon(ref_proba, chunk_proba, base=2), ks_2samp(reference, chunk).statistic
+
+def test_streaming_drift_matches_batch_statistics(tmp_path):
+    rng = np.random.default_rng(7)
+    reference_df = make_frame(rng, "2023-01-01", 120, 50)
+    analysis_df = make_frame(rng, "2023-05-01", 92, 40, shift=0.2)
+
+    detector = StreamingDriftDetector.fit(reference_df, features=FEATURES, n_quantiles=200, chunk_period="M")
+    # Blocks of random size, then single rows, in time order
+    X = analysis_df[FEATURES].to_numpy()
+    results, start = [], 0
+    while start < len(X) - 500:
+        end = start + int(rng.integers(1, 700))
+        results.extend(detector.update(analysis_df.iloc[start:end], timestamps=analysis_df["date"].iloc[start:end]))
+        start = end
+    for i in range(start, len(X)):
+        detector.observe(X[i], analysis_df["date"].iloc[i])
+    results.append(detector.flush())
+
+    months = analysis_df["date"].dt.strftime("%Y-%m")
+    assert [r["chunk"] for r in results] == sorted(months.unique())
+    for r in results:
+        chunk = analysis_df[months == r["chunk"]]
+        assert r["rows"] == len(chunk)
+        for f in FEATURES:
+            js, ks = batch_statistics(reference_df[f].to_numpy(), chunk[f].to_numpy())
+            stats = r["features"][f]
+            assert abs(stats["jensen_shannon"] - js) < 1e-12
+            # lag_1 has few distinct values: the quantile sketch is exact
+            assert abs(stats["kolmogorov_smirnov"] - ks) < (1e-12 if f == "lag_1" else 2 / 200)
+            assert stats["missing"] == chunk[f].isna().sum()
+        assert r["features"]["price"]["alert"]
+
+    # A saved reference gives the same statistics; the frame has one row per chunk × feature
+    detector.save(str(tmp_path / "reference.npz"))
+    loaded = StreamingDriftDetector.load(str(tmp_path / "reference.npz"), chunk_period="M")
+    replay = loaded.update(analysis_df, timestamps=analysis_df["date"]) + [loaded.flush()]
+    assert results_frame(replay).equals(results_frame(results))
+    assert len(results_frame(results)) == len(results) * len(FEATURES)
+
+# Window statistics recomputed from scratch with a groupby over the window's rows
+def window_groupby(df, start, end):
+    rows = df[(df["date"] >= start) & (df["date"] <= end)].assign(error=lambda d: d["predicted"] - d["actual"])
+    stats = rows.groupby(["category", "sku_id"])["error"].agg(
+        count="size", rmse=lambda e: np.sqrt((e ** 2).mean()), bias="mean"
+    )
+    return stats, len(rows)
+
+def test_incremental_monitor_matches_window_recomputation():
+    rng = np.random.default_rng(22)
+    n = 20_000
+    categories = rng.choice(["Water", "Watches", "Shoes"], n)
+    # "WA001" is sold in two categories, as in the raw data
+    sku_ids = np.where(rng.random(n) < 0.1, "WA001", np.char.add(categories.astype(str), rng.integers(0, 8, n).astype(str)))
+    df = pd.DataFrame({
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 120, n)), unit="D"),
+        "sku_id": sku_ids, "category": categories,
+        "actual": rng.poisson(5, n).astype(float),
+    })
+    df["predicted"] = df["actual"] + rng.normal(0.3, 1.0, n)
+    df.loc[rng.random(n) < 0.01, "predicted"] = np.nan
+
+    for window_days, slide_days in ((28, 28), (14, 7)):
+        monitor = IncrementalPerformanceMonitor(window_days, slide_days, capacity=4)
+        windows, start = [], 0
+        while start < n:
+            # Random-size batches, shuffled within the batch
+            end = start + int(rng.integers(1, 3000))
+            batch = df.iloc[start:end].sample(frac=1, random_state=0)
+            windows.extend(monitor.update(batch["date"], batch["sku_id"], batch["category"], batch["predicted"], batch["actual"]))
+            start = end
+        windows.append(monitor.flush())
+
+        assert len(windows) == len({w["window_end"].iloc[0] for w in windows})
+        for w in windows:
+            expected, n_rows = window_groupby(df.dropna(), w["window_start"].iloc[0], w["window_end"].iloc[0])
+            skus = w[w["level"] == "sku"].set_index(["category", "sku_id"]).loc[expected.index]
+            assert (skus["count"].to_numpy() == expected["count"].to_numpy()).all()
+            assert np.allclose(skus["rmse"], expected["rmse"]) and np.allclose(skus["bias"], expected["bias"])
+            assert w.loc[w["level"] == "overall", "count"].item() == n_rows
+            assert w.loc[w["level"] == "category", "count"].sum() == n_rows
+        assert monitor.late_rows == 0
@@ -17,3 +17,81 @@ def test_price_optimization():
 
     assert "optimized_price" in optimized_df.columns
     assert all(optimized_df["optimized_price"] > 0)
+
+def test_price_rules_vectorized():
+    import pandas as pd
+
+    df = pd.DataFrame({
+        "price": [100.0, 100.0, 100.0, 50.0, 100.0],
+        "cost": [60.0, 60.0, 60.0, 60.0, 60.0],
+        "competitor_price": [120.0, 120.0, 120.0, 120.0, 80.0],
+        "rolling_mean_7": [5.0, 5.0, 5.0, 5.0, 5.0],
+        "predicted_units_sold": [8.0, 2.0, 5.0, 5.0, 8.0]
+    })
+    optimized_df = optimize_prices(df)
+
+    assert optimized_df["adjustment"].tolist() == [0.05, -0.05, 0.0, 0.0, 0.05]
+    # bump, cut, unchanged, cost floor (60 * 1.1), competitor cap (80 * 1.1)
+    expected = [105.0, 95.0, 100.0, 66.0, 88.0]
+    assert all(abs(a - b) < 1e-9 for a, b in zip(optimized_df["optimized_price"], expected))
+
+def test_grid_price_optimization():
+    import numpy as np
+    import pandas as pd
+    from src.forecasting.forecaster import FEATURE_COLS
+    from src.pricing.pricing_engine import optimize_prices_grid
+
+    _, sales_df = load_data_pandas()
+    clean_df = preprocess_pandas(sales_df)
+    featured_df = build_features(clean_df)
+    model, forecast_df = train_forecast_model(featured_df)
+    forecast_df = forecast_df.head(500)
+
+    optimized_df = optimize_prices(forecast_df, mode="grid", model=model, n_candidates=20)
+
+    lower = (forecast_df["cost"] * 1.1).clip(upper=forecast_df["competitor_price"] * 1.1)
+    upper = forecast_df["competitor_price"] * 1.1
+    assert (optimized_df["optimized_price"] >= lower - 1e-9).all()
+    assert (optimized_df["optimized_price"] <= upper + 1e-9).all()
+    assert "expected_profit" in optimized_df.columns
+
+    def profit_at(row, prices):
+        X = pd.DataFrame([row[FEATURE_COLS]] * len(prices)).astype(np.float64)
+        X["price"] = prices
+        X["price_margin"] = prices - row["cost"]
+        X["price_vs_competitor"] = prices / row["competitor_price"]
+        return np.maximum(model.predict(X[FEATURE_COLS].to_numpy()), 0.0) * (prices - row["cost"])
+
+    # The chosen price beats every candidate on its grid and the current (clipped) price
+    for i in (0, 137, 499):
+        row = forecast_df.iloc[i]
+        grid = np.linspace(lower.iloc[i], upper.iloc[i], 20)
+        current = np.clip(row["price"], lower.iloc[i], upper.iloc[i])
+        best = optimized_df["expected_profit"].iloc[i]
+        assert (best >= profit_at(row, grid) - 1e-9).all()
+        assert best >= profit_at(row, np.array([current]))[0] - 1e-9
+
+    # Chunking only bounds memory; the result is the same
+    chunked_df = optimize_prices_grid(forecast_df, model, n_candidates=20, chunk_size=100)
+    pd.testing.assert_frame_equal(chunked_df, optimized_df)
+
+
+def test_segment_elasticity_batch_prediction():
+    import numpy as np
+    from src.pricing.price_elasticity_model import (
+        ELASTICITY_FEATURES, train_elasticity_model, predict_demand_with_elasticity, predict_demand_batch
+    )
+
+    _, sales_df = load_data_pandas()
+    featured_df = build_features(preprocess_pandas(sales_df))
+
+    serial = train_elasticity_model(featured_df, segment_col="sku_id")
+    parallel = train_elasticity_model(featured_df, segment_col="sku_id", n_jobs=2)
+    assert serial.keys() == parallel.keys()
+    for sku in serial:
+        np.testing.assert_allclose(parallel[sku].coef_, serial[sku].coef_)
+
+    day = featured_df[featured_df["date"] == featured_df["date"].max()]
+    expected = [predict_demand_with_elasticity(row, serial[row["sku_id"]], ELASTICITY_FEATURES)
+                for _, row in day.iterrows()]
+    np.testing.assert_allclose(predict_demand_batch(day, parallel, segment_col="sku_id"), expected)